@@ -12,6 +12,8 @@ import traceback
 import requests
 
 from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
+from adabot.lib import common_funcs
+from adabot.lib import reference_data
 
 logger = logging.getLogger(__name__)
 ch = logging.StreamHandler(stream=sys.stdout)
@@ -44,37 +46,30 @@ all_libraries = []
 adafruit_library_index = []
 
 
-def list_repos():
-    """Return a list of all Adafruit repositories with 'Arduino' in either the
-    name, description, or readme. Each list item is a dictionary of GitHub API
-    repository state.
+def is_arduino_candidate(repo):
+    """Returns if the repo may be an Arduino library: it has 'Arduino' or
+    'Library' in its name or description, or 'Adafruit_' in its name, and
+    neither 'PCB' nor 'Python' in its name.
     """
-    repos = []
-    result = gh_reqs.get(
-        "/search/repositories",
-        params={
-            "q": (
-                "Arduino in:name in:description in:readme fork:true user:adafruit archived:false"
-                " OR Library in:name in:description in:readme fork:true user:adafruit"
-                " archived:false OR Adafruit_ in:name fork:true user:adafruit archived:false AND"
-                " NOT PCB in:name AND NOT Python in:name"
-            ),
-            "per_page": 100,
-            "sort": "updated",
-            "order": "asc",
-        },
-    )
-    while result.ok:
-        repos.extend(
-            result.json()["items"]
-        )  # uncomment and comment below, to include all forks
+    name = repo["name"].lower()
+    text = name + " " + (repo["description"] or "").lower()
+    if "pcb" in name or "python" in name:
+        return False
+    return "arduino" in text or "library" in text or "adafruit_" in name
 
-        if result.links.get("next"):
-            result = gh_reqs.get(result.links["next"]["url"])
-        else:
-            break
 
-    return repos
+def list_repos():
+    """Return a list of all Adafruit repositories that may be Arduino
+    libraries. Each list item is a dictionary of GitHub API repository state.
+    """
+    return sorted(
+        (
+            repo
+            for repo in common_funcs.list_org_repos()
+            if not repo["archived"] and is_arduino_candidate(repo)
+        ),
+        key=lambda repo: repo["updated_at"],
+    )
 
 
 def is_arduino_library(repo):
@@ -312,19 +307,13 @@ def main(verbosity=1, output_file=None):  # pylint: disable=missing-function-doc
         logger.setLevel("CRITICAL")
 
     try:
-        reply = requests.get(
-            "http://downloads.arduino.cc/libraries/library_index.json",
-            timeout=REQUESTS_TIMEOUT,
-        )
-        if not reply.ok:
+        adafruit_libraries = reference_data.get_reference_data().arduino_libraries()
+        if adafruit_libraries is None:
             logging.error(
                 "Could not fetch http://downloads.arduino.cc/libraries/library_index.json"
             )
             sys.exit()
-        arduino_library_index = reply.json()
-        for lib in arduino_library_index["libraries"]:
-            if "adafruit" in lib["url"]:
-                adafruit_library_index.append(lib)
+        adafruit_library_index.extend(adafruit_libraries)
         run_arduino_lib_checks()
     except:
         _, exc_val, exc_tb = sys.exc_info()
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Asyncio wrapper for GitHub requests.
+
+Requests are handed to `adabot.github_requests` on a bounded thread pool, so
+they share its pooled session and get the same URL fixing, authentication,
+JSON safety and rate-limit handling. Example::
+
+    async def fetch_releases(repos):
+        async with AsyncGitHub(concurrency=16) as gh:
+            return await gh.get_many(
+                f"/repos/{repo['full_name']}/releases/latest" for repo in repos
+            )
+
+    releases = asyncio.run(fetch_releases(repos))
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+
+from adabot import github_requests as gh_reqs
+from adabot.lib import common_funcs
+
+DEFAULT_CONCURRENCY = 8
+
+
+class AsyncGitHub:
+    """Async GitHub client allowing up to `concurrency` requests in flight.
+
+    :param int concurrency: The maximum number of concurrent requests.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY):
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="adabot-gh"
+        )
+        gh_reqs.ensure_pool_size(concurrency)
+
+    async def run(self, func, *args, **kwargs):
+        """Run the blocking callable `func` on the client's thread pool once a
+        concurrency slot is free, and return its result.
+        """
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def request(self, method, url, **kwargs):
+        """Processes request for `url`."""
+        return await self.run(gh_reqs.request, method, url, **kwargs)
+
+    get = functools.partialmethod(request, "get")
+    post = functools.partialmethod(request, "post")
+    put = functools.partialmethod(request, "put")
+    delete = functools.partialmethod(request, "delete")
+    patch = functools.partialmethod(request, "patch")
+
+    async def get_many(self, urls, **kwargs):
+        """GET every URL in `urls` concurrently. Returns the responses in the
+        same order as `urls`.
+        """
+        return await asyncio.gather(*(self.get(url, **kwargs) for url in urls))
+
+    async def repo_pages(self, **kwargs):
+        """Asynchronously yield the pages of repositories of
+        `common_funcs.iter_repo_pages`, which takes the same arguments, as
+        they are listed.
+        """
+        pages = common_funcs.iter_repo_pages(**kwargs)
+        while True:
+            page = await self.run(next, pages, None)
+            if page is None:
+                return
+            yield page
+
+    async def map(self, func, items):
+        """Call the blocking function `func` on every item in `items`
+        concurrently, such as a validator that makes its own requests. Returns
+        the results in the same order as `items`.
+        """
+        return await asyncio.gather(*(self.run(func, item) for item in items))
+
+    def close(self):
+        """Shut down the thread pool, waiting for running requests."""
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Per-URL expiry policies and statistics for the ``requests_cache`` cache.
+
+Repository listings, releases, file contents and issue lists change at very
+different rates, so each URL pattern gets its own time to live. The first
+pattern in the table that matches a URL wins; URLs matching none of them use
+the default ``expire_after`` given to `github_requests.setup_cache`.
+"""
+
+import datetime
+import json
+import os
+import re
+import threading
+
+import requests_cache
+from requests.hooks import dispatch_hook
+
+# (URL regular expression, seconds to keep or None to keep forever)
+DEFAULT_CACHE_POLICIES = (
+    (r"/repos/[^/]+/[^/]+/git/blobs/", None),
+    (r"/repos/[^/]+/[^/]+/contents/", 24 * 60 * 60),
+    (r"/repos/[^/]+/[^/]+/git/trees/", 24 * 60 * 60),
+    (r"/repos/[^/]+/[^/]+/(issues|pulls)", 10 * 60),
+    (r"/repos/[^/]+/[^/]+/releases", 60 * 60),
+    (r"/search/", 30 * 60),
+)
+
+
+class CachePolicy:
+    """Table of URL patterns and how long their responses stay fresh.
+
+    :param policies: A sequence of (pattern, seconds) pairs, in priority order.
+    :param default: The seconds to keep responses matching no pattern, or
+                    ``None`` to keep them forever.
+    """
+
+    def __init__(self, policies=DEFAULT_CACHE_POLICIES, default=None):
+        self.policies = [
+            (re.compile(pattern), _as_timedelta(seconds))
+            for pattern, seconds in policies
+        ]
+        self.default = _as_timedelta(default)
+
+    @classmethod
+    def from_file(cls, path, default=None):
+        """Load the policy table from a JSON object mapping URL patterns to
+        seconds (or ``null``).
+        """
+        with open(path, encoding="utf-8") as policy_file:
+            return cls(json.load(policy_file).items(), default)
+
+    def expire_after(self, url):
+        """Return how long a response for `url` stays fresh, as a
+        ``timedelta``, or ``None`` if it never expires.
+        """
+        for pattern, expire_after in self.policies:
+            if pattern.search(url):
+                return expire_after
+        return self.default
+
+
+def _as_timedelta(seconds):
+    if seconds is None:
+        return None
+    return datetime.timedelta(seconds=seconds)
+
+
+class CacheStats:
+    """Counts of cache hits, misses and stale entries."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    def add(self, hits=0, misses=0, stale=0):
+        """Add to the counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.stale += stale
+
+    def summary(self, cache=None, db_path=None):
+        """Return the counters as a dict, with the number of stored responses
+        in `cache` (a `CompactCache`) and the size of the database at `db_path`
+        if given.
+        """
+        summary = {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+        lookups = self.hits + self.misses
+        summary["hit_rate"] = round(self.hits / lookups, 3) if lookups else 0.0
+        if cache is not None:
+            summary["entries"] = len(cache)
+        if db_path is not None:
+            try:
+                summary["db_bytes"] = os.path.getsize(db_path)
+            except OSError:
+                summary["db_bytes"] = 0
+        return summary
+
+
+class PolicyCachedSession(requests_cache.CachedSession):
+    """``CachedSession`` that expires each response according to a
+    `CachePolicy` and counts hits, misses and stale entries.
+    """
+
+    policy = CachePolicy()
+    stats = CacheStats()
+
+    def send(self, request, **kwargs):
+        if (
+            self._is_cache_disabled
+            or request.method not in self._cache_allowable_methods
+        ):
+            return super().send(request, **kwargs)
+
+        cache_key = self.cache.create_key(request)
+        try:
+            response, timestamp = self.cache.get_response_and_time(cache_key)
+        except (ImportError, TypeError):
+            response = None
+        if response is not None:
+            expire_after = self.policy.expire_after(request.url)
+            if (
+                expire_after is not None
+                and datetime.datetime.utcnow() - timestamp > expire_after
+            ):
+                self.cache.delete(cache_key)
+                self.stats.add(stale=1)
+                response = None
+        if response is None:
+            self.stats.add(misses=1)
+            # Nothing (fresh) is stored, so this sends the request and caches it.
+            return super().send(request, **kwargs)
+
+        self.stats.add(hits=1)
+        # dispatch hook here, because it was removed before pickling
+        response.from_cache = True
+        return dispatch_hook("response", request.hooks, response, **kwargs)
+
+
+def session_factory(policy, stats):
+    """Return a `PolicyCachedSession` class using `policy` and `stats`, for
+    ``requests_cache.install_cache``.
+    """
+    return type(
+        "ConfiguredPolicyCachedSession",
+        (PolicyCachedSession,),
+        {"policy": policy, "stats": stats},
+    )
@@ -0,0 +1,288 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Record and replay HTTP traffic.
+
+In record mode every request sent by ``requests`` (`adabot.github_requests`,
+`adabot.pypi_requests`, PyGithub and the direct ``requests.get`` calls) is
+written to a cassette file along with its response. In replay mode the
+responses are served from the cassette without touching the network, so a
+whole run of the bot is offline and deterministic. A request missing from the
+cassette raises `CassetteMiss`, a ``ConnectionError``.
+
+The cassette hooks into ``HTTPAdapter.send``, below the caches and the retry
+logic, so each redirect and retry is recorded as sent. Request headers are not
+stored, and neither are the rate limit headers of the responses, so a replay
+is never paced or paused. To keep access tokens out of the cassette, the
+tokens in GitHub App installation token responses are replaced, and the
+recorded bodies and headers are passed through a `redact` function, such as
+`TokenPool.redact`, when the cassette is saved.
+
+Set ``ADABOT_CASSETTE`` to the cassette path and ``ADABOT_CASSETTE_MODE`` to
+``record`` or ``replay`` (the default) to use one for any adabot command.
+``ADABOT_CASSETTE_LATENCY`` adds a delay to each replayed response: a number
+of seconds, or ``recorded`` for the latency measured when recording.
+"""
+
+import atexit
+import base64
+import datetime
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.response import HTTPResponse
+
+CASSETTE_VERSION = 1
+
+MODES = ("record", "replay")
+
+# Response headers describing the transfer rather than the stored body, or
+# the state of the rate limit when it was recorded.
+_UNRECORDED_HEADERS = (
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+    "x-ratelimit-resource",
+    "x-ratelimit-used",
+)
+
+# Responses holding a new GitHub App installation token.
+_TOKEN_RESPONSE = re.compile(r"/app/installations/[^/]+/access_tokens$")
+
+REDACTED = "[secure]"
+
+# The ``HTTPAdapter.send`` replaced while a cassette is installed.
+_wrapped_send = None
+_active = None
+
+
+class CassetteMiss(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that is not in the cassette."""
+
+
+def request_key(method, url, body=None):
+    """Return the key matching a request to its recorded responses."""
+    key = f"{method.upper()} {url}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        key += " " + hashlib.sha256(body).hexdigest()[:16]
+    return key
+
+
+class Cassette:
+    """The recorded responses, replayed in the order they were recorded.
+
+    :param path: The cassette file.
+    :param mode: ``record`` to send requests and save them to `path`, or
+                 ``replay`` to answer them from `path`.
+    :param latency: Seconds to wait before returning each replayed response,
+                    or ``"recorded"`` for the latency measured when recording.
+    :param redact: A function removing secrets from the text it is given,
+                   applied to the recorded bodies and headers when saving.
+    """
+
+    def __init__(self, path, mode="replay", latency=0.0, redact=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.redact = redact
+        self._interactions = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        if mode == "replay":
+            self.load()
+
+    @classmethod
+    def from_environ(cls, redact=None):
+        """Return the cassette configured by ``ADABOT_CASSETTE``, or ``None``."""
+        path = os.environ.get("ADABOT_CASSETTE", "")
+        if not path:
+            return None
+        latency = os.environ.get("ADABOT_CASSETTE_LATENCY", "0")
+        return cls(
+            path,
+            os.environ.get("ADABOT_CASSETTE_MODE", "replay"),
+            latency if latency == "recorded" else float(latency),
+            redact,
+        )
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._interactions.values())
+
+    def load(self):
+        """Read the interactions from the cassette file."""
+        with open(self.path, encoding="utf-8") as cassette_file:
+            data = json.load(cassette_file)
+        with self._lock:
+            self._interactions = {}
+            self._positions = {}
+            for entry in data["interactions"]:
+                self._interactions.setdefault(entry["key"], []).append(entry)
+
+    def save(self):
+        """Write the recorded interactions to the cassette file."""
+        with self._lock:
+            interactions = [
+                self._redacted(entry)
+                for entries in self._interactions.values()
+                for entry in entries
+            ]
+        with open(self.path, "w", encoding="utf-8") as cassette_file:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": interactions},
+                cassette_file,
+                indent=1,
+            )
+
+    def _redacted(self, entry):
+        if self.redact is None:
+            return entry
+        entry = dict(entry)
+        entry["headers"] = {
+            name: self.redact(value) for name, value in entry["headers"].items()
+        }
+        if "text" in entry:
+            entry["text"] = self.redact(entry["text"])
+        return entry
+
+    def record(self, request, response):
+        """Add `response` to the cassette as the answer to `request`."""
+        content = response.content or b""
+        if _TOKEN_RESPONSE.search(urlsplit(request.url).path):
+            content = _without_token(content)
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        entry = {
+            "key": request_key(request.method, request.url, request.body),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _UNRECORDED_HEADERS
+            },
+            "elapsed": response.elapsed.total_seconds(),
+            **body,
+        }
+        with self._lock:
+            self._interactions.setdefault(entry["key"], []).append(entry)
+
+    def play(self, request, adapter=None):
+        """Return the recorded response to `request`. Repeated requests get
+        the recorded responses in order, and the last one once those run out.
+        """
+        key = request_key(request.method, request.url, request.body)
+        with self._lock:
+            entries = self._interactions.get(key)
+            if not entries:
+                raise CassetteMiss(f"Not in cassette {self.path}: {key}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+
+        latency = entry["elapsed"] if self.latency == "recorded" else self.latency
+        if latency:
+            time.sleep(latency)
+
+        if "base64" in entry:
+            content = base64.b64decode(entry["base64"])
+        else:
+            content = entry["text"].encode("utf-8")
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=entry["headers"],
+            status=entry["status"],
+            preload_content=False,
+        )
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        response.elapsed = datetime.timedelta(seconds=entry["elapsed"])
+        return response
+
+
+def _without_token(content):
+    """Return the JSON `content` of an installation token response with the
+    token replaced.
+    """
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+    if isinstance(data, dict) and "token" in data:
+        data["token"] = REDACTED
+    return json.dumps(data).encode("utf-8")
+
+
+def _send(adapter, request, *args, **kwargs):
+    cassette = _active
+    if cassette.mode == "replay":
+        return cassette.play(request, adapter)
+    response = _wrapped_send(adapter, request, *args, **kwargs)
+    cassette.record(request, response)
+    return response
+
+
+def install(cassette):
+    """Route every request through `cassette`. In record mode the cassette is
+    saved when it is uninstalled or the interpreter exits.
+    """
+    global _active, _wrapped_send  # pylint: disable=global-statement
+    uninstall()
+    _active = cassette
+    _wrapped_send = HTTPAdapter.send
+    HTTPAdapter.send = _send
+    if cassette.mode == "record":
+        atexit.register(cassette.save)
+    return cassette
+
+
+def uninstall():
+    """Stop using the installed cassette, saving it if it was recording."""
+    global _active, _wrapped_send  # pylint: disable=global-statement
+    cassette, _active = _active, None
+    if _wrapped_send is not None:
+        HTTPAdapter.send, _wrapped_send = _wrapped_send, None
+    if cassette is not None and cassette.mode == "record":
+        atexit.unregister(cassette.save)
+        cassette.save()
+
+
+def active():
+    """Return the installed cassette, or ``None``."""
+    return _active
+
+
+def install_from_environ(redact=None):
+    """Install the cassette configured by ``ADABOT_CASSETTE``, if any, saving
+    it through `redact`.
+    """
+    cassette = Cassette.from_environ(redact)
+    if cassette is not None:
+        install(cassette)
+    return cassette
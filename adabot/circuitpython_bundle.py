@@ -22,6 +22,7 @@ from sh.contrib import git
 
 from adabot import github_requests as gh_reqs
 from adabot.lib import common_funcs
+from adabot.lib import reference_data
 from adabot import circuitpython_library_download_stats as dl_stats
 
 
@@ -75,7 +76,7 @@ def update_download_stats(bundle_path):
     with open(os.path.join(bundle_path, "circuitpython_library_list.md")) as md_file:
         lib_list_full = md_file.read()
 
-    submodules_list = common_funcs.get_bundle_submodules()
+    submodules_list = reference_data.get_reference_data().bundle_index()
     lib_list_header = [
         "# Adafruit CircuitPython Library Download Stats",
         (
@@ -161,10 +162,8 @@ def check_lib_links_md(bundle_path):
         listfile_name = "circuitpython_community_auto_library_list.md"
     else:
         return []
-    submodules_list = sorted(
-        common_funcs.get_bundle_submodules(bundle=bundle),
-        key=lambda module: module[1]["path"],
-    )
+    bundle_index = reference_data.get_reference_data().bundle_index(bundle)
+    submodules_list = sorted(bundle_index, key=lambda module: module[1]["path"])
 
     lib_count = len(submodules_list)
     # used to generate commit message by comparing new libs to current list
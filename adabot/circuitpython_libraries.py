@@ -9,22 +9,20 @@ import argparse
 import datetime
 import inspect
 import logging
-import os
 import re
 import sys
 import traceback
 
-import github as pygithub
-import requests
-
-from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
-from adabot import pypi_requests as pypi
+from adabot import github_requests as gh_reqs
+from adabot.metrics import METRICS
 from adabot.lib import circuitpython_library_validators as cirpy_lib_vals
 from adabot.lib import common_funcs
+from adabot.lib import reference_data
+from adabot.lib.repo_snapshot import RepoSnapshot
 from adabot.lib import blinka_funcs
 from adabot.lib import bundle_announcer
 
-GH_INTERFACE = pygithub.Github(os.environ.get("ADABOT_GITHUB_ACCESS_TOKEN"))
+GH_INTERFACE = gh_reqs.TOKENS.pooled_github()
 
 logger = logging.getLogger(__name__)
 ch = logging.StreamHandler(stream=sys.stdout)
@@ -68,6 +66,42 @@ cmd_line_parser.add_argument(
     dest="validator",
     metavar='all OR "validator1, validator2, ..."',
 )
+cmd_line_parser.add_argument(
+    "--cache-etags",
+    help="Revalidate GitHub API responses with ETags, persisted between runs.",
+    action="store_true",
+    default=False,
+    dest="cache_etags",
+)
+cmd_line_parser.add_argument(
+    "--metrics-file",
+    help="Save GitHub request metrics to the filename provided.",
+    metavar="<METRICS FILENAME>",
+    dest="metrics_file",
+)
+cmd_line_parser.add_argument(
+    "--metrics-format",
+    help="Format of the metrics file. Default is json.",
+    choices=["json", "prometheus"],
+    default="json",
+    dest="metrics_format",
+)
+cmd_line_parser.add_argument(
+    "-j",
+    "--jobs",
+    help="Number of repositories to check at once. Default is 1.",
+    type=int,
+    default=1,
+    dest="jobs",
+    metavar="n",
+)
+cmd_line_parser.add_argument(
+    "--local-bundle",
+    help="Read the library files from the submodules of this bundle checkout, "
+    "updated to their default branch, instead of downloading them.",
+    metavar="<BUNDLE PATH>",
+    dest="local_bundle",
+)
 
 # Functions to run on repositories to validate their state.  By convention these
 # return a list of string errors for the specified repository (a dictionary
@@ -95,32 +129,39 @@ blinka_repos = [
 ]
 
 
+def _insights_kind(repo):
+    """Return which insights `repo` counts towards: 'lib', 'blinka' or 'core'."""
+    if repo["owner"]["login"] == "adafruit":
+        if repo["name"] in blinka_repos:
+            return "blinka"
+        if repo["name"] == "circuitpython":
+            return "core"
+    return "lib"
+
+
 # pylint: disable=too-many-locals, too-many-branches, too-many-statements
-def run_library_checks(validators, kw_args, error_depth):
+def run_library_checks(validators, kw_args, error_depth, jobs=1):
     """runs the various library checking functions"""
 
     # Load the latest pylint version
-    latest_pylint = "2.0.1"
-    pylint_info = pypi.get("/pypi/pylint/json")
-    if pylint_info and pylint_info.ok:
-        latest_pylint = pylint_info.json()["info"]["version"]
+    reference = reference_data.get_reference_data()
+    latest_pylint = reference.latest_pylint(default="2.0.1")
     # logger.info("Latest pylint is: %s", latest_pylint)
 
-    repos = common_funcs.list_repos(
-        include_repos=tuple(blinka_repos)
-        + ("CircuitPython_Community_Bundle", "cookiecutter-adafruit-circuitpython")
-    )
-
-    logger.info("Found %s repos to check.", len(repos))
-    bundle_submodules = common_funcs.get_bundle_submodules()
+    bundle_submodules = reference.bundle_index()
     logger.info("Found %s submodules in the bundle.", len(bundle_submodules))
     github_user = common_funcs.whois_github_user()
     logger.info("Running GitHub checks as %s", github_user)
     need_work = 0
 
-    lib_insights = common_funcs.InsightData()
-    blinka_insights = common_funcs.InsightData()
-    core_insights = common_funcs.InsightData()
+    insights_by_kind = {
+        "lib": common_funcs.InsightData(),
+        "blinka": common_funcs.InsightData(),
+        "core": common_funcs.InsightData(),
+    }
+    lib_insights = insights_by_kind["lib"]
+    blinka_insights = insights_by_kind["blinka"]
+    core_insights = insights_by_kind["core"]
     core_insights["milestones"] = dict()
 
     repo_needs_work = []
@@ -130,9 +171,54 @@ def run_library_checks(validators, kw_args, error_depth):
     validator = cirpy_lib_vals.LibraryValidator(
         validators, bundle_submodules, latest_pylint, **kw_args
     )
-    for repo in repos:
+
+    def check_repo(repo):
+        """Validate `repo` and gather its insights into a new `InsightData`.
+        With `jobs` above 1 this runs on a worker thread.
+        """
+        # One snapshot for both, so nothing is fetched twice.
+        snapshot = RepoSnapshot.of(repo)
+        validation = None
         if len(validators) != 0:
-            errors = validator.run_repo_validation(repo)
+            validation = validator.run_captured(validator.run_repo_validation, snapshot)
+        kind = _insights_kind(repo)
+        repo_insights = common_funcs.InsightData()
+        if kind == "core":
+            repo_insights["milestones"] = {}
+        insight_result = validator.run_captured(
+            validator.gather_insights,
+            snapshot,
+            repo_insights,
+            since,
+            show_closed_metric=kind == "lib",
+        )
+        # A plain copy, so the repos checked don't keep their snapshot data.
+        return dict(repo), validation, kind, repo_insights, insight_result
+
+    include_repos = tuple(blinka_repos) + (
+        "CircuitPython_Community_Bundle",
+        "cookiecutter-adafruit-circuitpython",
+    )
+    # Check each page of repos as soon as it is listed and the data the
+    # validators need is prefetched, however many repos are checked at once.
+    # The results are then reported in the order of `list_repos`.
+    repo_order = common_funcs.list_repos_order(include_repos)
+    results = sorted(
+        common_funcs.map_in_order(
+            check_repo,
+            validator.prefetched_repos(
+                common_funcs.iter_repo_pages(include_repos=include_repos)
+            ),
+            jobs,
+        ),
+        key=lambda result: repo_order(result[0]),
+    )
+    repos = []
+    for repo, validation, kind, repo_insights, insight_result in results:
+        repos.append(repo)
+        if validation is not None:
+            validator.output_file_data.extend(validation.output)
+            errors = validation.errors
             if errors:
                 need_work += 1
                 repo_needs_work.append(repo)
@@ -155,22 +241,16 @@ def run_library_checks(validators, kw_args, error_depth):
                     repos_by_error[error[0]].append(
                         "{0} ({1} days)".format(repo["html_url"], error[1])
                     )
-        insights = lib_insights
-        if repo["owner"]["login"] == "adafruit":
-            if repo["name"] in blinka_repos:
-                insights = blinka_insights
-            elif repo["name"] == "circuitpython":
-                insights = core_insights
-        closed_metric = bool(insights == lib_insights)
-        errors = validator.gather_insights(
-            repo, insights, since, show_closed_metric=closed_metric
-        )
+        insights_by_kind[kind].merge(repo_insights)
+        validator.output_file_data.extend(insight_result.output)
+        errors = insight_result.errors
         if errors:
             print("insights error")
             for error in errors:
                 if error == cirpy_lib_vals.ERROR_OUTPUT_HANDLER:
                     logger.info(", ".join(validator.output_file_data))
                     validator.output_file_data.clear()
+    logger.info("Checked %s repos.", len(repos))
 
     logger.info("")
     logger.info("State of CircuitPython + Libraries + Blinka")
@@ -222,13 +302,7 @@ def run_library_checks(validators, kw_args, error_depth):
 
     logger.info("### Libraries")
     # Bundle library counts
-    resp = requests.get(
-        "https://raw.githubusercontent.com/adafruit/"
-        "CircuitPython_Community_Bundle/main/.gitmodules",
-        timeout=REQUESTS_TIMEOUT,
-    )
-    community_bundle_submodules = resp.text
-    community_library_count = community_bundle_submodules.count("submodule")
+    community_library_count = len(reference.bundle_index("community"))
     logger.info(
         "* Adafruit Libraries: %s Community Libraries: %s (Total: %s)",
         len(bundle_submodules),
@@ -577,8 +651,18 @@ def print_issue_overview(*insights):
     )
 
 
-# pylint: disable=too-many-branches
-def main(verbose=1, output_file=None, validator=None, error_depth=5):
+# pylint: disable=too-many-branches,too-many-arguments
+def main(
+    verbose=1,
+    output_file=None,
+    validator=None,
+    error_depth=5,
+    cache_etags=False,
+    metrics_file=None,
+    metrics_format="json",
+    jobs=1,
+    local_bundle=None,
+):
     """Main"""
     validator_kwarg_list = {}
     startup_message = [
@@ -596,6 +680,16 @@ def main(verbose=1, output_file=None, validator=None, error_depth=5):
             " - Report output will be saved to: {}".format(output_file)
         )
 
+    if cache_etags:
+        gh_reqs.setup_conditional_cache()
+
+    if local_bundle:
+        startup_message.append(
+            " - Library files will be read from: {}".format(local_bundle)
+        )
+        common_funcs.checkout_default_branches(local_bundle)
+        validator_kwarg_list["local_bundle"] = local_bundle
+
     validators = []
     validator_names = []
     if validator:
@@ -645,15 +739,6 @@ def main(verbose=1, output_file=None, validator=None, error_depth=5):
             " - These validators will run: {}".format(", ".join(validator_names))
         )
 
-        if "validate_contents" not in validator_names:
-            validator_kwarg_list["validate_contents_quiet"] = True
-            validators.insert(
-                0,
-                [val[1] for val in default_validators if "validate_contents" in val[0]][
-                    0
-                ],
-            )
-
     try:
         for message in startup_message:
             logger.info(message)
@@ -663,6 +748,7 @@ def main(verbose=1, output_file=None, validator=None, error_depth=5):
             validators,
             validator_kwarg_list,
             error_depth,
+            jobs=jobs,
         )
     except:
         _, exc_val, exc_tb = sys.exc_info()
@@ -675,6 +761,9 @@ def main(verbose=1, output_file=None, validator=None, error_depth=5):
         logger.error(exc_val)
 
         raise
+    finally:
+        if metrics_file:
+            METRICS.dump(metrics_file, metrics_format)
 
 
 if __name__ == "__main__":
@@ -684,4 +773,9 @@ if __name__ == "__main__":
         output_file=cli_args.output_file,
         validator=cli_args.validator,
         error_depth=cli_args.error_depth,
+        cache_etags=cli_args.cache_etags,
+        metrics_file=cli_args.metrics_file,
+        metrics_format=cli_args.metrics_format,
+        jobs=cli_args.jobs,
+        local_bundle=cli_args.local_bundle,
     )
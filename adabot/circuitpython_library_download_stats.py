@@ -76,9 +76,8 @@ def parse_piwheels_stats():
     """Map piwheels download stats for each repo"""
     successful_stats = {}
     failed_stats = []
-    repos = common_funcs.list_repos()
     dl_stats = retrieve_piwheels_stats()
-    for repo in repos:
+    for repo in common_funcs.iter_repos():
         if repo["owner"]["login"] == "adafruit" and repo["name"].startswith(
             "Adafruit_CircuitPython"
         ):
@@ -93,22 +93,26 @@ cli_parser.add_argument(
 )
 
 
-def get_repo_list():
-    """Uses adabot.circuitpython_libraries module to get a list of
-    CircuitPython repositories. Filters the list down to adafruit
+def iter_repo_list():
+    """Uses adabot.circuitpython_libraries module to yield the CircuitPython
+    repositories as they are listed. Filters them down to adafruit
     owned/sponsored CircuitPython libraries.
     """
-    repo_list = []
-    get_repos = common_funcs.list_repos()
-    for repo in get_repos:
+    for repo in common_funcs.iter_repos():
         if not (
             repo["owner"]["login"] == "adafruit"
             and repo["name"].startswith("Adafruit_CircuitPython")
         ):
             continue
-        repo_list.append(dict(name=repo["name"], url=repo["clone_url"]))
+        yield dict(name=repo["name"], url=repo["clone_url"])
 
-    return repo_list
+
+def get_repo_list():
+    """Uses adabot.circuitpython_libraries module to get a list of
+    CircuitPython repositories. Filters the list down to adafruit
+    owned/sponsored CircuitPython libraries.
+    """
+    return list(iter_repo_list())
 
 
 def get_patches(run_local):
@@ -461,10 +465,11 @@ if __name__ == "__main__":
         except FileNotFoundError:
             pass
 
-        repos = get_repo_list()
-        print(".... Running Patch Checks On", len(repos), "Repos ....")
+        print(".... Running Patch Checks ....")
+        repo_count = 0
 
-        for repository in repos:
+        for repository in iter_repo_list():
+            repo_count += 1
             results = check_patches(
                 repository,
                 run_patches,
@@ -474,6 +479,7 @@ if __name__ == "__main__":
             )
             for k in range(3):
                 stats[k] += results[k]
+        print(".... Checked", repo_count, "Repos ....")
 
     print(".... Patch Updates Completed ....")
     print(".... Patches Applied:", stats[0])
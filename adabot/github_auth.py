@@ -0,0 +1,270 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Pool of GitHub credentials shared by `github_requests` and PyGithub.
+
+Tokens are read from ``ADABOT_GITHUB_ACCESS_TOKEN`` and the comma separated
+``ADABOT_GITHUB_ACCESS_TOKENS``. The pool tracks the rate limit budget of each
+token from the response headers, and every request is sent with the token
+that has the most budget left, so one run can use the combined hourly limit
+of all of them.
+
+A GitHub App installation can be added to the pool by setting
+``ADABOT_GITHUB_APP_ID``, ``ADABOT_GITHUB_APP_INSTALLATION_ID`` and either
+``ADABOT_GITHUB_APP_PRIVATE_KEY`` or ``ADABOT_GITHUB_APP_PRIVATE_KEY_PATH``.
+Its installation token is minted on first use and refreshed before it expires.
+"""
+
+import datetime
+import os
+import threading
+import time
+from base64 import b64encode
+
+import github as pygithub
+import jwt
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from adabot import REQUESTS_TIMEOUT
+
+# Installation tokens are refreshed when they have less than this many seconds
+# left, so a token never expires halfway through a batch of requests.
+TOKEN_REFRESH_MARGIN = 5 * 60
+
+# GitHub rejects app JWTs that are valid for more than ten minutes.
+JWT_LIFETIME = 9 * 60
+
+
+class AppInstallationToken:
+    """Installation access token of a GitHub App, refreshed before expiry.
+
+    :param str app_id: The GitHub App ID.
+    :param str private_key: The PEM encoded private key of the app.
+    :param str installation_id: The ID of the app's installation.
+    :param str base_url: The GitHub API URL, a local stand-in when testing.
+    """
+
+    def __init__(
+        self, app_id, private_key, installation_id, base_url="https://api.github.com"
+    ):
+        self.app_id = app_id
+        self.private_key = private_key
+        self.installation_id = installation_id
+        self.base_url = base_url.rstrip("/")
+        self.last_token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environ(cls):
+        """Build the app token from the ``ADABOT_GITHUB_APP_*`` environment
+        variables, or return ``None`` if no app is configured.
+        """
+        app_id = os.environ.get("ADABOT_GITHUB_APP_ID")
+        if not app_id:
+            return None
+        private_key = os.environ.get("ADABOT_GITHUB_APP_PRIVATE_KEY")
+        if not private_key:
+            with open(
+                os.environ["ADABOT_GITHUB_APP_PRIVATE_KEY_PATH"], encoding="utf-8"
+            ) as key_file:
+                private_key = key_file.read()
+        return cls(
+            app_id,
+            private_key,
+            os.environ["ADABOT_GITHUB_APP_INSTALLATION_ID"],
+            base_url=os.environ.get("ADABOT_GITHUB_API_URL", "https://api.github.com"),
+        )
+
+    def make_jwt(self):
+        """Return a JWT identifying the app, signed with its private key."""
+        now = int(time.time())
+        payload = {
+            # Backdated to allow for clock drift.
+            "iat": now - 60,
+            "exp": now + JWT_LIFETIME,
+            "iss": str(self.app_id),
+        }
+        return jwt.encode(payload, self.private_key, algorithm="RS256")
+
+    def _fetch(self):
+        response = requests.post(
+            f"{self.base_url}/app/installations/{self.installation_id}/access_tokens",
+            headers={
+                "Accept": "application/vnd.github+json",
+                "Authorization": f"Bearer {self.make_jwt()}",
+            },
+            timeout=REQUESTS_TIMEOUT,
+        )
+        if response.status_code != 201:
+            raise RuntimeError(
+                "Unable to get an installation token for GitHub App "
+                f"{self.app_id}: {response.status_code} {response.reason}"
+            )
+        data = response.json()
+        expires_at = datetime.datetime.strptime(
+            data["expires_at"], "%Y-%m-%dT%H:%M:%SZ"
+        ).replace(tzinfo=datetime.timezone.utc)
+        return data["token"], expires_at.timestamp()
+
+    def token(self):
+        """Return a valid installation token, fetching a new one if the current
+        token is missing or about to expire.
+        """
+        with self._lock:
+            if self._expires_at - TOKEN_REFRESH_MARGIN <= time.time():
+                self.last_token, self._expires_at = self._fetch()
+            return self.last_token
+
+
+class TokenPool:  # pylint: disable=too-many-instance-attributes
+    """Rotating pool of GitHub access tokens.
+
+    :param list tokens: The access tokens to use.
+    :param str user: The GitHub user sent with the tokens for basic auth.
+    :param AppInstallationToken app: A GitHub App installation to use as well.
+    """
+
+    def __init__(self, tokens, user="", app=None):
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        self.user = user
+        self.app = app
+        # The app goes first; it has the highest limit.
+        self._credentials = ([app] if app else []) + self.tokens
+        # credential -> resource -> (remaining, reset timestamp)
+        self._budgets = {credential: {} for credential in self._credentials}
+        self._auth_headers = {self._basic_auth(token): token for token in self.tokens}
+        # credential -> (token, github.Github)
+        self._interfaces = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environ(cls):
+        """Build the pool from the ``ADABOT_GITHUB_*`` environment variables."""
+        tokens = [os.environ.get("ADABOT_GITHUB_ACCESS_TOKEN", "")]
+        tokens.extend(os.environ.get("ADABOT_GITHUB_ACCESS_TOKENS", "").split(","))
+        return cls(
+            [token.strip() for token in tokens],
+            user=os.environ.get("ADABOT_GITHUB_USER", ""),
+            app=AppInstallationToken.from_environ(),
+        )
+
+    def __len__(self):
+        return len(self._credentials)
+
+    def _basic_auth(self, token):
+        basic_encoded = b64encode(str(self.user + ":" + token).encode()).decode()
+        return "Basic {}".format(basic_encoded)
+
+    def _credential_for(self, auth_header):
+        if self.app and auth_header == f"token {self.app.last_token}":
+            return self.app
+        return self._auth_headers.get(auth_header)
+
+    def _budget(self, credential, resource, now):
+        remaining, reset = self._budgets[credential].get(resource, (None, 0))
+        if remaining is None or reset <= now:
+            # Unknown or already reset; try it before the known ones.
+            return float("inf")
+        return remaining
+
+    def select(self, resource="core"):
+        """Return the credential (an access token or the app) with the most
+        budget left for `resource`, or ``None`` if the pool is empty.
+        """
+        with self._lock:
+            self._sync_pygithub()
+            if not self._credentials:
+                return None
+            now = time.time()
+            return max(
+                self._credentials,
+                key=lambda credential: self._budget(credential, resource, now),
+            )
+
+    def auth_header(self, resource="core"):
+        """Return the ``Authorization`` header value for the credential with
+        the most budget left, or ``None`` if the pool is empty.
+        """
+        credential = self.select(resource)
+        if credential is None:
+            return None
+        if self.app is not None and credential is self.app:
+            return f"token {self.app.token()}"
+        return self._basic_auth(credential)
+
+    def update(self, auth_header, headers):
+        """Record the rate limit budget reported in the response `headers` of
+        a request sent with `auth_header`. Returns ``True`` if `auth_header`
+        belongs to a token in the pool.
+        """
+        credential = self._credential_for(auth_header)
+        if credential is None:
+            return False
+        headers = CaseInsensitiveDict(headers)
+        if "X-RateLimit-Remaining" in headers:
+            resource = headers.get("X-RateLimit-Resource", "core")
+            with self._lock:
+                self._budgets[credential][resource] = (
+                    int(headers["X-RateLimit-Remaining"]),
+                    int(headers.get("X-RateLimit-Reset", 0)),
+                )
+        return True
+
+    def _sync_pygithub(self):
+        # PyGithub keeps the rate limit of its last response on the requester.
+        # The public properties would make an extra request when it is unset.
+        for credential, (_, interface) in self._interfaces.items():
+            requester = interface._Github__requester  # pylint: disable=protected-access
+            remaining, _ = requester.rate_limiting
+            if credential is not None and remaining >= 0:
+                self._budgets[credential]["core"] = (
+                    remaining,
+                    requester.rate_limiting_resettime,
+                )
+
+    def github_interface(self):
+        """Return a ``github.Github`` instance for the credential with the most
+        budget left. The app's instance is replaced when its token is refreshed.
+        """
+        credential = self.select()
+        kwargs = {}
+        token = credential
+        if self.app is not None and credential is self.app:
+            token = self.app.token()
+            kwargs["base_url"] = self.app.base_url
+        with self._lock:
+            if (
+                credential not in self._interfaces
+                or self._interfaces[credential][0] != token
+            ):
+                interface = pygithub.Github(token, **kwargs)
+                self._interfaces[credential] = (token, interface)
+            return self._interfaces[credential][1]
+
+    def pooled_github(self):
+        """Return a stand-in for ``github.Github`` that forwards every call to
+        the instance for the token with the most budget left.
+        """
+        return PooledGithub(self)
+
+    def redact(self, text):
+        """Replace every token in `text` with ``[secure]``."""
+        tokens = list(self.tokens)
+        if self.app and self.app.last_token:
+            tokens.append(self.app.last_token)
+        for token in tokens:
+            text = text.replace(token, "[secure]")
+        return text
+
+
+class PooledGithub:  # pylint: disable=too-few-public-methods
+    """Forwards attribute access to the best ``github.Github`` in a pool."""
+
+    def __init__(self, pool):
+        self._pool = pool
+
+    def __getattr__(self, name):
+        return getattr(self._pool.github_interface(), name)
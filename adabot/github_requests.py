@@ -4,29 +4,198 @@
 
 """Wrapper for GitHub requests."""
 
-import types
-from base64 import b64encode
-import datetime
 import functools
 import logging
 import os
+import threading
 import time
 import traceback
 
 import requests
 import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from adabot import cache_policy, cassette
+from adabot.cache_policy import CachePolicy, CacheStats
+from adabot.github_auth import TokenPool
+from adabot.http_cache import DEFAULT_MAX_SIZE, CompactCache, ConditionalCache
+from adabot.metrics import METRICS
+from adabot.rate_limit import SCHEDULER
 
 TIMEOUT = 60
 
+# How many times a request rejected by a rate limit is retried.
+RATE_LIMIT_RETRIES = 3
+
+# Connection pool settings for the shared session. The pool size is the number
+# of keep-alive connections held open per host.
+POOL_SIZE = 10
+MAX_RETRIES = 3
+
+_session = None
+_session_pool_size = POOL_SIZE
+_session_lock = threading.Lock()
+_conditional_cache = None
+
+CACHE_NAME = "github_cache"
+CACHE_STATS = CacheStats()
+_cache_installed = False
+
+# Directory holding the HTTP caches. When ADABOT_CACHE_DIR is set, every
+# process using github_requests sets up and shares the caches in it.
+CACHE_DIR = os.environ.get("ADABOT_CACHE_DIR", "")
+
+# Send requests to a local fake GitHub (see adabot.testing.fakehub) when
+# ADABOT_FAKEHUB is set to its URL.
+if os.environ.get("ADABOT_FAKEHUB"):
+    from adabot.testing import fakehub
+
+    fakehub.redirect(os.environ["ADABOT_FAKEHUB"])
+
+# Access tokens from ADABOT_GITHUB_ACCESS_TOKEN and ADABOT_GITHUB_ACCESS_TOKENS.
+TOKENS = TokenPool.from_environ()
 
-def setup_cache(expire_after=7200):
-    """Sets up a cache for requests."""
+# Record or replay all HTTP traffic when ADABOT_CASSETTE is set.
+if cassette.active() is None:
+    cassette.install_from_environ(redact=TOKENS.redact)
+
+
+class _ScheduledAdapter(HTTPAdapter):
+    """Adapter that waits for the rate limit scheduler before sending a
+    GitHub API request. Responses served by the ``requests_cache`` cache never
+    reach the adapter, so they are not held back.
+    """
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        SCHEDULER.acquire(
+            SCHEDULER.resource_for(request.url), request.headers.get("Authorization")
+        )
+        return super().send(request, *args, **kwargs)
+
+
+def _build_session(pool_size, max_retries):
+    retries = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries
+    )
+    # ``requests.Session`` is looked up at call time so that a cache installed
+    # by ``setup_cache`` is picked up by the new session.
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.mount(
+        "https://api.github.com/",
+        _ScheduledAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries
+        ),
+    )
+    return session
+
+
+def setup_session(pool_size=POOL_SIZE, max_retries=MAX_RETRIES):
+    """Sets up the pooled keep-alive session shared by all requests, replacing
+    any existing one. Connection errors and 5xx responses to idempotent
+    requests are retried with backoff.
+    """
+    global _session, _session_pool_size  # pylint: disable=global-statement
+    session = _build_session(pool_size, max_retries)
+    with _session_lock:
+        old_session, _session = _session, session
+        _session_pool_size = pool_size
+    if old_session is not None:
+        old_session.close()
+    return session
+
+
+def get_session():
+    """Returns the shared session, creating it on first use."""
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                if CACHE_DIR and not _cache_installed:
+                    _install_cache()
+                    setup_conditional_cache()
+                _session = _build_session(_session_pool_size, MAX_RETRIES)
+    return _session
+
+
+def ensure_pool_size(pool_size):
+    """Grows the shared session's connection pool to hold at least
+    `pool_size` connections, for callers issuing requests from several threads.
+    """
+    global _session, _session_pool_size  # pylint: disable=global-statement
+    with _session_lock:
+        if _session_pool_size >= pool_size:
+            return
+        _session_pool_size = pool_size
+        if _session is not None:
+            # Other threads may still have requests in flight on the old
+            # session, so it is left to be garbage collected, not closed.
+            _session = _build_session(pool_size, MAX_RETRIES)
+
+
+def cache_path(filename):
+    """Returns the location of the cache file `filename` in `CACHE_DIR`."""
+    return os.path.join(CACHE_DIR, filename)
+
+
+def _install_cache(expire_after=7200, policy=None, max_size=DEFAULT_MAX_SIZE):
+    global _cache_installed  # pylint: disable=global-statement
+    if policy is None:
+        policy = CachePolicy(default=expire_after)
     requests_cache.install_cache(
-        cache_name="github_cache",
-        backend="sqlite",
-        expire_after=expire_after,
+        cache_name=CACHE_NAME,
+        backend=CompactCache(cache_path(CACHE_NAME + ".sqlite"), max_size=max_size),
         allowable_codes=(200, 404),
+        session_factory=cache_policy.session_factory(policy, CACHE_STATS),
+    )
+    _cache_installed = True
+
+
+def setup_cache(expire_after=7200, policy=None, max_size=DEFAULT_MAX_SIZE):
+    """Sets up a cache for requests. Responses expire according to `policy`, a
+    `CachePolicy` of per-URL-pattern TTLs, or after `expire_after` seconds if
+    they match none of its patterns. They are stored compressed, evicting the
+    least recently used ones beyond `max_size` bytes.
+    """
+    _install_cache(expire_after, policy, max_size)
+    # Rebuild the shared session so it goes through the cache.
+    setup_session()
+
+
+def cache_stats():
+    """Returns a summary of the hits, misses and stale entries of the cache set
+    up by `setup_cache`, with its size.
+    """
+    return CACHE_STATS.summary(
+        requests_cache.get_cache(), db_path=cache_path(CACHE_NAME + ".sqlite")
+    )
+
+
+def setup_conditional_cache(path=None, max_size=DEFAULT_MAX_SIZE):
+    """Sets up a persistent ETag/Last-Modified cache. Every GET is sent with
+    the validators of its last stored response, and a ``304 Not Modified``
+    (which does not count against the rate limit) is answered from the cache.
+    The responses are stored compressed, evicting the least recently used
+    ones beyond `max_size` bytes.
+    """
+    global _conditional_cache  # pylint: disable=global-statement
+    _conditional_cache = ConditionalCache(
+        path or cache_path("github_etag_cache.sqlite"), max_size=max_size
     )
+    return _conditional_cache
 
 
 def _fix_url(url):
@@ -47,56 +216,153 @@ def _fix_kwargs(kwargs):
             kwargs["headers"]["Accept"] = api_version
     else:
         kwargs["headers"] = {"Accept": "application/vnd.github.hellcat-preview+json"}
-    if "ADABOT_GITHUB_ACCESS_TOKEN" in os.environ and "auth" not in kwargs:
-        user = os.environ.get("ADABOT_GITHUB_USER", "")
-        access_token = os.environ["ADABOT_GITHUB_ACCESS_TOKEN"]
-        basic_encoded = b64encode(str(user + ":" + access_token).encode()).decode()
-        auth_header = "Basic {}".format(basic_encoded)
-
-        kwargs["headers"]["Authorization"] = auth_header
+    if TOKENS and "auth" not in kwargs:
+        kwargs["headers"]["Authorization"] = TOKENS.auth_header()
 
     return kwargs
 
 
-def _safe_response_json(self):
+# Errors raised for a body that is not valid JSON.
+_JSON_DECODE_ERRORS = (requests.exceptions.JSONDecodeError,) + (
+    (orjson.JSONDecodeError,) if orjson is not None else ()
+)
+
+_NOT_DECODED = object()
+
+
+class GitHubResponse(requests.Response):
+    """Response whose JSON body is decoded once, with orjson when it is
+    installed. The decoded body is shared by every ``json()`` call, so callers
+    must not modify it.
     """
-    overridden response.json() function that will catch JSONDecodeError
-    log it but try to continue on afterward.
+
+    _decoded_json = _NOT_DECODED
+
+    def json(self, **kwargs):
+        """
+        Return the decoded JSON body. A JSONDecodeError is logged and
+        an empty dict returned, so callers can try to continue on afterward.
+        """
+        if kwargs:
+            return self._decode_json(functools.partial(super().json, **kwargs))
+        if self._decoded_json is _NOT_DECODED:
+            if orjson is not None:
+                self._decoded_json = self._decode_json(
+                    lambda: orjson.loads(self.content)
+                )
+            else:
+                self._decoded_json = self._decode_json(super().json)
+        return self._decoded_json
+
+    @staticmethod
+    def _decode_json(decode):
+        try:
+            return decode()
+        except _JSON_DECODE_ERRORS:
+            exception_text = TOKENS.redact(traceback.format_exc())
+            logging.warning("%s", exception_text)
+        return {}
+
+
+def _add_conditional_headers(url, kwargs):
+    """Adds the stored validators for `url` to the request headers and returns
+    the conditional cache key, or ``None`` if the cache is not set up.
     """
-    try:
-        return self.original_json()
-    except requests.exceptions.JSONDecodeError:
-        exception_text = traceback.format_exc()
-        if "ADABOT_GITHUB_ACCESS_TOKEN" in os.environ:
-            exception_text = exception_text.replace(
-                os.environ["ADABOT_GITHUB_ACCESS_TOKEN"], "[secure]"
-            )
-        logging.warning("%s", exception_text)
-    return {}
+    if _conditional_cache is None:
+        return None
+    full_url = (
+        requests.Request("GET", _fix_url(url), params=kwargs.get("params"))
+        .prepare()
+        .url
+    )
+    cache_key = ConditionalCache.make_key(full_url, kwargs["headers"])
+    kwargs["headers"] = dict(
+        kwargs["headers"], **_conditional_cache.conditional_headers(cache_key)
+    )
+    return cache_key
+
+
+def _send(method, url, kwargs):
+    """Sends the request once the rate limit scheduler allows it, retrying it
+    if it is rejected by a (secondary) rate limit.
+    """
+    resource = SCHEDULER.resource_for(url)
+    for _ in range(RATE_LIMIT_RETRIES):
+        # The session's adapter waits for the scheduler (see `_ScheduledAdapter`),
+        # pacing each token by its own budget.
+        auth_header = kwargs["headers"].get("Authorization")
+        response = get_session().request(
+            method, _fix_url(url), timeout=TIMEOUT, **kwargs
+        )
+        if getattr(response, "from_cache", False):
+            break
+        if response.status_code == 304:
+            # Revalidations do not count against the rate limit.
+            SCHEDULER.refund(resource, auth_header)
+        body = response.text if response.status_code in (403, 429) else ""
+        retry = SCHEDULER.update(
+            response.status_code, response.headers, body, resource, auth_header
+        )
+        if TOKENS.update(auth_header, response.headers):
+            # Retry any rate limit rejection with the token with the most
+            # budget left.
+            kwargs["headers"]["Authorization"] = TOKENS.auth_header(resource)
+        if not retry:
+            break
+    return response
 
 
 def request(method, url, **kwargs):
     """Processes request for `url`."""
+    start_time = time.monotonic()
     try:
-        response = getattr(requests, method)(
-            _fix_url(url), timeout=TIMEOUT, **_fix_kwargs(kwargs)
-        )
+        kwargs = _fix_kwargs(kwargs)
+        cache_key = None
+        if method == "get":
+            cache_key = _add_conditional_headers(url, kwargs)
+        response = _send(method, url, kwargs)
+        if cache_key is not None and response.status_code == 304:
+            replayed = _conditional_cache.replay(cache_key, response)
+            if replayed is None:
+                # The stored response is gone since its validators were sent
+                # (evicted, or cleared by another process): fetch it in full.
+                for name in ("If-None-Match", "If-Modified-Since"):
+                    kwargs["headers"].pop(name, None)
+                response = _send(method, url, kwargs)
+            else:
+                response = replayed
+        elapsed = time.monotonic() - start_time
         from_cache = getattr(response, "from_cache", False)
+        if (
+            cache_key is not None
+            and not from_cache
+            and not getattr(response, "revalidated", False)
+        ):
+            _conditional_cache.store(cache_key, response)
+        METRICS.record(
+            method,
+            _fix_url(url),
+            response.status_code,
+            elapsed,
+            len(response.content or b""),
+            from_cache=from_cache,
+            not_modified=getattr(response, "revalidated", False),
+        )
         # If rate limit remaining is missing, then assume we're fine. Use a million to signify this
         # case. GitHub will be in the single thousands.
         remaining = int(response.headers.get("X-RateLimit-Remaining", 1000000))
         logging.debug(
-            "GET %s %s status=%s",
+            "%s %s %s status=%s %.0fms%s",
+            method.upper(),
             url,
             f"{'(cache)' if from_cache else '(%d remaining)' % remaining}",
             response.status_code,
+            elapsed * 1000,
+            " (not modified)" if getattr(response, "revalidated", False) else "",
         )
     except requests.RequestException:
-        exception_text = traceback.format_exc()
-        if "ADABOT_GITHUB_ACCESS_TOKEN" in os.environ:
-            exception_text = exception_text.replace(
-                os.environ["ADABOT_GITHUB_ACCESS_TOKEN"], "[secure]"
-            )
+        METRICS.record(method, _fix_url(url), None, time.monotonic() - start_time)
+        exception_text = TOKENS.redact(traceback.format_exc())
         logging.critical("%s", exception_text)
         raise RuntimeError(
             "See log for error text that has been sanitized for secrets"
@@ -105,28 +371,9 @@ def request(method, url, **kwargs):
     if not from_cache:
         if remaining % 100 == 0 or remaining < 20:
             logging.info("%d requests remaining this hour", remaining)
-    if not from_cache and remaining <= 1:
-        rate_limit_reset = datetime.datetime.fromtimestamp(
-            int(response.headers["X-RateLimit-Reset"])
-        )
-        logging.warning(
-            "GitHub API Rate Limit reached. Pausing until Rate Limit reset."
-        )
-        # This datetime.now() is correct, *because* `fromtimestamp` above
-        # converts the timestamp into local time, same as now(). This is
-        # different than the sites that use GH_INTERFACE.get_rate_limit, in
-        # which the rate limit is a UTC time, so it has to be compared to
-        # utcnow.
-        while datetime.datetime.now() < rate_limit_reset:
-            logging.warning("Rate Limit will reset at: %s", rate_limit_reset)
-            reset_diff = rate_limit_reset - datetime.datetime.now()
-
-            # wait a full extra 60 seconds to avoid time collision
-            logging.info("Sleeping %s seconds", reset_diff.seconds + 60)
-            time.sleep(reset_diff.seconds + 60)
-
-    response.original_json = response.json
-    response.json = types.MethodType(_safe_response_json, response)
+
+    if type(response) is requests.Response:  # pylint: disable=unidiomatic-typecheck
+        response.__class__ = GitHubResponse
     return response
 
 
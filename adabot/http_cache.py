@@ -0,0 +1,511 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Persistent HTTP caches for GitHub requests.
+
+`ConditionalCache` handles conditional (ETag / Last-Modified) requests. GitHub
+does not count ``304 Not Modified`` responses against the rate limit, so
+revalidating a stored response is effectively free. The cache keeps the
+validators and compressed body of every successful GET, within a maximum
+size, hands back the matching conditional headers for the next request, and
+rebuilds the full response when the server answers 304.
+
+`CompactCache` is a ``requests_cache`` backend that stores responses
+compressed, within a maximum size, evicting the least recently used ones.
+Run ``python -m adabot.http_cache vacuum`` to compact the database file.
+
+Both caches open their database in WAL mode and take write locks up front,
+so several adabot processes can share one cache directory (see
+``ADABOT_CACHE_DIR`` in `adabot.github_requests`) and reuse each other's
+responses.
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+from requests_cache.backends.base import BaseCache
+
+# Default maximum size of the stored responses, in bytes.
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+# Eviction removes responses until the cache is this fraction of its maximum
+# size, so it does not run again on the next few saves.
+EVICTION_LOW_WATER = 0.9
+
+COMPRESSION_LEVEL = 6
+
+# Seconds to wait for another process to release the database.
+BUSY_TIMEOUT = 30
+
+
+def connect(path):
+    """Open the sqlite database at `path` for sharing between threads and
+    processes. Transactions are managed with `transaction`.
+    """
+    conn = sqlite3.connect(
+        path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextlib.contextmanager
+def transaction(conn):
+    """Run the block in a write transaction on `conn`. The write lock is
+    taken at the start, so a process never has to upgrade a read lock while
+    another one is writing.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class ConditionalCache:
+    """sqlite-backed store of responses keyed by request URL and Accept header.
+
+    Bodies are stored zlib compressed. Once the stored responses exceed
+    `max_size` bytes, the least recently replayed ones are evicted.
+
+    :param str path: Location of the sqlite database file.
+    :param int max_size: The maximum size of the stored responses, in bytes.
+    """
+
+    def __init__(self, path="github_etag_cache.sqlite", max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with transaction(self._conn):
+            # Left behind by earlier versions, which stored the bodies as is.
+            self._conn.execute("DROP TABLE IF EXISTS responses")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS conditional_responses ("
+                "key TEXT PRIMARY KEY, url TEXT, etag TEXT, last_modified TEXT, "
+                "headers TEXT, encoding TEXT, content BLOB, size INTEGER, "
+                "stored_at REAL, accessed_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS conditional_responses_accessed "
+                "ON conditional_responses (accessed_at)"
+            )
+            # The total size is kept in the database, as other processes
+            # sharing the cache change it too.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_meta "
+                "(name TEXT PRIMARY KEY, value INTEGER)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_meta VALUES ('size', "
+                "(SELECT COALESCE(SUM(size), 0) FROM conditional_responses))"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM conditional_responses"
+            ).fetchone()[0]
+
+    @property
+    def size(self):
+        """The total size of the stored (compressed) responses, in bytes."""
+        with self._lock:
+            return self._get_size()
+
+    def _get_size(self):
+        return self._conn.execute(
+            "SELECT value FROM cache_meta WHERE name = 'size'"
+        ).fetchone()[0]
+
+    def _add_size(self, delta):
+        self._conn.execute(
+            "UPDATE cache_meta SET value = value + ? WHERE name = 'size'", (delta,)
+        )
+
+    @staticmethod
+    def make_key(url, headers=None):
+        """Return the cache key for a fully resolved `url` and request headers."""
+        accept = (headers or {}).get("Accept", "")
+        return accept + " " + url
+
+    def _get(self, key):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT url, etag, last_modified, headers, encoding, content "
+                "FROM conditional_responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+    def conditional_headers(self, key):
+        """Return the ``If-None-Match``/``If-Modified-Since`` headers for `key`,
+        or an empty dict if nothing is stored.
+        """
+        row = self._get(key)
+        if row is None:
+            return {}
+        _, etag, last_modified, _, _, _ = row
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, key, response):
+        """Store a successful `response` if it carries a validator."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        headers = json.dumps(dict(response.headers))
+        content = zlib.compress(response.content, COMPRESSION_LEVEL)
+        size = len(headers) + len(content)
+        now = time.time()
+        with self._lock, transaction(self._conn):
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO conditional_responses "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.url,
+                    etag,
+                    last_modified,
+                    headers,
+                    response.encoding,
+                    content,
+                    size,
+                    now,
+                    now,
+                ),
+            )
+            self._add_size(size)
+            if self._get_size() > self.max_size:
+                self._evict(int(self.max_size * EVICTION_LOW_WATER))
+
+    def replay(self, key, not_modified):
+        """Rebuild the stored response for `key` from a ``304`` response.
+
+        Headers from `not_modified` (rate limit counters, a refreshed ETag)
+        take precedence over the stored ones. Returns ``None`` if nothing is
+        stored for `key`.
+        """
+        row = self._get(key)
+        if row is None:
+            return None
+        with self._lock, transaction(self._conn):
+            self._conn.execute(
+                "UPDATE conditional_responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+        url, _, _, headers, encoding, content = row
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = url
+        response.encoding = encoding
+        response._content = zlib.decompress(content)  # pylint: disable=protected-access
+        response.headers.update(json.loads(headers))
+        response.headers.update(not_modified.headers)
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.revalidated = True
+        return response
+
+    def _delete(self, key):
+        row = self._conn.execute(
+            "SELECT size FROM conditional_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute(
+                "DELETE FROM conditional_responses WHERE key = ?", (key,)
+            )
+            self._add_size(-row[0])
+
+    def _evict(self, target_size):
+        """Remove the least recently used responses until the cache is no
+        larger than `target_size` bytes.
+        """
+        while self._get_size() > target_size:
+            rows = self._conn.execute(
+                "SELECT key FROM conditional_responses "
+                "ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for (key,) in rows:
+                self._delete(key)
+                if self._get_size() <= target_size:
+                    break
+
+    def clear(self):
+        """Remove every stored response."""
+        with self._lock, transaction(self._conn):
+            self._conn.execute("DELETE FROM conditional_responses")
+            self._conn.execute("UPDATE cache_meta SET value = 0 WHERE name = 'size'")
+
+
+class CompactCache(BaseCache):
+    """``requests_cache`` backend storing zlib compressed responses in sqlite.
+
+    Once the stored responses exceed `max_size` bytes, the least recently used
+    ones are evicted. Responses older than `max_age` seconds are evicted as
+    well, whether they were used recently or not.
+
+    :param str path: Location of the sqlite database file.
+    :param int max_size: The maximum size of the stored responses, in bytes.
+    :param int max_age: The age in seconds after which responses are evicted,
+                        or ``None`` to keep them until they are least recently
+                        used.
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE, max_age=None, **options):
+        super().__init__(**options)
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # key -> last access time, written out on the next save or eviction
+        self._accessed = {}
+        self._conn = connect(path)
+        with transaction(self._conn):
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cached_responses ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, "
+                "created_at REAL, accessed_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cached_responses_accessed "
+                "ON cached_responses (accessed_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cached_keys "
+                "(key TEXT PRIMARY KEY, response_key TEXT)"
+            )
+            # The total size is kept in the database, as other processes
+            # sharing the cache change it too.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_meta "
+                "(name TEXT PRIMARY KEY, value INTEGER)"
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cache_meta VALUES ('size', "
+                "(SELECT COALESCE(SUM(size), 0) FROM cached_responses))"
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cached_responses"
+            ).fetchone()[0]
+
+    @property
+    def size(self):
+        """The total size of the stored (compressed) responses, in bytes."""
+        with self._lock:
+            return self._get_size()
+
+    def _get_size(self):
+        return self._conn.execute(
+            "SELECT value FROM cache_meta WHERE name = 'size'"
+        ).fetchone()[0]
+
+    def _add_size(self, delta):
+        self._conn.execute(
+            "UPDATE cache_meta SET value = value + ? WHERE name = 'size'", (delta,)
+        )
+
+    def save_response(self, key, response):
+        value = zlib.compress(
+            pickle.dumps(
+                (self.reduce_response(response), datetime.datetime.utcnow()),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            ),
+            COMPRESSION_LEVEL,
+        )
+        now = time.time()
+        with self._lock, transaction(self._conn):
+            self._flush_accessed()
+            self._delete_response(key)
+            self._conn.execute(
+                "INSERT INTO cached_responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._add_size(len(value))
+            if self._get_size() > self.max_size:
+                self._evict(int(self.max_size * EVICTION_LOW_WATER))
+
+    def add_key_mapping(self, new_key, key_to_response):
+        with self._lock, transaction(self._conn):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cached_keys VALUES (?, ?)",
+                (new_key, key_to_response),
+            )
+
+    def _resolve(self, key):
+        row = self._conn.execute(
+            "SELECT response_key FROM cached_keys WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else key
+
+    def get_response_and_time(self, key, default=(None, None)):
+        with self._lock:
+            key = self._resolve(key)
+            row = self._conn.execute(
+                "SELECT value FROM cached_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            self._accessed[key] = time.time()
+        response, timestamp = pickle.loads(zlib.decompress(row[0]))
+        return self.restore_response(response), timestamp
+
+    def _delete_response(self, key):
+        row = self._conn.execute(
+            "SELECT size FROM cached_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM cached_responses WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM cached_keys WHERE response_key = ?", (key,))
+            self._add_size(-row[0])
+        self._accessed.pop(key, None)
+
+    def delete(self, key):
+        with self._lock, transaction(self._conn):
+            self._delete_response(self._resolve(key))
+            self._conn.execute("DELETE FROM cached_keys WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, transaction(self._conn):
+            self._conn.execute("DELETE FROM cached_responses")
+            self._conn.execute("DELETE FROM cached_keys")
+            self._conn.execute("UPDATE cache_meta SET value = 0 WHERE name = 'size'")
+            self._accessed.clear()
+
+    def remove_old_entries(self, created_before):
+        created_before = created_before.replace(
+            tzinfo=datetime.timezone.utc
+        ).timestamp()
+        with self._lock, transaction(self._conn):
+            self._remove_created_before(created_before)
+
+    def has_key(self, key):
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM cached_responses WHERE key = ?",
+                    (self._resolve(key),),
+                ).fetchone()
+                is not None
+            )
+
+    def _flush_accessed(self):
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE cached_responses SET accessed_at = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _remove_created_before(self, created_before):
+        for (key,) in self._conn.execute(
+            "SELECT key FROM cached_responses WHERE created_at < ?",
+            (created_before,),
+        ).fetchall():
+            self._delete_response(key)
+
+    def _evict(self, target_size):
+        """Remove expired responses, then the least recently used ones until
+        the cache is no larger than `target_size` bytes.
+        """
+        self._flush_accessed()
+        if self.max_age is not None:
+            self._remove_created_before(time.time() - self.max_age)
+        while self._get_size() > target_size:
+            rows = self._conn.execute(
+                "SELECT key FROM cached_responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for (key,) in rows:
+                self._delete_response(key)
+                if self._get_size() <= target_size:
+                    break
+
+    def vacuum(self):
+        """Evict expired and excess responses, drop the tables left behind by
+        the plain sqlite backend, and compact the database file.
+        """
+        with self._lock:
+            with transaction(self._conn):
+                self._evict(self.max_size)
+                self._conn.execute("DROP TABLE IF EXISTS responses")
+                self._conn.execute("DROP TABLE IF EXISTS urls")
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        """Write out pending access times and close the database."""
+        with self._lock, transaction(self._conn):
+            self._flush_accessed()
+        self._conn.close()
+
+
+cmd_line_parser = argparse.ArgumentParser(
+    description="Maintain the adabot HTTP cache.",
+    prog="Adabot HTTP cache",
+)
+cmd_line_parser.add_argument(
+    "command", choices=["vacuum", "stats"], help="What to do with the cache."
+)
+cmd_line_parser.add_argument(
+    "--path",
+    help="The cache database file. Default is github_cache.sqlite.",
+    default="github_cache.sqlite",
+)
+cmd_line_parser.add_argument(
+    "--max-size",
+    help="Maximum size of the stored responses in MB. Default is 256.",
+    type=int,
+    default=DEFAULT_MAX_SIZE // (1024 * 1024),
+    dest="max_size",
+)
+cmd_line_parser.add_argument(
+    "--max-age",
+    help="Evict responses older than this many seconds.",
+    type=int,
+    default=None,
+    dest="max_age",
+)
+
+
+def main(command, path="github_cache.sqlite", max_size=DEFAULT_MAX_SIZE, max_age=None):
+    """Vacuum the cache at `path`, or print its size."""
+    cache = CompactCache(path, max_size=max_size, max_age=max_age)
+    if command == "vacuum":
+        cache.vacuum()
+    print(f"{len(cache)} responses, {cache.size} bytes stored in {path}")
+    cache.close()
+
+
+if __name__ == "__main__":
+    cli_args = cmd_line_parser.parse_args()
+    main(
+        cli_args.command,
+        path=cli_args.path,
+        max_size=cli_args.max_size * 1024 * 1024,
+        max_age=cli_args.max_age,
+    )
@@ -13,6 +13,7 @@ import requests
 
 from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
 from adabot.lib import common_funcs
+from adabot.lib.repo_snapshot import RepoSnapshot
 
 cli_args = argparse.ArgumentParser(description="Hacktoberfest Label Assigner")
 cli_args.add_argument(
@@ -86,13 +87,12 @@ def ensure_hacktober_label_exists(repo, dry_run=False):
     """Checks if the 'Hacktoberfest' label exists on the repo.
     If not, creates the label.
     """
-    response = gh_reqs.get(f"/repos/{repo['full_name']}/labels")
-    if not response.ok:
+    repo = RepoSnapshot.of(repo)
+    repo_labels = repo.labels()
+    if repo_labels is None:
         print(f"Failed to retrieve labels for '{repo['name']}'")
         return False
 
-    repo_labels = [label["name"] for label in response.json()]
-
     hacktober_exists = {"Hacktoberfest", "hacktoberfest"} & set(repo_labels)
     if not hacktober_exists:
         params = {
@@ -105,6 +105,7 @@ def ensure_hacktober_label_exists(repo, dry_run=False):
             if not result.status_code == 201:
                 print(f"Failed to create new Hacktoberfest label for: {repo['name']}")
                 return False
+            repo.add_label("Hacktoberfest")
 
     return True
 
@@ -114,6 +115,7 @@ def assign_hacktoberfest(repo, issues=None, remove_labels=False, dry_run=False):
     to each issue if its not already assigned.
     """
     labels_changed = 0
+    repo = RepoSnapshot.of(repo)
 
     if not issues:
         issues = get_open_issues(repo)
@@ -10,18 +10,16 @@ on the automated release.
 """
 
 import datetime
-import logging
-import os
-import time
 from typing import Tuple, Set
 from typing_extensions import TypeAlias
 
 import github as pygithub
 import parse
 
-from adabot.lib.common_funcs import MAXIMUM_RATE_LIMIT_DELAY
+from adabot import github_requests as gh_reqs
+from adabot.rate_limit import SCHEDULER
 
-GH_INTERFACE = pygithub.Github(os.environ.get("ADABOT_GITHUB_ACCESS_TOKEN"))
+GH_INTERFACE = gh_reqs.TOKENS.pooled_github()
 
 RepoResult: TypeAlias = Tuple[str, str]
 """(Submodule Name, Full Repo Name)"""
@@ -44,51 +42,45 @@ def get_bundle_updates(full_repo_name: str) -> Tuple[Set[RepoResult], Set[RepoRe
 
     Returns new and updated libraries
     """
-    while True:
-        try:
-            repository = GH_INTERFACE.get_repo(full_repo_name)
-            seven_days_ago = datetime.datetime.now() - datetime.timedelta(days=7)
-            recent_releases = [
-                release
-                for release in repository.get_releases()
-                if release.created_at > seven_days_ago
+
+    def _get_bundle_updates():
+        repository = GH_INTERFACE.get_repo(full_repo_name)
+        seven_days_ago = datetime.datetime.now() - datetime.timedelta(days=7)
+        recent_releases = [
+            release
+            for release in repository.get_releases()
+            if release.created_at > seven_days_ago
+        ]
+        new_libs = set()
+        updated_libs = set()
+        for recent_release in recent_releases:
+            relevant_lines = [
+                line
+                for line in recent_release.body.split("\n")
+                if line.startswith("Updated libraries")
+                or line.startswith("New libraries:")
             ]
-            new_libs = set()
-            updated_libs = set()
-            for recent_release in recent_releases:
-                relevant_lines = [
-                    line
-                    for line in recent_release.body.split("\n")
-                    if line.startswith("Updated libraries")
-                    or line.startswith("New libraries:")
-                ]
-                for relevant_line in relevant_lines:
-                    lib_components = [
-                        x.strip(",") for x in relevant_line.split(" ")[2:]
+            for relevant_line in relevant_lines:
+                lib_components = [x.strip(",") for x in relevant_line.split(" ")[2:]]
+                for lib in lib_components:
+                    comps = parse.parse("[{name:S}]({link_comp:S})", lib.strip())
+                    link: str = parse.search("{link:S}/releases", comps["link_comp"])[
+                        "link"
+                    ]
+                    full_name = parse.search("https://github.com/{full_name:S}", link)[
+                        "full_name"
                     ]
-                    for lib in lib_components:
-                        comps = parse.parse("[{name:S}]({link_comp:S})", lib.strip())
-                        link: str = parse.search(
-                            "{link:S}/releases", comps["link_comp"]
-                        )["link"]
-                        full_name = parse.search(
-                            "https://github.com/{full_name:S}", link
-                        )["full_name"]
-                    if relevant_line.startswith("Updated libraries"):
-                        updated_libs.add((full_name, link))
-                    else:
-                        new_libs.add((full_name, link))
-            return (new_libs, updated_libs)
-
-        except pygithub.RateLimitExceededException:
-            core_rate_limit_reset = GH_INTERFACE.get_rate_limit().core.reset
-            sleep_time = core_rate_limit_reset - datetime.datetime.utcnow()
-            logging.warning("Rate Limit will reset at: %s", core_rate_limit_reset)
-            time.sleep(min(sleep_time.seconds, MAXIMUM_RATE_LIMIT_DELAY))
-            continue
-        except pygithub.GithubException:
-            # Secrets may not be available or error occurred - just skip
-            return (set(), set())
+                if relevant_line.startswith("Updated libraries"):
+                    updated_libs.add((full_name, link))
+                else:
+                    new_libs.add((full_name, link))
+        return (new_libs, updated_libs)
+
+    try:
+        return SCHEDULER.call_pygithub(_get_bundle_updates)
+    except pygithub.GithubException:
+        # Secrets may not be available or error occurred - just skip
+        return (set(), set())
 
 
 if __name__ == "__main__":
@@ -9,8 +9,8 @@ errors, across the entire CirtuitPython library ecosystem."""
 
 import datetime
 import os
-import logging
 import re
+import threading
 import time
 
 from packaging.version import parse as pkg_version_parse
@@ -23,9 +23,10 @@ import parse
 import github as pygithub
 from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
 from adabot.lib import common_funcs
+from adabot.lib import reference_data
+from adabot.lib.repo_snapshot import RepoSnapshot
 from adabot.lib import assign_hacktober_label as hacktober
-
-GH_INTERFACE = pygithub.Github(os.environ.get("ADABOT_GITHUB_ACCESS_TOKEN"))
+from adabot.metrics import METRICS
 
 
 # Define constants for error strings to make checking against them more robust:
@@ -131,8 +132,6 @@ ERROR_DRIVERS_PAGE_DOWNLOAD_FAILED = (
     "Failed to download drivers page from CircuitPython docs"
 )
 ERROR_DRIVERS_PAGE_DOWNLOAD_MISSING_DRIVER = "CircuitPython drivers page missing driver"
-ERROR_UNABLE_PULL_REPO_DIR = "Unable to pull repository directory"
-ERROR_UNABLE_PULL_REPO_EXAMPLES = "Unable to pull repository examples files"
 ERROR_NOT_ON_PYPI = "Not listed on PyPi for CPython use"
 ERROR_BLACK_VERSION = "Missing or incorrect Black version in .pre-commit-config.yaml"
 ERROR_REUSE_VERSION = "Missing or incorrect REUSE version in .pre-commit-config.yaml"
@@ -189,8 +188,41 @@ STD_REPO_LABELS = {
     "good first issue": {"color": "7057ff"},
 }
 
+_BUNDLE_IGNORE_LIST_LOCK = threading.Lock()
+
+# The data a validator can declare that it reads with `needs`:
+#  - metadata: the GraphQL repository metadata (see common_funcs.fetch_repo_metadata)
+#  - contents: the file tree, which also tells if a repo is new or in-work
+#    (see BUNDLE_IGNORE_LIST)
+#  - readme: the README.rst text
+#  - releases: the latest release
+#  - labels: the label names
+#  - workflow_runs: the latest run of the build workflow
+#  - pypi: the PyPI project
+#  - rtd_subprojects, driver_page: the reference documents of the same names
+DATA_SOURCES = (
+    "metadata",
+    "contents",
+    "readme",
+    "releases",
+    "labels",
+    "workflow_runs",
+    "pypi",
+    "rtd_subprojects",
+    "driver_page",
+)
+
+# Data included in the GraphQL metadata, so only fetched on its own for the
+# repos the metadata is missing for.
+_IN_METADATA = {"releases", "labels", "workflow_runs"}
+
+# Number of repos whose data is prefetched at once.
+PREFETCH_CONCURRENCY = 8
+
 _TOKEN_FUNCTIONS = []
 
+_DATA_NEEDS = {}
+
 
 def uses_token(func):
     """Decorator for recording functions that use tokens"""
@@ -198,6 +230,40 @@ def uses_token(func):
     return func
 
 
+def needs(*data):
+    """Decorator for recording the data a validator reads, from
+    `DATA_SOURCES`
+    """
+    unknown = set(data).difference(DATA_SOURCES)
+    if unknown:
+        raise ValueError(f"Unknown validator data: {', '.join(sorted(unknown))}")
+
+    def decorator(func):
+        _DATA_NEEDS[func.__name__] = frozenset(data)
+        return func
+
+    return decorator
+
+
+def _is_library(repo):
+    return (
+        repo["owner"]["login"] == "adafruit"
+        and repo["name"].startswith("Adafruit_CircuitPython")
+        and repo["name"] != BUNDLE_REPO_NAME
+    )
+
+
+class RepoResult:  # pylint: disable=too-few-public-methods
+    """The result of checking a repository: what the check returned, and the
+    lines it added to `LibraryValidator.output_file_data` meanwhile.
+    """
+
+    def __init__(self, repo, errors, output):
+        self.repo = repo
+        self.errors = errors
+        self.output = output
+
+
 # pylint: disable=too-many-instance-attributes
 class LibraryValidator:
     """Class to hold instance variables needed to traverse the calling
@@ -208,68 +274,67 @@ class LibraryValidator:
         self, validators, bundle_submodules, latest_pylint, keep_repos=False, **kw_args
     ):
         self.validators = validators
+        self.plan = self.plan_fetches(validators)
+        if not isinstance(bundle_submodules, common_funcs.BundleIndex):
+            bundle_submodules = common_funcs.BundleIndex(bundle_submodules)
         self.bundle_submodules = bundle_submodules
         self.latest_pylint = pkg_version_parse(latest_pylint)
         self._rtd_yaml_base = None
         self._pcc_versions = {}
-        self.output_file_data = []
-        self.validate_contents_quiet = kw_args.get("validate_contents_quiet", False)
+        self._load_lock = threading.Lock()
+        self._local = threading.local()
+        self.local_bundle = kw_args.get("local_bundle")
+        self.check_package_dirs = kw_args.get("check_package_dirs", False)
         self.has_pyproject_toml_disabled = set()
         self.keep_repos = keep_repos
-        self.rtd_subprojects = None
-        self.core_driver_page = None
+        self.reference = reference_data.get_reference_data()
 
     @property
     def rtd_yml_base(self):
         """The parsed YAML from `.readthedocs.yaml` in the cookiecutter-adafruit-circuitpython repo.
         Used to verify that a library's `.readthedocs.yaml` matches this version.
         """
-        if self._rtd_yaml_base is None:
-            rtd_yml_dl_url = (
-                "https://raw.githubusercontent.com/adafruit/cookiecutter-adafruit-"
-                "circuitpython/main/%7B%7B%20cookiecutter.__dirname%20%7D%7D/%7B%25"
-                "%20if%20cookiecutter.sphinx_docs%20in%20%5B'y'%2C%20'yes'%5D%20%25"
-                "%7D.readthedocs.yaml%7B%25%20endif%20%25%7D"
-            )
-            rtd_yml = requests.get(rtd_yml_dl_url, timeout=REQUESTS_TIMEOUT)
-            if rtd_yml.ok:
-                try:
-                    self._rtd_yaml_base = yaml.safe_load(rtd_yml.text)
-                except yaml.YAMLError:
-                    print("Error parsing cookiecutter .readthedocs.yaml.")
-                    self._rtd_yaml_base = ""
-            else:
-                print("Error retrieving cookiecutter .readthedocs.yaml")
-                self._rtd_yaml_base = ""
-
-        return self._rtd_yaml_base
+        return self._load_once("_rtd_yaml_base", self.reference.rtd_yml_base)
 
     @property
     def pcc_versions(self):
         """The parsed YAML from `.pre-commit-config.yaml` in cookiecutter.
         Used to verify that a library's `.pre-commit-config.yaml` matches this.
         """
-        if not self._pcc_versions:
-            pcc_yml_dl_url = (
-                "https://raw.githubusercontent.com/adafruit/cookiecutter-adafruit-"
-                "circuitpython/main/%7B%7B%20cookiecutter.__dirname%20%7D%7D/.pre-"
-                "commit-config.yaml"
-            )
-            pcc_yml = requests.get(pcc_yml_dl_url, timeout=REQUESTS_TIMEOUT)
-            if pcc_yml.ok:
-                try:
-                    pcc_yaml_base = yaml.safe_load(pcc_yml.text)
-                except yaml.YAMLError:
-                    print("Error parsing cookiecutter .pre-commit-config.yaml.")
-                    pcc_yaml_base = ""
-            else:
-                print("Error retrieving cookiecutter .pre-commit-config.yaml")
-                pcc_yaml_base = ""
+        return self._load_once("_pcc_versions", self.reference.pcc_versions)
 
-            for i in pcc_yaml_base["repos"]:
-                self._pcc_versions[i["repo"]] = i["rev"]
+    def _load_once(self, name, load):
+        """Return the attribute `name`, set from ``load()`` by the first
+        thread to find it empty.
+        """
+        with self._load_lock:
+            if not getattr(self, name):
+                setattr(self, name, load())
+            return getattr(self, name)
 
-        return self._pcc_versions
+    @property
+    def output_file_data(self):
+        """Lines of output explaining the errors found by the calling thread,
+        for the caller to report.
+        """
+        if not hasattr(self._local, "output"):
+            self._local.output = []
+        return self._local.output
+
+    def run_captured(self, check, repo, *args, **kwargs):
+        """Call ``check(repo, *args, **kwargs)`` and return a `RepoResult` with
+        what it returned and the output it wrote, leaving the output of the
+        calling thread as it was. Checks of different repositories can run
+        in separate threads at once.
+        """
+        previous = self.output_file_data
+        self._local.output = []
+        try:
+            errors = check(repo, *args, **kwargs)
+        finally:
+            output = self.output_file_data
+            self._local.output = previous
+        return RepoResult(repo, errors, output)
 
     @staticmethod
     def get_token_methods():
@@ -277,15 +342,135 @@ class LibraryValidator:
 
         return _TOKEN_FUNCTIONS
 
+    @staticmethod
+    def plan_fetches(validators):
+        """Return the set of `DATA_SOURCES` to prefetch for `validators`."""
+        plan = set()
+        for validator in validators:
+            plan.update(_DATA_NEEDS.get(validator.__name__, ()))
+        if plan & _IN_METADATA:
+            plan.add("metadata")
+        if "readme" in plan:
+            plan.add("contents")
+        return plan
+
+    def prefetch(self, repos):
+        """Fetch the data the validators need (see `plan_fetches`) for
+        `repos`, a list of `RepoSnapshot`: the metadata with batched GraphQL
+        queries, and the rest for several repos at once. The workflow runs
+        and PyPI projects are left to the validators, which only need them
+        for some repos. The requests are counted in `METRICS` under the
+        `needs` data they fetch.
+        """
+        if not repos:
+            return
+        if "metadata" in self.plan:
+            with METRICS.caller("metadata"):
+                common_funcs.prefetch_repo_metadata(repos)
+        if "rtd_subprojects" in self.plan:
+            with METRICS.caller("rtd_subprojects"):
+                self.reference.rtd_subprojects()
+        if "driver_page" in self.plan:
+            with METRICS.caller("driver_page"):
+                self.reference.driver_page_urls()
+
+        def fetch(repo):
+            with METRICS.caller("metadata"):
+                metadata = common_funcs.get_repo_metadata(repo)
+            if _is_library(repo):
+                if "contents" in self.plan:
+                    with METRICS.caller("contents"):
+                        self._note_contents(repo)
+                if "readme" in self.plan:
+                    with METRICS.caller("readme"):
+                        repo.file_text("README.rst")
+                if "releases" in self.plan and metadata is None:
+                    with METRICS.caller("releases"):
+                        repo.latest_release()
+            if "labels" in self.plan and (
+                metadata is None or metadata["labels"] is None
+            ):
+                with METRICS.caller("labels"):
+                    repo.labels()
+
+        for _ in common_funcs.map_in_order(fetch, repos, PREFETCH_CONCURRENCY):
+            pass
+
+    def prefetched_repos(self, pages):
+        """Yield a `RepoSnapshot` of each repo in `pages`, lists of repos like
+        those from `common_funcs.iter_repo_pages`, prefetching the data for
+        each page before its first repo.
+        """
+        for page in pages:
+            snapshots = [self._snapshot(repo) for repo in page]
+            self.prefetch(snapshots)
+            yield from snapshots
+
+    def _snapshot(self, repo):
+        """Return `repo` as a `RepoSnapshot`. With a `local_bundle`, the
+        snapshot of a library whose submodule is checked out there reads its
+        files from the checkout (see `common_funcs.checkout_default_branches`).
+        """
+        if isinstance(repo, RepoSnapshot):
+            return repo
+        return RepoSnapshot(repo, checkout=self._checkout(repo))
+
+    def _checkout(self, repo):
+        """Return the path of the checkout of `repo` in `local_bundle`, or
+        ``None`` if there is none.
+        """
+        if not self.local_bundle or not repo.get("clone_url"):
+            return None
+        path = self.bundle_submodules.path(repo["clone_url"])
+        if path is None:
+            return None
+        checkout = os.path.join(self.local_bundle, path)
+        # Submodules that were not initialized are empty directories.
+        if not os.path.exists(os.path.join(checkout, ".git")):
+            return None
+        return checkout
+
+    def _note_contents(self, repo):
+        """Return the names of the files in the top directory of `repo`, or
+        ``None`` if they could not be listed. New and in-work repos are added
+        to `BUNDLE_IGNORE_LIST`, and repos with pyproject.toml disabled to
+        `has_pyproject_toml_disabled`, for the other validators to skip.
+        """
+        tree = repo.tree()
+        if tree is None:
+            return None
+        files = tree.names()
+
+        # ignore new/in-work repos, which should have less than 8 files:
+        # ___.py or folder, CoC, .github/, .readthedocs.yaml, docs/,
+        # examples/, README, LICENSE
+        if len(files) < 8:
+            with _BUNDLE_IGNORE_LIST_LOCK:
+                if repo["name"] not in BUNDLE_IGNORE_LIST:
+                    BUNDLE_IGNORE_LIST.append(repo["name"])
+
+        if "pyproject.toml.disabled" in files:
+            self.has_pyproject_toml_disabled.add(repo["name"])
+        return files
+
     def run_repo_validation(self, repo):
         """Run all the current validation functions on the provided repository and
-        return their results as a list of string errors.
+        return their results as a list of string errors. The validators share
+        a `RepoSnapshot` of the repository, so each piece of its data is
+        fetched once.
         """
+        repo = self._snapshot(repo)
+        if "contents" in self.plan and _is_library(repo):
+            # Before any validator, so they all know if the repo is in-work.
+            with METRICS.caller("contents"):
+                self._note_contents(repo)
         errors = []
         for validator in self.validators:
-            errors.extend(validator(self, repo))
+            with METRICS.caller(validator.__name__):
+                errors.extend(validator(self, repo))
         return errors
 
+    @needs("metadata", "contents")
     def validate_repo_state(self, repo):
         """Validate a repository meets current CircuitPython criteria.  Expects
         a dictionary with a GitHub API repository state (like from the list_repos
@@ -306,6 +491,9 @@ class LibraryValidator:
         }
 
         repo_fields = repo.copy()
+        metadata = common_funcs.get_repo_metadata(repo)
+        if metadata is not None:
+            repo_fields.update(metadata)
 
         repo_fields_keys = set(repo_fields.keys())
         repo_missing_some_keys = search_keys.difference(repo_fields_keys)
@@ -347,6 +535,7 @@ class LibraryValidator:
         return errors
 
     # pylint: disable=too-many-locals,too-many-return-statements,too-many-branches
+    @needs("releases", "contents")
     def validate_release_state(self, repo):
         """Validate if a repo 1) has a release, and 2) if there have been commits
         since the last release. Only files that drive user-facing changes
@@ -384,12 +573,16 @@ class LibraryValidator:
         if repo["name"] in BUNDLE_IGNORE_LIST:
             return []
 
-        repo_last_release = gh_reqs.get(
-            "/repos/" + repo["full_name"] + "/releases/latest"
-        )
-        if not repo_last_release.ok:
-            return [ERROR_GITHUB_NO_RELEASE]
-        repo_release_json = repo_last_release.json()
+        metadata = common_funcs.get_repo_metadata(repo)
+        if metadata is not None:
+            repo_release_json = metadata["latest_release"]
+            if repo_release_json is None:
+                return [ERROR_GITHUB_NO_RELEASE]
+        else:
+            repo_last_release = RepoSnapshot.of(repo).latest_release()
+            if not repo_last_release.ok:
+                return [ERROR_GITHUB_NO_RELEASE]
+            repo_release_json = repo_last_release.json()
         if "message" in repo_release_json:
             if repo_release_json["message"] == "Not Found":
                 return [ERROR_GITHUB_NO_RELEASE]
@@ -460,10 +653,10 @@ class LibraryValidator:
         return []
 
     # pylint: disable=too-many-branches
-    def _validate_readme(self, download_url):
+    def _validate_readme(self, repo, download_url):
         # We use requests because file contents are hosted by
         # githubusercontent.com, not the API domain.
-        contents = requests.get(download_url, timeout=REQUESTS_TIMEOUT)
+        contents = RepoSnapshot.of(repo).download(download_url)
         if not contents.ok:
             return [ERROR_README_DOWNLOAD_FAILED]
 
@@ -502,14 +695,14 @@ class LibraryValidator:
 
         return errors
 
-    def _validate_py_for_u_modules(self, download_url):
+    def _validate_py_for_u_modules(self, repo, download_url):
         """For a .py file, look for usage of "import u___" and
         look for "import ___".  If the "import u___" is
         used with NO "import ____" generate an error.
         """
         # We use requests because file contents are hosted by
         # githubusercontent.com, not the API domain.
-        contents = requests.get(download_url, timeout=REQUESTS_TIMEOUT)
+        contents = RepoSnapshot.of(repo).download(download_url)
         if not contents.ok:
             return [ERROR_PYFILE_DOWNLOAD_FAILED]
 
@@ -540,14 +733,14 @@ class LibraryValidator:
 
         return errors
 
-    def _validate_actions_build_yml(self, actions_build_info):
+    def _validate_actions_build_yml(self, repo, actions_build_info):
         """Check the following configurations in the GitHub Actions
         build.yml file:
             - Pylint version is the latest release
         """
 
         download_url = actions_build_info["download_url"]
-        contents = requests.get(download_url, timeout=REQUESTS_TIMEOUT)
+        contents = RepoSnapshot.of(repo).download(download_url)
         if not contents.ok:
             return [ERROR_PYFILE_DOWNLOAD_FAILED]
 
@@ -555,9 +748,9 @@ class LibraryValidator:
 
         return errors
 
-    def _validate_pre_commit_config_yaml(self, file_info):
+    def _validate_pre_commit_config_yaml(self, repo, file_info):
         download_url = file_info["download_url"]
-        contents = requests.get(download_url, timeout=REQUESTS_TIMEOUT)
+        contents = RepoSnapshot.of(repo).download(download_url)
         if not contents.ok:
             return [ERROR_PYFILE_DOWNLOAD_FAILED]
 
@@ -591,10 +784,10 @@ class LibraryValidator:
 
         return errors
 
-    def _validate_pyproject_toml(self, file_info):
+    def _validate_pyproject_toml(self, repo, file_info):
         """Check pyproject.toml for pypi compatibility"""
         download_url = file_info["download_url"]
-        contents = requests.get(download_url, timeout=REQUESTS_TIMEOUT)
+        contents = RepoSnapshot.of(repo).download(download_url)
         if not contents.ok:
             return [ERROR_TOMLFILE_DOWNLOAD_FAILED]
         return []
@@ -602,7 +795,7 @@ class LibraryValidator:
     def _validate_requirements_txt(self, repo, file_info, check_blinka=True):
         """Check requirements.txt for pypi compatibility"""
         download_url = file_info["download_url"]
-        contents = requests.get(download_url, timeout=REQUESTS_TIMEOUT)
+        contents = RepoSnapshot.of(repo).download(download_url)
         if not contents.ok:
             return [ERROR_PYFILE_DOWNLOAD_FAILED]
 
@@ -619,6 +812,7 @@ class LibraryValidator:
         return errors
 
     # pylint: disable=too-many-locals,too-many-branches,too-many-statements,too-many-return-statements
+    @needs("contents", "readme")
     def validate_contents(self, repo):
         """Validate the contents of a repository meets current CircuitPython
         criteria (within reason, functionality checks are not possible).  Expects
@@ -634,42 +828,14 @@ class LibraryValidator:
         if repo["name"] == BUNDLE_REPO_NAME:
             return []
 
-        content_list = gh_reqs.get("/repos/" + repo["full_name"] + "/contents/")
-        empty_repo = False
-        if not content_list.ok:
-            # Empty repos return:
-            #  - a 404 status code
-            #  - a "message" that the repo is empty.
-            if "message" in content_list.json():
-                if "empty" in content_list.json()["message"]:
-                    empty_repo = True
-            if not empty_repo:
-                if not self.validate_contents_quiet:
-                    return [ERROR_UNABLE_PULL_REPO_CONTENTS]
-                return []
-
-        content_list = content_list.json()
-        files = []
-        # an empty repo will return a 'message'
-        if not empty_repo:
-            files = [x["name"] for x in content_list]
+        repo = self._snapshot(repo)
+        files = self._note_contents(repo)
+        if files is None:
+            return [ERROR_UNABLE_PULL_REPO_CONTENTS]
 
-        # ignore new/in-work repos, which should have less than 8 files:
-        # ___.py or folder, CoC, .github/, .readthedocs.yaml, docs/,
-        # examples/, README, LICENSE
         if len(files) < 8:
-            BUNDLE_IGNORE_LIST.append(repo["name"])
-            if not self.validate_contents_quiet:
-                return [ERROR_NEW_REPO_IN_WORK]
-
-        if "pyproject.toml.disabled" in files:
-            self.has_pyproject_toml_disabled.add(repo["name"])
-
-        # if we're only running due to -v, ignore the rest. we only care about
-        # adding in-work repos to the BUNDLE_IGNORE_LIST and if pyproject.toml is
-        # disabled
-        if self.validate_contents_quiet:
-            return []
+            return [ERROR_NEW_REPO_IN_WORK]
+        tree = repo.tree()
 
         errors = []
         if "ruff.toml" not in files:
@@ -681,33 +847,16 @@ class LibraryValidator:
         if "README.rst" not in files:
             errors.append(ERROR_MISSING_README_RST)
         else:
-            readme_info = None
-            for file in content_list:
-                if file["name"] == "README.rst":
-                    readme_info = file
-                    break
-            errors.extend(self._validate_readme(readme_info["download_url"]))
+            errors.extend(self._validate_readme(repo, repo.download_url("README.rst")))
 
         if ".travis.yml" in files:
             errors.append(ERROR_NEEDS_ACTION_MIGRATION)
         elif ".github" in files:
-            # grab '.github' entry, extract URL, build new URL to build.yml, retrieve and pass
-            build_yml_url = ""
-            actions_build_info = None
-
-            for item in content_list:
-                if item.get("name") == ".github" and item.get("type") == "dir":
-                    build_yml_url = item["url"].split("?")[0]
-                    break
-
-            if build_yml_url:
-                build_yml_url = build_yml_url + "/workflows/build.yml"
-                response = gh_reqs.get(build_yml_url)
-                if response.ok:
-                    actions_build_info = response.json()
-
+            actions_build_info = repo.file_info(".github/workflows/build.yml")
             if actions_build_info:
-                errors.extend(self._validate_actions_build_yml(actions_build_info))
+                errors.extend(
+                    self._validate_actions_build_yml(repo, actions_build_info)
+                )
             else:
                 errors.append(ERROR_UNABLE_PULL_REPO_CONTENTS)
 
@@ -716,10 +865,7 @@ class LibraryValidator:
                 filename = "readthedocs.yaml"
                 if ".readthedocs.yaml" in files:
                     filename = ".readthedocs.yaml"
-                file_info = content_list[files.index(filename)]
-                rtd_contents = requests.get(
-                    file_info["download_url"], timeout=REQUESTS_TIMEOUT
-                )
+                rtd_contents = repo.download(repo.download_url(filename))
                 if rtd_contents.ok:
                     try:
                         rtd_yml = yaml.safe_load(rtd_contents.text)
@@ -736,17 +882,14 @@ class LibraryValidator:
         if ".pre-commit-config.yaml" in files:
             if len(self._pcc_versions) or self.pcc_versions != "":
                 filename = ".pre-commit-config.yaml"
-                file_info = content_list[files.index(filename)]
-                pcc_contents = requests.get(
-                    file_info["download_url"], timeout=REQUESTS_TIMEOUT
-                )
+                pcc_contents = repo.download(repo.download_url(filename))
                 if pcc_contents.ok:
                     try:
                         pcc_yml = yaml.safe_load(pcc_contents.text)
                         pcc_versions = {}
                         for i in pcc_yml["repos"]:
                             pcc_versions[i["repo"]] = i["rev"]
-                        if self._pcc_versions != pcc_versions:
+                        if self.pcc_versions != pcc_versions:
                             errors.append(ERROR_MISMATCHED_PRE_COMMIT_CONFIG)
                     except yaml.YAMLError:
                         self.output_file_data.append(
@@ -759,8 +902,8 @@ class LibraryValidator:
             errors.append(ERROR_MISSING_PRE_COMMIT_CONFIG)
 
         if "pyproject.toml" in files:
-            file_info = content_list[files.index("pyproject.toml")]
-            errors.extend(self._validate_pyproject_toml(file_info))
+            file_info = repo.file_info("pyproject.toml")
+            errors.extend(self._validate_pyproject_toml(repo, file_info))
         else:
             errors.append(ERROR_MISSING_PYPROJECT_TOML)
 
@@ -769,12 +912,12 @@ class LibraryValidator:
 
         if repo["name"] not in self.has_pyproject_toml_disabled:
             if "requirements.txt" in files:
-                file_info = content_list[files.index("requirements.txt")]
+                file_info = repo.file_info("requirements.txt")
                 errors.extend(self._validate_requirements_txt(repo, file_info))
             else:
                 errors.append(ERROR_MISSING_REQUIREMENTS_TXT)
             if "optional_requirements.txt" in files:
-                file_info = content_list[files.index("optional_requirements.txt")]
+                file_info = repo.file_info("optional_requirements.txt")
                 errors.extend(
                     self._validate_requirements_txt(repo, file_info, check_blinka=False)
                 )
@@ -782,39 +925,28 @@ class LibraryValidator:
                 errors.append(ERROR_MISSING_OPTIONAL_REQUIREMENTS_TXT)
 
         # Check for an examples folder.
-        dirs = [
-            x["url"]
-            for x in content_list
-            if (x["type"] == "dir" and x["name"] == "examples")
-        ]
-        examples_list = []
-        if dirs:
-
+        if tree.is_dir("examples"):
             lib_name_start = repo["name"].rfind("CircuitPython_") + len(
                 "CircuitPython_"
             )
             lib_name = repo["name"][lib_name_start:].lower()
-            while dirs:
-                # loop through the results to ensure we capture files
-                # in subfolders, and add any files in the current directory
-                result = gh_reqs.get(dirs.pop(0))
-                if not result.ok:
-                    errors.append(ERROR_UNABLE_PULL_REPO_EXAMPLES)
-                    break
-                result_json = result.json()
-                for x in result_json:
-                    if x["type"] == "dir":
-                        if x["name"].startswith(lib_name):
-                            continue
-                        if (
-                            x["name"]
-                            .replace("_", "")
-                            .startswith(lib_name.replace("_", ""))
-                        ):
-                            continue
-                        dirs.append(x["url"])
-                    elif x["type"] == "file":
-                        examples_list.append(x)
+
+            def __in_lib_dir(path):  # pylint: disable=unused-private-member
+                """Nested function to skip the files in subfolders named
+                after the library, which hold its assets rather than examples.
+                """
+                for name in path.split("/")[1:-1]:
+                    if name.startswith(lib_name) or name.replace("_", "").startswith(
+                        lib_name.replace("_", "")
+                    ):
+                        return True
+                return False
+
+            examples_list = [
+                path.rsplit("/", 1)[-1]
+                for path in tree.files("examples")
+                if not __in_lib_dir(path)
+            ]
 
             if len(examples_list) < 1:
                 errors.append(ERROR_MISSING_EXAMPLE_FILES)
@@ -844,13 +976,11 @@ class LibraryValidator:
                 all_have_name = True
                 simpletest_exists = False
                 for example in examples_list:
-                    if example["name"].endswith(".py"):
-                        check_lib_name = __check_lib_name(
-                            lib_name, example["name"].lower()
-                        )
+                    if example.endswith(".py"):
+                        check_lib_name = __check_lib_name(lib_name, example.lower())
                         if not check_lib_name:
                             all_have_name = False
-                    if "simpletest" in example["name"].lower():
+                    if "simpletest" in example.lower():
                         simpletest_exists = True
                 if not all_have_name:
                     errors.append(ERROR_EXAMPLE_MISSING_SENSORNAME)
@@ -862,37 +992,35 @@ class LibraryValidator:
         # first location .py files whose names begin with "adafruit_"
         re_str = re.compile(r"adafruit\_[\w]*\.py")
         pyfiles = [
-            x["download_url"] for x in content_list if re_str.fullmatch(x["name"])
+            repo.download_url(x)
+            for x in files
+            if re_str.fullmatch(x) and tree.is_file(x)
         ]
         for pyfile in pyfiles:
             # adafruit_xxx.py file; check if for proper usage of u___ versions of modules
-            errors.extend(self._validate_py_for_u_modules(pyfile))
-
-        # now location any directories whose names begin with "adafruit_"
-        re_str = re.compile(r"adafruit\_[\w]*")
-        for adir in dirs:
-            if re_str.fullmatch(adir):
-                # retrieve the files in that directory
-                dir_file_list = gh_reqs.get(
-                    "/repos/" + repo["full_name"] + "/contents/" + adir
-                )
-                if not dir_file_list.ok:
-                    errors.append(ERROR_UNABLE_PULL_REPO_DIR)
-                dir_file_list = dir_file_list.json()
-                # search for .py files in that directory
-                dir_files = [
-                    x["download_url"]
-                    for x in dir_file_list
-                    if x["type"] == "file" and x["name"].endswith(".py")
-                ]
-                for dir_file in dir_files:
-                    # .py files in subdirectory adafruit_xxx
-                    # check if for proper usage of u___ versions of modules
-                    errors.extend(self._validate_py_for_u_modules(dir_file))
+            errors.extend(self._validate_py_for_u_modules(repo, pyfile))
+
+        # now location any directories whose names begin with "adafruit_".
+        # This check is opt-in, as the reports have never run it.
+        if self.check_package_dirs:
+            re_str = re.compile(r"adafruit\_[\w]*")
+            for adir in files:
+                if re_str.fullmatch(adir) and tree.is_dir(adir):
+                    # search for .py files in that directory
+                    dir_files = [
+                        repo.download_url(f"{adir}/{x}")
+                        for x in tree.names(adir)
+                        if x.endswith(".py") and tree.is_file(f"{adir}/{x}")
+                    ]
+                    for dir_file in dir_files:
+                        # .py files in subdirectory adafruit_xxx
+                        # check if for proper usage of u___ versions of modules
+                        errors.extend(self._validate_py_for_u_modules(repo, dir_file))
 
         return errors
 
     @uses_token
+    @needs("readme", "rtd_subprojects", "contents")
     def validate_readthedocs(self, repo):
         """Method to check the status of `repo`'s ReadTheDocs."""
 
@@ -903,47 +1031,25 @@ class LibraryValidator:
             return []
         if repo["name"] in BUNDLE_IGNORE_LIST:
             return []
-        if not self.rtd_subprojects:
-            rtd_response = requests.get(
-                "https://readthedocs.org/api/v2/project/74557/subprojects/",
-                timeout=REQUESTS_TIMEOUT,
-            )
-            if not rtd_response.ok:
-                return [ERROR_RTD_SUBPROJECT_FAILED]
-            self.rtd_subprojects = {}
-            for subproject in rtd_response.json()["subprojects"]:
-                self.rtd_subprojects[common_funcs.sanitize_url(subproject["repo"])] = (
-                    subproject
-                )
+        rtd_subprojects = self.reference.rtd_subprojects()
+        if rtd_subprojects is None:
+            return [ERROR_RTD_SUBPROJECT_FAILED]
         repo_url = common_funcs.sanitize_url(repo["clone_url"])
-        if repo_url not in self.rtd_subprojects:
+        if repo_url not in rtd_subprojects:
             return [ERROR_RTD_SUBPROJECT_MISSING]
 
         errors = []
-        subproject = self.rtd_subprojects[repo_url]
+        subproject = rtd_subprojects[repo_url]
 
         if 105398 not in subproject["users"]:
             errors.append(ERROR_RTD_ADABOT_MISSING)
 
-        # Get the README file contents
-        while True:
-            try:
-                lib_repo = GH_INTERFACE.get_repo(repo["full_name"])
-                content_file = lib_repo.get_contents("README.rst")
-                break
-            except pygithub.RateLimitExceededException:
-                core_rate_limit_reset = GH_INTERFACE.get_rate_limit().core.reset
-                sleep_time = core_rate_limit_reset - datetime.datetime.utcnow()
-                logging.warning("Rate Limit will reset at: %s", core_rate_limit_reset)
-                time.sleep(
-                    min(sleep_time.seconds, common_funcs.MAXIMUM_RATE_LIMIT_DELAY)
-                )
-                continue
-            except pygithub.GithubException:
-                errors.append(ERROR_RTD_FAILED_TO_LOAD_BUILD_STATUS_GH_NONLIMITED)
-                return errors
-
-        readme_text = content_file.decoded_content.decode("utf-8")
+        # Get the README file contents, usually already downloaded by
+        # validate_contents
+        readme_text = self._snapshot(repo).file_text("README.rst")
+        if readme_text is None:
+            errors.append(ERROR_RTD_FAILED_TO_LOAD_BUILD_STATUS_GH_NONLIMITED)
+            return errors
 
         # Parse for the ReadTheDocs slug
         search_results: parse.Result = parse.search(
@@ -987,6 +1093,7 @@ class LibraryValidator:
             errors.append(ERROR_RTD_OUTPUT_HAS_WARNINGS)
         return errors
 
+    @needs("driver_page", "contents")
     def validate_core_driver_page(self, repo):
         """Method to ensure that `repo` is listed on the main driver page in the bundle."""
         if not (
@@ -996,27 +1103,16 @@ class LibraryValidator:
             return []
         if repo["name"] in BUNDLE_IGNORE_LIST:
             return []
-        if not self.core_driver_page:
-            driver_page = requests.get(
-                (
-                    "https://raw.githubusercontent.com/adafruit/Adafruit_CircuitPython_Bundle/"
-                    "main/docs/drivers.rst"
-                ),
-                timeout=REQUESTS_TIMEOUT,
-            )
-            if not driver_page.ok:
-                return [ERROR_DRIVERS_PAGE_DOWNLOAD_FAILED]
-            self.core_driver_page = driver_page.text
+        core_driver_page = self.reference.driver_page_urls()
+        if core_driver_page is None:
+            return [ERROR_DRIVERS_PAGE_DOWNLOAD_FAILED]
 
         repo_short_name = repo["name"][len("Adafruit_CircuitPython_") :].lower()
         full_url = (
             "https://docs.circuitpython.org/projects/" + repo_short_name + "/en/latest/"
         )
         full_url_dashes = full_url.replace("_", "-")
-        if (
-            full_url not in self.core_driver_page
-            and full_url_dashes not in self.core_driver_page
-        ):
+        if full_url not in core_driver_page and full_url_dashes not in core_driver_page:
             return [ERROR_DRIVERS_PAGE_DOWNLOAD_MISSING_DRIVER]
         return []
 
@@ -1047,6 +1143,7 @@ class LibraryValidator:
         list_repos function) and will fill in the provided insights dictionary
         with analytics it computes for the repository.
         """
+        repo = RepoSnapshot.of(repo)
 
         if repo["owner"]["login"] != "adafruit":
             return []
@@ -1208,6 +1305,7 @@ class LibraryValidator:
                 insights["milestones"][milestone["title"]] = milestone["open_issues"]
         return []
 
+    @needs("pypi", "contents")
     def validate_in_pypi(self, repo):
         """prints a list of Adafruit_CircuitPython libraries that are in pypi"""
         if (
@@ -1224,20 +1322,24 @@ class LibraryValidator:
             return [ERROR_NOT_ON_PYPI]
         return []
 
+    @needs("labels")
     def validate_labels(self, repo):
         """ensures the repo has the standard labels available"""
-        response = gh_reqs.get("/repos/" + repo["full_name"] + "/labels")
-        if not response.ok:
-            # replace 'output_handler' with ERROR_OUTPUT_HANDLER
-            self.output_file_data.append(
-                "Labels request failed: {}".format(repo["full_name"])
-            )
-            return [ERROR_OUTPUT_HANDLER]
+        repo = RepoSnapshot.of(repo)
+        metadata = common_funcs.get_repo_metadata(repo)
+        if metadata is not None and metadata["labels"] is not None:
+            repo_labels = metadata["labels"]
+        else:
+            repo_labels = repo.labels()
+            if repo_labels is None:
+                # replace 'output_handler' with ERROR_OUTPUT_HANDLER
+                self.output_file_data.append(
+                    "Labels request failed: {}".format(repo["full_name"])
+                )
+                return [ERROR_OUTPUT_HANDLER]
 
         errors = []
 
-        repo_labels = [label["name"] for label in response.json()]
-
         has_all_labels = True
         for label, info in STD_REPO_LABELS.items():
             if not label in repo_labels:
@@ -1245,7 +1347,9 @@ class LibraryValidator:
                     "/repos/" + repo["full_name"] + "/labels",
                     json={"name": label, "color": info["color"]},
                 )
-                if not response.ok:
+                if response.ok:
+                    repo.add_label(label)
+                else:
                     has_all_labels = False
                     self.output_file_data.append(
                         "Request to add '{}' label failed: {}".format(
@@ -1261,6 +1365,7 @@ class LibraryValidator:
         return errors
 
     @uses_token
+    @needs("workflow_runs")
     def validate_actions_state(self, repo):
         """Validate if the most recent GitHub Actions run on the default branch
         has passed.
@@ -1270,43 +1375,44 @@ class LibraryValidator:
         if not repo["name"].startswith("Adafruit_CircuitPython"):
             return []
 
-        while True:
-            try:
-                lib_repo = GH_INTERFACE.get_repo(repo["full_name"])
-
-                if lib_repo.archived:
-                    return []
-
-                arg_dict = {"branch": lib_repo.default_branch}
-
-                try:
-                    workflow = lib_repo.get_workflow("build.yml")
-                    workflow_runs = workflow.get_runs(**arg_dict)
-                except pygithub.GithubException:  # This can probably be tightened later
-                    # No workflows or runs yet
-                    return []
-                try:
-                    if workflow_runs[0].conclusion != "success":
-                        return [ERROR_CI_BUILD]
-                except IndexError:
-                    # The CI hasn't run yet, so empty list of workflow runs returned
-                    # This doesn't indicate a failure, so skip it
-                    pass
-                return []
-            except pygithub.RateLimitExceededException:
-                core_rate_limit_reset = GH_INTERFACE.get_rate_limit().core.reset
-                sleep_time = core_rate_limit_reset - datetime.datetime.utcnow()
-                logging.warning("Rate Limit will reset at: %s", core_rate_limit_reset)
-                time.sleep(
-                    min(sleep_time.seconds, common_funcs.MAXIMUM_RATE_LIMIT_DELAY)
-                )
+        metadata = common_funcs.get_repo_metadata(repo)
+        if metadata is not None and metadata["archived"]:
+            return []
+        if (
+            metadata is not None
+            and metadata["build_conclusion"] != common_funcs.BUILD_CONCLUSION_UNKNOWN
+        ):
+            if metadata["build_conclusion"] != "success":
+                return [ERROR_CI_BUILD]
+            return []
+
+        repo = RepoSnapshot.of(repo)
+        lib_repo = repo.github_repo()
+
+        if lib_repo.archived:
+            return []
+
+        try:
+            latest_run = repo.latest_workflow_run("build.yml", lib_repo.default_branch)
+        except pygithub.RateLimitExceededException:
+            raise
+        except pygithub.GithubException:  # This can probably be tightened later
+            # No workflows or runs yet
+            return []
+        # No run means the CI hasn't run yet. This doesn't indicate a failure,
+        # so skip it
+        if latest_run is not None and latest_run.conclusion != "success":
+            return [ERROR_CI_BUILD]
+        return []
 
+    @needs("metadata")
     def validate_default_branch(self, repo):
         """Makes sure that the default branch is main"""
         if not repo["name"].startswith("Adafruit_CircuitPython"):
             return []
 
-        if repo["default_branch"] != "main":
+        metadata = common_funcs.get_repo_metadata(repo) or {}
+        if metadata.get("default_branch", repo["default_branch"]) != "main":
             return [ERROR_INCORRECT_DEFAULT_BRANCH]
 
         return []
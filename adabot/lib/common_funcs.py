@@ -2,22 +2,81 @@
 #
 # SPDX-License-Identifier: MIT
 
-# GitHub API Serch has stopped returning the core repo for some reason. Tried several
-# different search params, and came up emtpy. Hardcoding it as a failsafe.
-
 """Common functions used throughout Adabot."""
 
 import collections
+import collections.abc
+import concurrent.futures
 import datetime
+import json
+import logging
 import os
 import re
-import requests
-from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
-from adabot import pypi_requests as pypi
+import subprocess
+import tempfile
+import time
+import urllib.parse
 
-CORE_REPO_URL = "/repos/adafruit/circuitpython"
-
-MAXIMUM_RATE_LIMIT_DELAY = 62 * 60  # 62 minutes
+from adabot import github_requests as gh_reqs
+from adabot import pypi_requests as pypi
+from adabot.lib.repo_snapshot import RepoSnapshot
+
+# Repositories per page of the organization listing.
+ORG_REPOS_PER_PAGE = 100
+
+# Number of organization listing pages fetched at once.
+ORG_LISTING_CONCURRENCY = 8
+
+# Seconds after which the stored organization listing is fetched again in
+# full, rather than refreshed with the recently updated repositories, so that
+# deleted and transferred repositories drop out of it.
+ORG_SNAPSHOT_MAX_AGE = 24 * 60 * 60
+
+# Number of repositories looked up per GraphQL request.
+GRAPHQL_BATCH_SIZE = 50
+
+# Number of the most recent releases fetched per repository.
+GRAPHQL_RELEASE_COUNT = 20
+
+GRAPHQL_REPO_FIELDS = """
+fragment RepoFields on Repository {
+  nameWithOwner
+  description
+  hasWikiEnabled
+  isArchived
+  url
+  licenseInfo { key name spdxId }
+  squashMergeAllowed
+  rebaseMergeAllowed
+  mergeCommitAllowed
+  viewerPermission
+  defaultBranchRef {
+    name
+    target {
+      ... on Commit {
+        checkSuites(last: 20) {
+          nodes { conclusion workflowRun { workflow { resourcePath } } }
+        }
+      }
+    }
+  }
+  latestRelease { tagName publishedAt }
+  releases(first: %d, orderBy: {field: CREATED_AT, direction: DESC}) {
+    totalCount
+    nodes { publishedAt }
+  }
+  labels(first: 100) { totalCount nodes { name } }
+}
+""" % (
+    GRAPHQL_RELEASE_COUNT
+)
+
+# The metadata's build_conclusion when the newest build.yml run of the default
+# branch has not finished or was not found, so the REST API has to be asked.
+BUILD_CONCLUSION_UNKNOWN = "unknown"
+
+# Repository metadata fetched by `prefetch_repo_metadata`, keyed by full name.
+REPO_METADATA = {}
 
 
 def parse_gitmodules(input_text):
@@ -91,31 +150,18 @@ def get_bundle_submodules(bundle="adafruit"):
     (i.e. modules included inside) and return a list of the found submodules.
     Each list item is a 2-tuple of submodule name and a dict of submodule
     variables including 'path' (location of submodule in bundle) and
-    'url' (URL to git repository with submodule contents).
+    'url' (URL to git repository with submodule contents). The list is a
+    `BundleIndex`.
 
     :param string bundle: Which bundle to get submodules for, 'adafruit' or 'community'.
     """
-    # Assume the bundle repository is public and get the .gitmodules file
-    # without any authentication or Github API usage.  Also assumes the
-    # master branch of the bundle is the canonical source of the bundle release.
-    if bundle == "adafruit":
-        result = requests.get(
-            "https://raw.githubusercontent.com/adafruit/"
-            "Adafruit_CircuitPython_Bundle/main/.gitmodules",
-            timeout=REQUESTS_TIMEOUT,
-        )
-    elif bundle == "community":
-        result = requests.get(
-            "https://raw.githubusercontent.com/adafruit/"
-            "CircuitPython_Community_Bundle/main/.gitmodules",
-            timeout=REQUESTS_TIMEOUT,
-        )
-    else:
-        raise ValueError("Bundle must be either 'adafruit' or 'community'")
-    if result.status_code != 200:
-        # output_handler("Failed to access bundle .gitmodules file from GitHub!", quiet=True)
-        raise RuntimeError("Failed to access bundle .gitmodules file from GitHub!")
-    return parse_gitmodules(result.text)
+    # The .gitmodules files are fetched once per run, and kept between runs
+    # when ADABOT_CACHE_DIR is set, by the shared reference data.
+    from adabot.lib import (  # pylint: disable=import-outside-toplevel
+        reference_data,
+    )
+
+    return reference_data.get_reference_data().bundle_index(bundle)
 
 
 def sanitize_url(url):
@@ -144,8 +190,11 @@ def sanitize_url(url):
 def is_repo_in_bundle(repo_clone_url, bundle_submodules):
     """Return a boolean indicating if the specified repository (the clone URL
     as a string) is in the bundle.  Specify bundle_submodules as a dictionary
-    of bundle submodule state returned by get_bundle_submodules.
+    of bundle submodule state returned by get_bundle_submodules, or as a
+    `BundleIndex` to avoid scanning every submodule.
     """
+    if isinstance(bundle_submodules, BundleIndex):
+        return repo_clone_url in bundle_submodules
     # Sanitize url for easy comparison.
     repo_clone_url = sanitize_url(repo_clone_url)
     # Search all the bundle submodules for any that have a URL which matches
@@ -170,61 +219,449 @@ def is_repo_in_bundle(repo_clone_url, bundle_submodules):
     return False
 
 
-def list_repos(*, include_repos=None):
-    """Return a list of all Adafruit repositories that start with
-    Adafruit_CircuitPython.  Each list item is a dictionary of GitHub API
-    repository state.
+class BundleIndex(collections.abc.Sequence):
+    """The bundle submodules returned by `get_bundle_submodules`, indexed by
+    sanitized clone URL and by path.  Iterating over it gives the submodules in
+    their .gitmodules order, so it can stand in for the list of submodules.
+    Lookups by URL only find libraries, the submodules under `libraries/`.
+    """
 
-    :param: tuple,list include_repos: A tuple or list of repositories to ensure
-                                      are included.
+    def __init__(self, submodules):
+        self._submodules = list(submodules)
+        self._by_url = {}
+        self._by_path = {}
+        for submodule in self._submodules:
+            variables = submodule[1]
+            path = variables.get("path", "")
+            self._by_path[path] = submodule
+            if path.startswith("libraries/"):
+                self._by_url.setdefault(
+                    sanitize_url(variables.get("url", "")), submodule
+                )
+
+    def __getitem__(self, index):
+        return self._submodules[index]
+
+    def __len__(self):
+        return len(self._submodules)
+
+    def __contains__(self, repo_clone_url):
+        """Whether the repository with this clone URL is a library in the
+        bundle.
+        """
+        return sanitize_url(repo_clone_url) in self._by_url
+
+    def find(self, repo_clone_url):
+        """Return the submodule of the library with this clone URL, or None."""
+        return self._by_url.get(sanitize_url(repo_clone_url))
+
+    def find_path(self, path):
+        """Return the submodule at `path` in the bundle, or None."""
+        return self._by_path.get(path)
+
+    def path(self, repo_clone_url):
+        """Return the path in the bundle of the library with this clone URL,
+        or None.
+        """
+        submodule = self.find(repo_clone_url)
+        return submodule[1]["path"] if submodule else None
+
+    def category(self, repo_clone_url):
+        """Return the category of the library with this clone URL, 'drivers'
+        or 'helpers', or None.
+        """
+        path = self.path(repo_clone_url)
+        if path is None:
+            return None
+        category = path.split("/")[1]
+        return category if category in ("drivers", "helpers") else None
+
+
+def checkout_default_branches(bundle_path):
+    """Check out the latest commit of the default branch of every submodule
+    of the bundle checkout at `bundle_path`, such as one cloned by
+    `circuitpython_bundle.fetch_bundle`. `LibraryValidator` can then read the
+    library files from the submodules with its ``local_bundle`` option.
     """
-    repos = []
-    result = gh_reqs.get(
-        "/search/repositories",
+    subprocess.run(
+        ["git", "submodule", "update", "--init", "--remote", "--quiet"],
+        cwd=bundle_path,
+        check=True,
+    )
+
+
+def _org_repos_page(org, page, sort="full_name", direction="asc"):
+    return gh_reqs.get(
+        f"/orgs/{org}/repos",
         params={
-            "q": "Adafruit_CircuitPython user:adafruit archived:false fork:true",
-            "per_page": 100,
-            "sort": "updated",
-            "order": "asc",
+            "type": "all",
+            "sort": sort,
+            "direction": direction,
+            "per_page": ORG_REPOS_PER_PAGE,
+            "page": page,
         },
     )
 
-    while result.ok:
-        # repos.extend(result.json()["items"]) # uncomment and comment below, to include all forks
-        repos.extend(
-            repo
-            for repo in result.json()["items"]
+
+def _last_page(response):
+    """Return the number of the last page from the ``Link`` header of the
+    first page of a listing.
+    """
+    last = response.links.get("last")
+    if not last:
+        return 1
+    query = urllib.parse.parse_qs(urllib.parse.urlparse(last["url"]).query)
+    return int(query["page"][0])
+
+
+def _iter_org_repos_responses(org):
+    """Yield the responses for the pages of the repositories of `org`, up to
+    the first failed one. Once the first page gives the number of pages, the
+    rest are fetched in parallel while the earlier ones are processed.
+    """
+    first = _org_repos_page(org, 1)
+    yield first
+    if not first.ok or _last_page(first) == 1:
+        return
+    gh_reqs.ensure_pool_size(ORG_LISTING_CONCURRENCY)
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=ORG_LISTING_CONCURRENCY, thread_name_prefix="adabot-list"
+    )
+    try:
+        futures = [
+            executor.submit(_org_repos_page, org, page)
+            for page in range(2, _last_page(first) + 1)
+        ]
+        for future in futures:
+            response = future.result()
+            yield response
+            if not response.ok:
+                return
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _list_changed_org_repos(org, repos):
+    """Return `repos` with the repositories of `org` updated or pushed to
+    since `repos` were listed replaced or added, or None if a page failed.
+    Only the pages of the most recently updated (and pushed) repositories
+    are fetched.
+    """
+    by_id = {repo["id"]: repo for repo in repos}
+    for field, sort in (("updated_at", "updated"), ("pushed_at", "pushed")):
+        newest = max((repo[field] or "" for repo in repos), default="")
+        page = 1
+        while True:
+            response = _org_repos_page(org, page, sort, "desc")
+            if not response.ok:
+                return None
+            listed = response.json()
+            for repo in listed:
+                by_id[repo["id"]] = repo
             if (
-                repo["owner"]["login"] == "adafruit"
-                and (
-                    repo["name"].startswith("Adafruit_CircuitPython")
-                    or repo["name"] == "circuitpython"
-                )
+                not listed
+                or (listed[-1][field] or "") < newest
+                or not response.links.get("next")
+            ):
+                break
+            page += 1
+    return list(by_id.values())
+
+
+def _load_org_snapshot(path):
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as snapshot_file:
+            return json.load(snapshot_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_org_snapshot(path, snapshot):
+    if not path:
+        return
+    # Write to a temporary file first, so a process sharing the cache
+    # directory never reads a partly written snapshot.
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(handle, "w", encoding="utf-8") as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(temp_path, path)
+
+
+def iter_org_repos(org="adafruit"):
+    """Yield the repositories of the GitHub organization `org` a page (a list
+    of dictionaries of GitHub API repository state) at a time, as they are
+    fetched.
+
+    With ``ADABOT_CACHE_DIR`` set, the listing is kept there, and a listing
+    less than `ORG_SNAPSHOT_MAX_AGE` seconds old is only refreshed with the
+    repositories updated or pushed to since.  If the organization cannot be
+    listed, the rest of the stored listing is yielded however old it is.
+    """
+    path = gh_reqs.cache_path(f"org_repos_{org}.json") if gh_reqs.CACHE_DIR else None
+    snapshot = _load_org_snapshot(path)
+    listed_at = time.time()
+    if snapshot and listed_at - snapshot["listed_at"] < ORG_SNAPSHOT_MAX_AGE:
+        repos = _list_changed_org_repos(org, snapshot["repos"])
+        if repos is not None:
+            _save_org_snapshot(
+                path, {"listed_at": snapshot["listed_at"], "repos": repos}
             )
-        )
+            yield repos
+            return
 
-        if result.links.get("next"):
-            result = gh_reqs.get(result.links["next"]["url"])
+    repos = []
+    for response in _iter_org_repos_responses(org):
+        if not response.ok:
+            print(f"list_org_repos(): Failed to list the '{org}' repositories")
+            if snapshot:
+                listed = {repo["id"] for repo in repos}
+                yield [repo for repo in snapshot["repos"] if repo["id"] not in listed]
+            return
+        page = response.json()
+        repos.extend(page)
+        yield page
+    _save_org_snapshot(path, {"listed_at": listed_at, "repos": repos})
+
+
+def list_org_repos(org="adafruit"):
+    """Return every repository of the GitHub organization `org`, as
+    dictionaries of GitHub API repository state.  See `iter_org_repos`.
+    """
+    return [repo for page in iter_org_repos(org) for repo in page]
+
+
+def iter_repo_pages(*, include_repos=None):
+    """Yield the repositories returned by `list_repos` a page (a list) at a
+    time, as the organization listing arrives, so processing them can start
+    before the listing is complete.  The repositories come in the order of
+    the organization listing, by full name, not least recently updated first
+    like `list_repos`.
+
+    :param: tuple,list include_repos: A tuple or list of repositories to ensure
+                                      are included.
+    """
+    include_repos = tuple(include_repos or ())
+    names = set()
+    for org_page in iter_org_repos():
+        page = [
+            repo
+            for repo in org_page
+            if repo["name"] in include_repos
+            or not repo["archived"]
+            and (
+                repo["name"].startswith("Adafruit_CircuitPython")
+                or repo["name"] == "circuitpython"
+            )
+        ]
+        names.update(repo["name"] for repo in page)
+        if page:
+            yield page
+
+    page = []
+    for repo in include_repos:
+        if repo in names:
+            continue
+        add_repo = gh_reqs.get("/repos/adafruit/" + repo)
+        if add_repo.ok:
+            page.append(add_repo.json())
         else:
-            break
+            print("list_repos(): Failed to retrieve '{}'".format(repo))
+    if page:
+        yield page
+
+
+def iter_repos(*, include_repos=None, prefetch=False):
+    """Yield the repositories returned by `list_repos` one at a time, as the
+    organization listing arrives.  With `prefetch`, the metadata for each
+    page of repositories is prefetched (see `prefetch_repo_metadata`) before
+    they are yielded.
+
+    :param: tuple,list include_repos: A tuple or list of repositories to ensure
+                                      are included.
+    """
+    for page in iter_repo_pages(include_repos=include_repos):
+        if prefetch:
+            prefetch_repo_metadata(page)
+        yield from page
+
+
+def list_repos_order(include_repos=None):
+    """Return a sort key putting repositories in the order of `list_repos`:
+    the libraries and the core repository least recently updated first, then
+    the other `include_repos` in the order given.
+
+    :param: tuple,list include_repos: A tuple or list of repositories to ensure
+                                      are included.
+    """
+    included = {name: index for index, name in enumerate(include_repos or ())}
+
+    def key(repo):
+        if repo["name"].startswith("Adafruit_CircuitPython") or (
+            repo["name"] == "circuitpython"
+        ):
+            return (0, repo["updated_at"])
+        return (1, included.get(repo["name"], len(included)))
+
+    return key
+
+
+def list_repos(*, include_repos=None):
+    """Return a list of all Adafruit repositories that start with
+    Adafruit_CircuitPython, and the core repository, least recently updated
+    first.  Each list item is a dictionary of GitHub API repository state.
+
+    :param: tuple,list include_repos: A tuple or list of repositories to ensure
+                                      are included.
+    """
+    return sorted(
+        iter_repos(include_repos=include_repos),
+        key=list_repos_order(include_repos),
+    )
 
-    repo_names = [repo["name"] for repo in repos]
 
-    if "circuitpython" not in repo_names:
-        core = gh_reqs.get(CORE_REPO_URL)
-        if core.ok:
-            repos.append(core.json())
+def map_in_order(func, items, jobs=1):
+    """Yield ``func(item)`` for each of `items`, in the order of `items`.
+    With `jobs` above 1, up to `jobs` calls run at once on a thread pool,
+    reading ahead at most ``2 * jobs`` items, so `items` can be a generator
+    like `iter_repos`. An exception raised by a call is raised when its result
+    is reached.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield func(item)
+        return
+    gh_reqs.ensure_pool_size(jobs)
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=jobs, thread_name_prefix="adabot-check"
+    )
+    pending = collections.deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _repo_metadata_record(node):
+    """Convert a GraphQL repository node into a metadata record using the
+    REST API's field names.
+    """
+    default_branch = node["defaultBranchRef"] or {}
+    build_conclusion = None
+    check_suites = ((default_branch.get("target") or {}).get("checkSuites") or {}).get(
+        "nodes", []
+    )
+    # The check suites are oldest first; the newest build.yml one counts.
+    for check_suite in check_suites:
+        workflow = (check_suite.get("workflowRun") or {}).get("workflow") or {}
+        if workflow.get("resourcePath", "").endswith("/build.yml"):
+            build_conclusion = check_suite["conclusion"]
+    if build_conclusion:
+        build_conclusion = build_conclusion.lower()
+    else:
+        build_conclusion = BUILD_CONCLUSION_UNKNOWN
+    latest_release = node["latestRelease"]
+    if latest_release is not None:
+        latest_release = {
+            "tag_name": latest_release["tagName"],
+            "published_at": latest_release["publishedAt"],
+        }
+    labels = None
+    if node["labels"]["totalCount"] == len(node["labels"]["nodes"]):
+        labels = [label["name"] for label in node["labels"]["nodes"]]
+    license_info = node["licenseInfo"]
+    if license_info is not None:
+        license_info = {
+            "key": license_info["key"],
+            "name": license_info["name"],
+            "spdx_id": license_info["spdxId"],
+        }
+    return {
+        "full_name": node["nameWithOwner"],
+        "description": node["description"],
+        "has_wiki": node["hasWikiEnabled"],
+        "archived": node["isArchived"],
+        "clone_url": node["url"] + ".git",
+        "license": license_info,
+        "allow_squash_merge": node["squashMergeAllowed"],
+        "allow_rebase_merge": node["rebaseMergeAllowed"],
+        "allow_merge_commit": node["mergeCommitAllowed"],
+        "permissions": {
+            "push": node["viewerPermission"] in ("ADMIN", "MAINTAIN", "WRITE")
+        },
+        "default_branch": default_branch.get("name"),
+        "latest_release": latest_release,
+        "release_count": node["releases"]["totalCount"],
+        "release_dates": [
+            release["publishedAt"] for release in node["releases"]["nodes"]
+        ],
+        "labels": labels,
+        "build_conclusion": build_conclusion,
+    }
+
+
+def fetch_repo_metadata(repos, batch_size=GRAPHQL_BATCH_SIZE):
+    """Fetch the metadata the validators need for every repository in `repos`
+    (like from the list_repos function) with batched GraphQL queries. Returns
+    a dictionary of metadata records keyed by the repository's full name.
+    Repositories that could not be looked up are left out.
+    """
+    metadata = {}
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start : start + batch_size]
+        variables = {}
+        params = []
+        fields = []
+        for index, repo in enumerate(batch):
+            variables[f"owner{index}"] = repo["owner"]["login"]
+            variables[f"name{index}"] = repo["name"]
+            params.append(f"$owner{index}: String!, $name{index}: String!")
+            fields.append(
+                f"repo{index}: repository(owner: $owner{index}, name: $name{index}) "
+                "{ ...RepoFields }"
+            )
+        query = (
+            f"query({', '.join(params)}) {{\n"
+            + "\n".join(fields)
+            + "\n}\n"
+            + GRAPHQL_REPO_FIELDS
+        )
+        response = gh_reqs.post(
+            "/graphql", json={"query": query, "variables": variables}
+        )
+        if not response.ok:
+            logging.warning("GraphQL repository query failed: %s", response.status_code)
+            continue
+        data = response.json().get("data") or {}
+        for node in data.values():
+            if node is not None:
+                record = _repo_metadata_record(node)
+                metadata[record["full_name"]] = record
+    return metadata
 
-    if include_repos:
-        for repo in include_repos:
-            if repo not in repo_names:
-                add_repo = gh_reqs.get("/repos/adafruit/" + repo)
-                if add_repo.ok:
-                    repos.append(add_repo.json())
-                else:
-                    print("list_repos(): Failed to retrieve '{}'".format(repo))
 
-    return repos
+def prefetch_repo_metadata(repos):
+    """Fetch the metadata for `repos` into `REPO_METADATA`, so the validators
+    can read it instead of making several REST requests per repository.
+    """
+    metadata = fetch_repo_metadata(repos)
+    REPO_METADATA.update(metadata)
+    logging.info(
+        "Fetched GraphQL metadata for %s of %s repos.", len(metadata), len(repos)
+    )
+
+
+def get_repo_metadata(repo):
+    """Return the prefetched metadata record for `repo`, or ``None`` if it was
+    not prefetched.
+    """
+    return REPO_METADATA.get(repo["full_name"])
 
 
 def get_docs_link(bundle_path, submodule):
@@ -254,7 +691,16 @@ def repo_is_on_pypi(repo):
     return is_on
 
 
-def is_new_or_updated(repo):
+def _published_since(published_at, since):
+    """Return whether the GitHub API timestamp `published_at` is set and not
+    before the datetime `since`.
+    """
+    return bool(published_at) and (
+        datetime.datetime.strptime(published_at, "%Y-%m-%dT%H:%M:%SZ") >= since
+    )
+
+
+def is_new_or_updated(repo):  # pylint: disable=too-many-return-statements
     """Check the repo for new release(s) within the last week. Then determine
     if all releases are within the last week to decide if this is a newly
     released library, or an updated library.
@@ -262,8 +708,29 @@ def is_new_or_updated(repo):
 
     today_minus_seven = datetime.datetime.today() - datetime.timedelta(days=7)
 
+    metadata = get_repo_metadata(repo) if "full_name" in repo else None
+    if metadata is not None:
+        # first, check the latest release to see if within the last 7 days
+        latest_release = metadata["latest_release"] or {}
+        if not _published_since(latest_release.get("published_at"), today_minus_seven):
+            return None
+        new_releases = sum(
+            1
+            for published_at in metadata["release_dates"]
+            if _published_since(published_at, today_minus_seven)
+        )
+        # Only the most recent releases are prefetched. If they are all new,
+        # the older ones have to be checked with the REST API.
+        if new_releases < len(metadata["release_dates"]) or metadata[
+            "release_count"
+        ] == len(metadata["release_dates"]):
+            if new_releases == metadata["release_count"]:
+                return "new"
+            return "updated"
+
     # first, check the latest release to see if within the last 7 days
-    result = gh_reqs.get("/repos/adafruit/" + repo["name"] + "/releases/latest")
+    repo = RepoSnapshot.of(repo)
+    result = repo.latest_release()
     if not result.ok:
         return None
     release_info = result.json()
@@ -278,7 +745,7 @@ def is_new_or_updated(repo):
 
     # we have a release within the last 7 days. now check if its a newly
     # released library within the last week, or if its just an update
-    result = gh_reqs.get("/repos/adafruit/" + repo["name"] + "/releases")
+    result = repo.releases()
     if not result.ok:
         return None
 
@@ -351,3 +818,17 @@ class InsightData(collections.UserDict):
 
     def copy(self):
         return self.data.copy()
+
+    def merge(self, other):
+        """Add the insights in `other`, gathered for other repositories, to
+        these.
+        """
+        for key, value in other.items():
+            if key not in self.data:
+                self.data[key] = value.copy() if hasattr(value, "copy") else value
+            elif isinstance(value, list):
+                self.data[key].extend(value)
+            elif isinstance(value, (set, dict)):
+                self.data[key].update(value)
+            else:
+                self.data[key] += value
@@ -0,0 +1,298 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Reference documents shared by every library check.
+
+The bundle ``.gitmodules`` files, the cookiecutter configuration, the
+ReadTheDocs subprojects, the bundle driver page, the Arduino library index and
+the latest pylint release are fetched once per run, not once per caller. When
+``ADABOT_CACHE_DIR`` is set they are also kept there between runs: a document
+younger than its time to live is used as is, and an older one is revalidated
+with a conditional request. If a document cannot be fetched, the stored copy
+is used however old it is.
+
+Each document is parsed once into the lookup structure the checks need, such
+as a `common_funcs.BundleIndex` or a set of driver page URLs.
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+import requests
+import yaml
+
+from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
+from adabot.lib import common_funcs
+
+COOKIECUTTER_URL = (
+    "https://raw.githubusercontent.com/adafruit/cookiecutter-adafruit-circuitpython/"
+    "main/%7B%7B%20cookiecutter.__dirname%20%7D%7D/"
+)
+
+# name: (URL, seconds the stored document is used without revalidating it)
+DOCUMENTS = {
+    "adafruit_gitmodules": (
+        "https://raw.githubusercontent.com/adafruit/"
+        "Adafruit_CircuitPython_Bundle/main/.gitmodules",
+        60 * 60,
+    ),
+    "community_gitmodules": (
+        "https://raw.githubusercontent.com/adafruit/"
+        "CircuitPython_Community_Bundle/main/.gitmodules",
+        60 * 60,
+    ),
+    "cookiecutter_readthedocs": (
+        COOKIECUTTER_URL + "%7B%25%20if%20cookiecutter.sphinx_docs%20in%20%5B'y'"
+        "%2C%20'yes'%5D%20%25%7D.readthedocs.yaml%7B%25%20endif%20%25%7D",
+        24 * 60 * 60,
+    ),
+    "cookiecutter_pre_commit": (
+        COOKIECUTTER_URL + ".pre-commit-config.yaml",
+        24 * 60 * 60,
+    ),
+    "rtd_subprojects": (
+        "https://readthedocs.org/api/v2/project/74557/subprojects/",
+        60 * 60,
+    ),
+    "drivers_page": (
+        "https://raw.githubusercontent.com/adafruit/Adafruit_CircuitPython_Bundle/"
+        "main/docs/drivers.rst",
+        60 * 60,
+    ),
+    "arduino_library_index": (
+        "http://downloads.arduino.cc/libraries/library_index.json",
+        6 * 60 * 60,
+    ),
+    "pylint": ("https://pypi.org/pypi/pylint/json", 6 * 60 * 60),
+}
+
+DRIVER_URL_RE = re.compile(r"https?://[^\s<>`'\"]+")
+
+_NOT_LOADED = object()
+
+
+class ReferenceData:
+    """Fetches, stores and parses the reference documents.
+
+    :param str directory: Where to keep the documents between runs, or
+                          ``None`` to keep them in memory only.
+    :param dict ttls: Seconds to use each stored document without
+                      revalidating it, by document name, overriding the
+                      defaults in `DOCUMENTS`.
+    """
+
+    def __init__(self, directory=None, ttls=None):
+        self.directory = directory
+        self.ttls = {name: ttl for name, (_, ttl) in DOCUMENTS.items()}
+        self.ttls.update(ttls or {})
+        self._texts = {}
+        self._lookups = {}
+        self._lock = threading.RLock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + ".json")
+
+    def _load(self, name):
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(name), encoding="utf-8") as document_file:
+                return json.load(document_file)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, name, entry):
+        if not self.directory:
+            return
+        # Write to a temporary file first, so a process sharing the directory
+        # never reads a partly written document.
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as document_file:
+            json.dump(entry, document_file)
+        os.replace(temp_path, self._path(name))
+
+    def _fetch(self, name, stored):
+        url = DOCUMENTS[name][0]
+        headers = {}
+        if stored:
+            if stored.get("etag"):
+                headers["If-None-Match"] = stored["etag"]
+            if stored.get("last_modified"):
+                headers["If-Modified-Since"] = stored["last_modified"]
+        try:
+            response = requests.get(url, headers=headers, timeout=REQUESTS_TIMEOUT)
+        except requests.RequestException as err:
+            logging.warning("Failed to fetch %s: %s", url, err)
+            return stored
+        if response.status_code == 304 and stored:
+            entry = dict(stored, fetched_at=time.time())
+        elif response.ok:
+            entry = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "text": response.text,
+            }
+        else:
+            logging.warning("Failed to fetch %s: %s", url, response.status_code)
+            return stored
+        self._save(name, entry)
+        return entry
+
+    def text(self, name):
+        """Return the text of the document `name`, or ``None`` if it could
+        not be fetched and no copy is stored.
+        """
+        with self._lock:
+            if name not in self._texts:
+                stored = self._load(name)
+                entry = stored
+                if not stored or time.time() - stored["fetched_at"] > self.ttls[name]:
+                    entry = self._fetch(name, stored)
+                self._texts[name] = entry["text"] if entry else None
+            return self._texts[name]
+
+    def _lookup(self, key, build):
+        """Return the lookup structure `key`, building it on first use."""
+        with self._lock:
+            value = self._lookups.get(key, _NOT_LOADED)
+            if value is _NOT_LOADED:
+                value = self._lookups[key] = build()
+            return value
+
+    def bundle_index(self, bundle="adafruit"):
+        """Return a `common_funcs.BundleIndex` of the submodules of the
+        bundle, 'adafruit' or 'community'.
+        """
+        if bundle not in ("adafruit", "community"):
+            raise ValueError("Bundle must be either 'adafruit' or 'community'")
+
+        def build():
+            text = self.text(bundle + "_gitmodules")
+            if text is None:
+                raise RuntimeError(
+                    "Failed to access bundle .gitmodules file from GitHub!"
+                )
+            return common_funcs.BundleIndex(common_funcs.parse_gitmodules(text))
+
+        return self._lookup("bundle_index_" + bundle, build)
+
+    def _yaml(self, name, description):
+        text = self.text(name)
+        if text is None:
+            print(f"Error retrieving cookiecutter {description}")
+            return ""
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError:
+            print(f"Error parsing cookiecutter {description}.")
+            return ""
+
+    def rtd_yml_base(self):
+        """Return the parsed cookiecutter ``.readthedocs.yaml``, or an empty
+        string if it could not be fetched or parsed.
+        """
+        return self._lookup(
+            "rtd_yml_base",
+            lambda: self._yaml("cookiecutter_readthedocs", ".readthedocs.yaml"),
+        )
+
+    def pcc_versions(self):
+        """Return the hook revisions of the cookiecutter
+        ``.pre-commit-config.yaml``, keyed by hook repository.
+        """
+
+        def build():
+            pcc_yaml = self._yaml("cookiecutter_pre_commit", ".pre-commit-config.yaml")
+            if not pcc_yaml:
+                return {}
+            return {hook["repo"]: hook["rev"] for hook in pcc_yaml["repos"]}
+
+        return self._lookup("pcc_versions", build)
+
+    def rtd_subprojects(self):
+        """Return the ReadTheDocs subprojects keyed by sanitized repository
+        URL, or ``None`` if they could not be fetched.
+        """
+
+        def build():
+            text = self.text("rtd_subprojects")
+            if text is None:
+                return None
+            return {
+                common_funcs.sanitize_url(subproject["repo"]): subproject
+                for subproject in json.loads(text)["subprojects"]
+            }
+
+        return self._lookup("rtd_subprojects", build)
+
+    def driver_page_urls(self):
+        """Return the set of documentation URLs on the bundle driver page, or
+        ``None`` if it could not be fetched. Each URL is included as far as
+        its ``/en/latest/`` too, so a link to a page of a library's
+        documentation counts for the library.
+        """
+
+        def build():
+            text = self.text("drivers_page")
+            if text is None:
+                return None
+            urls = set()
+            for url in DRIVER_URL_RE.findall(text):
+                urls.add(url)
+                latest = url.find("/en/latest/")
+                if latest >= 0:
+                    urls.add(url[: latest + len("/en/latest/")])
+            return urls
+
+        return self._lookup("driver_page_urls", build)
+
+    def arduino_libraries(self):
+        """Return the Adafruit libraries in the Arduino library index, or
+        ``None`` if it could not be fetched.
+        """
+
+        def build():
+            text = self.text("arduino_library_index")
+            if text is None:
+                return None
+            return [
+                lib for lib in json.loads(text)["libraries"] if "adafruit" in lib["url"]
+            ]
+
+        return self._lookup("arduino_libraries", build)
+
+    def latest_pylint(self, default=""):
+        """Return the latest pylint version on PyPI, or `default`."""
+
+        def build():
+            text = self.text("pylint")
+            return json.loads(text)["info"]["version"] if text else None
+
+        return self._lookup("latest_pylint", build) or default
+
+
+_reference_data = None
+_reference_data_lock = threading.Lock()
+
+
+def get_reference_data():
+    """Return the `ReferenceData` shared by the whole process, kept in
+    ``ADABOT_CACHE_DIR`` when it is set.
+    """
+    global _reference_data  # pylint: disable=global-statement
+    with _reference_data_lock:
+        if _reference_data is None:
+            _reference_data = ReferenceData(
+                gh_reqs.cache_path("reference_data") if gh_reqs.CACHE_DIR else None
+            )
+        return _reference_data
@@ -0,0 +1,287 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""The data of one repository, shared by every check of the repository.
+
+A `RepoSnapshot` is the GitHub API repository dictionary the checks already
+take, so it is passed to the validators and insight functions in its place.
+The file tree, file bodies, releases, labels, PyGithub repository and
+workflow runs are fetched the first time a check asks for them, and the later
+checks of the repository get the same response instead of fetching it again.
+The whole file tree is one request, indexed by `RepoTree`.
+
+A snapshot given a local checkout of the repository, such as a library
+submodule of a bundle checkout, reads the file tree and file bodies from the
+checkout instead, without any requests.
+"""
+
+import os
+import subprocess
+import threading
+
+import requests
+
+from adabot import github_requests as gh_reqs, REQUESTS_TIMEOUT
+from adabot.rate_limit import SCHEDULER
+
+GH_INTERFACE = gh_reqs.TOKENS.pooled_github()
+
+RAW_URL = "https://raw.githubusercontent.com"
+
+_NOT_LOADED = object()
+
+
+class RepoSnapshot(dict):
+    """A repository dictionary that fetches the rest of the repository's data
+    once, on first use.
+
+    :param dict repo: The GitHub API repository state, as from
+                      `common_funcs.list_repos`.
+    :param str checkout: The path of a local checkout of the default branch
+                         to read the files from, or ``None`` to download them.
+    """
+
+    def __init__(self, repo, checkout=None):
+        super().__init__(repo)
+        self.checkout = checkout
+        self._values = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def of(cls, repo):
+        """Return `repo` if it is a `RepoSnapshot`, or a new one of it."""
+        return repo if isinstance(repo, cls) else cls(repo)
+
+    @property
+    def full_name(self):
+        """The owner and name of the repository."""
+        return self.get("full_name") or "adafruit/" + self["name"]
+
+    def _lookup(self, key, fetch):
+        """Return the value `key`, fetching it on first use."""
+        with self._lock:
+            value = self._values.get(key, _NOT_LOADED)
+            if value is _NOT_LOADED:
+                value = self._values[key] = fetch()
+            return value
+
+    def api_get(self, path, params=None):
+        """Return the response to a GitHub API GET of `path`."""
+        key = ("api", path, tuple(sorted((params or {}).items())))
+        kwargs = {"params": params} if params else {}
+        return self._lookup(key, lambda: gh_reqs.get(path, **kwargs))
+
+    def download(self, url):
+        """Return the response to a GET of `url`, such as the
+        ``download_url`` of a file. The files of the local checkout, if any,
+        are read from disk.
+        """
+        prefix = self.download_url("")
+        if self.checkout and url.startswith(prefix):
+            path = os.path.join(self.checkout, url[len(prefix) :])
+            return self._lookup(("download", url), lambda: LocalFile(path))
+        return self._lookup(
+            ("download", url), lambda: requests.get(url, timeout=REQUESTS_TIMEOUT)
+        )
+
+    @property
+    def default_branch(self):
+        """The name of the default branch."""
+        return self.get("default_branch") or "HEAD"
+
+    def tree(self):
+        """Return the `RepoTree` of the default branch, or ``None`` if it could
+        not be fetched. An empty repository has an empty tree.
+        """
+
+        def fetch():
+            if self.checkout:
+                return _checkout_tree(self.checkout)
+            response = self.api_get(
+                f"/repos/{self.full_name}/git/trees/{self.default_branch}",
+                params={"recursive": "1"},
+            )
+            if response.ok:
+                tree = response.json()
+                # Trees too large for one response are cut short, which would
+                # make files look missing.
+                return None if tree.get("truncated") else RepoTree(tree["tree"])
+            # Empty repos return a 409 status code and a "message" that the
+            # repo is empty.
+            if "empty" in response.json().get("message", ""):
+                return RepoTree([])
+            return None
+
+        return self._lookup("tree", fetch)
+
+    def download_url(self, path):
+        """Return the URL of the raw contents of the file `path`."""
+        return f"{RAW_URL}/{self.full_name}/{self.default_branch}/{path}"
+
+    def file_info(self, path):
+        """Return the tree entry of the file `path` with its ``download_url``
+        added, or ``None`` if there is no such file or the tree could not be
+        fetched.
+        """
+        tree = self.tree()
+        if tree is None or not tree.is_file(path):
+            return None
+        return dict(tree.entries[path], download_url=self.download_url(path))
+
+    def file_text(self, path):
+        """Return the text of the file `path`, or ``None`` if it could not be
+        fetched.
+        """
+        entry = self.file_info(path)
+        if entry is None:
+            return None
+        response = self.download(entry["download_url"])
+        return response.text if response.ok else None
+
+    def latest_release(self):
+        """Return the response for the latest release."""
+        return self.api_get(f"/repos/{self.full_name}/releases/latest")
+
+    def releases(self):
+        """Return the response for the first page of releases."""
+        return self.api_get(f"/repos/{self.full_name}/releases")
+
+    def labels(self):
+        """Return the names of the repository's labels, or ``None`` if they
+        could not be fetched.
+        """
+
+        def fetch():
+            response = self.api_get(f"/repos/{self.full_name}/labels")
+            if not response.ok:
+                return None
+            return [label["name"] for label in response.json()]
+
+        return self._lookup("labels", fetch)
+
+    def add_label(self, name):
+        """Record that the label `name` was created on the repository, if its
+        labels were fetched.
+        """
+        with self._lock:
+            labels = self._values.get("labels")
+            if labels is not None and name not in labels:
+                labels.append(name)
+
+    def github_repo(self):
+        """Return the PyGithub ``Repository``."""
+        return self._lookup(
+            "github_repo",
+            lambda: SCHEDULER.call_pygithub(
+                lambda: GH_INTERFACE.get_repo(self.full_name)
+            ),
+        )
+
+    def latest_workflow_run(self, workflow, branch):
+        """Return the most recent PyGithub run of the workflow file
+        `workflow` on `branch`, or ``None`` if it has not run yet.
+        """
+
+        def fetch():
+            runs = self.github_repo().get_workflow(workflow).get_runs(branch=branch)
+            try:
+                return runs[0]
+            except IndexError:
+                return None
+
+        return self._lookup(
+            ("latest_workflow_run", workflow, branch),
+            lambda: SCHEDULER.call_pygithub(fetch),
+        )
+
+
+class RepoTree:
+    """Index of the paths in a repository, from the entries of a recursive
+    git tree.
+
+    :param list entries: The ``tree`` entries of a GitHub API git tree, each
+                         with the ``path``, ``type`` (``blob`` for files,
+                         ``tree`` for directories), ``sha`` and, for files,
+                         ``size``.
+    """
+
+    def __init__(self, entries):
+        self.entries = {entry["path"]: entry for entry in entries}
+        self._children = {"": []}
+        for path, entry in self.entries.items():
+            parent, _, name = path.rpartition("/")
+            self._children.setdefault(parent, []).append(name)
+            if entry["type"] == "tree":
+                self._children.setdefault(path, [])
+
+    def is_file(self, path):
+        """Return whether `path` is a file."""
+        entry = self.entries.get(path)
+        return entry is not None and entry["type"] == "blob"
+
+    def is_dir(self, path):
+        """Return whether `path` is a directory."""
+        return path in self._children
+
+    def names(self, path=""):
+        """Return the names of the entries in the directory `path`."""
+        return list(self._children.get(path, ()))
+
+    def files(self, path=""):
+        """Return the paths of the files in the directory `path` and, in
+        turn, its subdirectories.
+        """
+        prefix = path + "/" if path else ""
+        return [
+            name
+            for name, entry in self.entries.items()
+            if entry["type"] == "blob" and name.startswith(prefix)
+        ]
+
+
+class LocalFile:  # pylint: disable=too-few-public-methods
+    """A file of a local checkout, with the parts of the response to
+    downloading it that the validators use.
+
+    :param str path: The path of the file.
+    """
+
+    def __init__(self, path):
+        try:
+            with open(path, encoding="utf-8", errors="replace") as local_file:
+                self.text = local_file.read()
+            self.status_code = 200
+        except OSError:
+            self.text = ""
+            self.status_code = 404
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """Whether the file could be read."""
+        return self.status_code == 200
+
+
+def _checkout_tree(checkout):
+    """Return the `RepoTree` of the commit checked out at `checkout`, or
+    ``None`` if it is not a git checkout.
+    """
+    result = subprocess.run(
+        ["git", "ls-tree", "-r", "-t", "-l", "-z", "HEAD"],
+        cwd=checkout,
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode:
+        return None
+    entries = []
+    for line in result.stdout.decode("utf-8", "replace").split("\0"):
+        if not line:
+            continue
+        info, path = line.split("\t", 1)
+        mode, kind, sha, size = info.split()
+        entry = {"path": path, "mode": mode, "type": kind, "sha": sha}
+        if size != "-":
+            entry["size"] = int(size)
+        entries.append(entry)
+    return RepoTree(entries)
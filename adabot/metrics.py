@@ -0,0 +1,249 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""In-process request metrics.
+
+Every GitHub request is recorded against its endpoint template (for example
+``/repos/{owner}/{repo}/releases/latest``) and against the validator that made
+it, so a run can report where the rate limit and the wall-clock time went. The
+registry dumps as JSON or as Prometheus text.
+"""
+
+import contextlib
+import json
+import threading
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# Counters exported to Prometheus: (metric name, key, help text).
+_PROMETHEUS_COUNTERS = (
+    ("requests_total", "count", "Requests made."),
+    ("response_bytes_total", "bytes", "Response body bytes received."),
+    ("cache_hits_total", "cache_hits", "Responses served from the cache."),
+    ("not_modified_total", "not_modified", "Responses revalidated with a 304."),
+)
+
+# Path segments whose following segment is a name or ID.
+_NAMED_SEGMENTS = {
+    "repos": ("{owner}", "{repo}"),
+    "users": ("{user}",),
+    "orgs": ("{org}",),
+    "compare": ("{basehead}",),
+    "tags": ("{tag}",),
+    "workflows": ("{workflow_id}",),
+    "branches": ("{branch}",),
+    "commits": ("{sha}",),
+    "trees": ("{sha}",),
+    "labels": ("{name}",),
+    "pypi": ("{package}",),
+}
+
+
+def normalize_endpoint(url):
+    """Return the endpoint template for `url`, with owners, names, numbers and
+    file paths replaced by placeholders.
+    """
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    template = []
+    index = 0
+    while index < len(segments):
+        segment = segments[index]
+        index += 1
+        if segment.isdigit():
+            template.append("{number}")
+            continue
+        template.append(segment)
+        if segment == "contents" and index < len(segments):
+            template.append("{path}")
+            break
+        for placeholder in _NAMED_SEGMENTS.get(segment, ()):
+            if index < len(segments):
+                template.append(placeholder)
+                index += 1
+    path = "/" + "/".join(template)
+    if parts.netloc in ("", "api.github.com"):
+        return path
+    return f"{parts.scheme}://{parts.netloc}{path}"
+
+
+class _Stats:  # pylint: disable=too-few-public-methods
+    """Counters for a single endpoint or validator."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.statuses = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    # pylint: disable=too-many-arguments
+    def add(self, status, seconds, size, from_cache, not_modified):
+        """Add a single request."""
+        self.count += 1
+        self.seconds += seconds
+        self.bytes += size
+        self.cache_hits += bool(from_cache)
+        self.not_modified += bool(not_modified)
+        status = "error" if status is None else str(status)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+
+    def as_dict(self):
+        """Return the counters as a JSON serializable dict."""
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            cumulative += count
+            histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "seconds": round(self.seconds, 3),
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            "not_modified": self.not_modified,
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency_histogram": histogram,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of request metrics."""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._callers = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def caller(self, name):
+        """Attribute the requests made inside the block, on this thread, to
+        the caller `name` (such as a validator).
+        """
+        previous = getattr(self._local, "caller", None)
+        self._local.caller = name
+        try:
+            yield
+        finally:
+            self._local.caller = previous
+
+    # pylint: disable=too-many-arguments
+    def record(
+        self,
+        method,
+        url,
+        status,
+        seconds,
+        size=0,
+        from_cache=False,
+        not_modified=False,
+    ):
+        """Record a request. `status` is ``None`` if no response was received,
+        which is counted under the status ``error``.
+        """
+        key = (method.upper(), normalize_endpoint(url))
+        caller = getattr(self._local, "caller", None) or "(none)"
+        with self._lock:
+            for stats, name in ((self._endpoints, key), (self._callers, caller)):
+                if name not in stats:
+                    stats[name] = _Stats()
+                stats[name].add(status, seconds, size, from_cache, not_modified)
+
+    def reset(self):
+        """Remove all recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
+            self._callers.clear()
+
+    def as_dict(self):
+        """Return the metrics as a JSON serializable dict."""
+        with self._lock:
+            return {
+                "endpoints": [
+                    dict(method=method, endpoint=endpoint, **stats.as_dict())
+                    for (method, endpoint), stats in sorted(self._endpoints.items())
+                ],
+                "callers": {
+                    caller: stats.as_dict()
+                    for caller, stats in sorted(self._callers.items())
+                },
+            }
+
+    def to_json(self):
+        """Return the metrics as a JSON document."""
+        return json.dumps(self.as_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        data = self.as_dict()
+        endpoint_series = [
+            ({"method": item["method"], "endpoint": item["endpoint"]}, item)
+            for item in data["endpoints"]
+        ]
+        caller_series = [
+            ({"caller": caller}, item) for caller, item in data["callers"].items()
+        ]
+        lines = _prometheus_lines("adabot_github", endpoint_series)
+        lines.extend(_prometheus_lines("adabot_github_caller", caller_series))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path, metrics_format="json"):
+        """Write the metrics to `path` as ``json`` or ``prometheus`` text."""
+        if metrics_format == "prometheus":
+            text = self.to_prometheus()
+        else:
+            text = self.to_json()
+        with open(path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(text)
+
+
+def _prometheus_lines(prefix, series):
+    """Return the Prometheus text lines for a list of (labels, stats) pairs."""
+    lines = []
+    for name, key, help_text in _PROMETHEUS_COUNTERS:
+        metric = f"{prefix}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for labels, item in series:
+            lines.append(f"{metric}{_format_labels(labels)} {item[key]}")
+
+    metric = f"{prefix}_responses_total"
+    lines.append(f"# HELP {metric} Responses by status code.")
+    lines.append(f"# TYPE {metric} counter")
+    for labels, item in series:
+        for status, count in item["statuses"].items():
+            lines.append(
+                f"{metric}{_format_labels(dict(labels, status=status))} {count}"
+            )
+
+    metric = f"{prefix}_request_seconds"
+    lines.append(f"# HELP {metric} Request latency in seconds.")
+    lines.append(f"# TYPE {metric} histogram")
+    for labels, item in series:
+        for bound, count in item["latency_histogram"].items():
+            lines.append(
+                f"{metric}_bucket{_format_labels(dict(labels, le=bound))} {count}"
+            )
+        lines.append(f"{metric}_sum{_format_labels(labels)} {item['seconds']}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {item['count']}")
+    return lines
+
+
+def _format_labels(labels):
+    escaped = (
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Process-wide scheduler for pacing requests against the GitHub rate limits.
+
+Each rate limit resource (``core``, ``search``, ``graphql``) gets a token
+bucket per credential, as every access token has its own budget. Requests
+take a token before they are sent, and every response updates the bucket of
+its credential from its rate limit headers:
+
+* Plenty of budget left: requests are not paced at all.
+* Budget running low: the refill rate is set so the remaining requests are
+  spread evenly until the reset time, instead of stalling at zero.
+* Budget exhausted: the credential is blocked for the resource until the
+  reset time.
+* ``Retry-After`` or a secondary rate limit ``403``: the resource is blocked,
+  whatever the credential, until it is safe to send again.
+
+The scheduler is safe to share between threads.
+"""
+
+import datetime
+import logging
+import threading
+import time
+
+import github as pygithub
+from requests.structures import CaseInsensitiveDict
+
+MAXIMUM_RATE_LIMIT_DELAY = 62 * 60  # 62 minutes
+
+# Start pacing once less than this fraction of the hourly limit remains.
+PACING_FRACTION = 0.2
+
+# Number of requests that can be sent back to back while pacing.
+BURST_SIZE = 10
+
+# Extra wait after a reset, to avoid racing GitHub's clock.
+RESET_MARGIN = 60
+
+# GitHub asks for at least a minute's wait after a secondary rate limit that
+# does not come with a Retry-After header.
+SECONDARY_RATE_LIMIT_DELAY = 60
+
+
+class _Bucket:  # pylint: disable=too-few-public-methods
+    """Token bucket for a single rate limit resource."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.rate = None  # tokens per second, or None when not pacing
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        """Add the tokens accumulated since the last refill."""
+        if self.rate is None:
+            self.tokens = float(self.capacity)
+        else:
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+
+class RateLimitScheduler:
+    """Paces requests from the rate limit state reported by GitHub.
+
+    :param int burst: The number of requests allowed back to back while pacing.
+    """
+
+    def __init__(self, burst=BURST_SIZE):
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resource_for(url):
+        """Return the name of the rate limit resource that `url` counts against."""
+        if "/search/" in url:
+            return "search"
+        if url.rstrip("/").endswith("/graphql"):
+            return "graphql"
+        return "core"
+
+    def _bucket(self, resource, credential=None):
+        key = (resource, credential)
+        if key not in self._buckets:
+            self._buckets[key] = _Bucket(self.burst)
+        return self._buckets[key]
+
+    def acquire(self, resource="core", credential=None):
+        """Block until a request against `resource` may be sent with
+        `credential`, any hashable naming the access token used (such as its
+        ``Authorization`` header). The token is reserved straight away, so
+        waiting callers are served in order.
+        """
+        with self._lock:
+            shared = self._bucket(resource)
+            bucket = self._bucket(resource, credential)
+            now = time.monotonic()
+            bucket.refill(now)
+            bucket.tokens -= 1
+            wait = max(shared.blocked_until, bucket.blocked_until) - now
+            if bucket.tokens < 0:
+                wait = max(wait, -bucket.tokens / bucket.rate)
+        if wait > 0:
+            time.sleep(min(wait, MAXIMUM_RATE_LIMIT_DELAY))
+
+    def refund(self, resource="core", credential=None):
+        """Give back the token taken by `acquire` for a request that did not
+        count against the rate limit, such as a ``304 Not Modified``.
+        """
+        with self._lock:
+            bucket = self._bucket(resource, credential)
+            bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+
+    def block(self, resource, seconds, credential=None):
+        """Hold back the requests against `resource` for `seconds`: those sent
+        with `credential`, or all of them if it is ``None``.
+        """
+        with self._lock:
+            bucket = self._bucket(resource, credential)
+            bucket.blocked_until = max(
+                bucket.blocked_until,
+                time.monotonic() + min(seconds, MAXIMUM_RATE_LIMIT_DELAY),
+            )
+
+    # pylint: disable=too-many-arguments
+    def update(self, status_code, headers, body="", resource="core", credential=None):
+        """Update the schedule for `resource` from a response to a request
+        sent with `credential` (see `acquire`). Returns ``True`` if the request
+        was rejected by a rate limit and should be retried.
+        """
+        headers = CaseInsensitiveDict(headers)
+        resource = headers.get("X-RateLimit-Resource", resource)
+        retry_after = headers.get("Retry-After")
+        if status_code in (403, 429) and retry_after is not None:
+            logging.warning("GitHub asked to retry after %s seconds", retry_after)
+            self.block(resource, int(retry_after))
+            return True
+        if status_code in (403, 429) and "secondary rate limit" in body.lower():
+            logging.warning("GitHub secondary rate limit reached. Pausing.")
+            self.block(resource, SECONDARY_RATE_LIMIT_DELAY)
+            return True
+
+        if "X-RateLimit-Remaining" not in headers:
+            return False
+        remaining = int(headers["X-RateLimit-Remaining"])
+        limit = int(headers.get("X-RateLimit-Limit", remaining))
+        reset_in = max(int(headers.get("X-RateLimit-Reset", 0)) - time.time(), 1)
+        if remaining <= 1:
+            reset_time = datetime.datetime.now() + datetime.timedelta(seconds=reset_in)
+            logging.warning(
+                "GitHub API Rate Limit reached. Pausing until Rate Limit reset."
+            )
+            logging.warning("Rate Limit will reset at: %s", reset_time)
+            self.block(resource, reset_in + RESET_MARGIN, credential)
+            return status_code in (403, 429)
+
+        with self._lock:
+            bucket = self._bucket(resource, credential)
+            bucket.refill(time.monotonic())
+            if remaining > limit * PACING_FRACTION:
+                bucket.rate = None
+            else:
+                bucket.rate = remaining / reset_in
+        return False
+
+    def call_pygithub(self, func):
+        """Call ``func()``, which makes PyGithub requests, retrying after the
+        rate limit resets whenever PyGithub reports that it was exceeded.
+        """
+        while True:
+            self.acquire("core")
+            try:
+                return func()
+            except pygithub.RateLimitExceededException as err:
+                self._update_from_exception(err)
+            except pygithub.GithubException as err:
+                if "secondary rate limit" not in str(err.data).lower():
+                    raise
+                self._update_from_exception(err)
+
+    def _update_from_exception(self, err):
+        headers = CaseInsensitiveDict(err.headers or {})
+        if "X-RateLimit-Reset" in headers or "Retry-After" in headers:
+            self.update(err.status, headers, str(err.data))
+        else:
+            self.update(err.status, {}, "secondary rate limit")
+
+
+SCHEDULER = RateLimitScheduler()
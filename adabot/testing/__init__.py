@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Helpers for running adabot without the network, for tests and benchmarks."""
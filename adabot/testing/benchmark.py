@@ -0,0 +1,254 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""End-to-end benchmarks of the daily report pipelines.
+
+Each pipeline runs against a `adabot.testing.fakehub.FakeHub` serving a
+synthetic organization, once per organization size, in a fresh process so
+module-level state and the peak RSS are its own. The wall time, the HTTP
+requests served (in total, by host and per repository) and the peak RSS are
+written as JSON. Given the results of an earlier run as a baseline, pipelines
+that got slower or send more requests than the threshold allows are reported
+and the command exits with an error::
+
+    python -m adabot.testing.benchmark --sizes 500,2000 --output bench.json
+    python -m adabot.testing.benchmark --sizes 500,2000 --baseline bench.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import multiprocessing
+import platform
+import queue
+import resource
+import sys
+import time
+
+from adabot import arduino_libraries
+from adabot import circuitpython_libraries
+from adabot import circuitpython_library_download_stats
+from adabot import update_cp_org_libraries
+from adabot.lib import circuitpython_library_validators
+from adabot.testing import fakehub
+
+DEFAULT_SIZES = (500, 2000)
+
+# Allowed increase over the baseline, as a fraction.
+DEFAULT_THRESHOLD = 0.2
+
+# The fake hub does not limit the benchmarks.
+UNLIMITED = {"core": 10**9, "search": 10**9, "graphql": 10**9}
+
+
+def run_circuitpython_libraries():
+    """Run the library checks that do not need extra tokens."""
+    token_methods = (
+        circuitpython_library_validators.LibraryValidator.get_token_methods()
+    )
+    validators = [
+        function
+        for name, function in circuitpython_libraries.default_validators
+        if name not in token_methods
+    ]
+    validators.sort(key=lambda function: function.__name__ != "validate_contents")
+    circuitpython_libraries.run_library_checks(validators, {}, 5)
+
+
+def run_update_cp_org_libraries():
+    """Build the circuitpython.org libraries file."""
+    update_cp_org_libraries.main(output_file=None)
+
+
+def run_arduino_libraries():
+    """Run the Arduino library checks."""
+    arduino_libraries.main(verbosity=0)
+
+
+def run_download_stats():
+    """Collect the library download stats."""
+    circuitpython_library_download_stats.run_stat_check()
+
+
+PIPELINES = {
+    "circuitpython_libraries": run_circuitpython_libraries,
+    "update_cp_org_libraries": run_update_cp_org_libraries,
+    "arduino_libraries": run_arduino_libraries,
+    "download_stats": run_download_stats,
+}
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _run_in_child(pipeline, hub_url, results):
+    """Run `pipeline` against the fake hub at `hub_url` and put its wall time
+    and peak RSS on the `results` queue.
+    """
+    logging.disable(logging.CRITICAL)
+    fakehub.redirect(hub_url)
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            PIPELINES[pipeline]()
+    except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+        error = repr(err)
+    results.put((time.perf_counter() - start, _peak_rss_mb(), error))
+
+
+def run_benchmark(pipeline, hub):
+    """Run `pipeline` in a new process against `hub` and return its result."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    before = dict(hub.requests)
+    child = context.Process(target=_run_in_child, args=(pipeline, hub.url, results))
+    child.start()
+    child.join()
+    try:
+        wall_seconds, peak_rss_mb, error = results.get(timeout=5)
+    except queue.Empty:
+        wall_seconds, peak_rss_mb = 0.0, 0.0
+        error = f"Benchmark process exited with code {child.exitcode}"
+    requests_by_host = {
+        key: count - before.get(key, 0)
+        for key, count in hub.requests.items()
+        if count > before.get(key, 0)
+    }
+    total = sum(requests_by_host.values())
+    return {
+        "pipeline": pipeline,
+        "repos": hub.org.size,
+        "wall_seconds": round(wall_seconds, 3),
+        "requests": total,
+        "requests_by_host": dict(sorted(requests_by_host.items())),
+        "requests_per_repo": round(total / max(hub.org.size, 1), 2),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "error": error,
+    }
+
+
+def run_suite(pipelines, sizes, latency=0.0, seed=0):
+    """Run every pipeline at every organization size and return the results."""
+    results = []
+    for size in sizes:
+        hub = fakehub.FakeHub(
+            fakehub.SyntheticOrg(size, seed=seed),
+            latency=latency,
+            rate_limits=UNLIMITED,
+        )
+        hub.start(redirect_requests=False)
+        try:
+            for pipeline in pipelines:
+                result = run_benchmark(pipeline, hub)
+                logging.info(
+                    "%s with %s repos: %.2fs, %s requests, %.1f MB",
+                    pipeline,
+                    size,
+                    result["wall_seconds"],
+                    result["requests"],
+                    result["peak_rss_mb"],
+                )
+                results.append(result)
+        finally:
+            hub.stop()
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "latency": latency,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return a description of each regression of `results` from `baseline`:
+    a pipeline that failed, or a wall time, request count or peak RSS more
+    than `threshold` above the baseline.
+    """
+    previous = {
+        (result["pipeline"], result["repos"]): result for result in baseline["results"]
+    }
+    regressions = []
+    for result in results["results"]:
+        if result["error"]:
+            regressions.append(
+                f"{result['pipeline']} ({result['repos']} repos): {result['error']}"
+            )
+        old = previous.get((result["pipeline"], result["repos"]))
+        if old is None:
+            continue
+        for key in ("wall_seconds", "requests", "peak_rss_mb"):
+            if result[key] > old[key] * (1 + threshold):
+                regressions.append(
+                    f"{result['pipeline']} ({result['repos']} repos): "
+                    f"{key} {old[key]} -> {result[key]}"
+                )
+    return regressions
+
+
+def cmd_line_parser():
+    """Return the parser for the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the report pipelines against a fake GitHub.",
+        prog="Adabot Benchmarks",
+    )
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma separated organization sizes",
+    )
+    parser.add_argument(
+        "--pipelines",
+        default=",".join(PIPELINES),
+        help="Comma separated pipelines to run",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to delay each response"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", help="File to write the results to")
+    parser.add_argument("--baseline", help="Results to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed increase over the baseline, as a fraction",
+    )
+    return parser
+
+
+def main(args=None):
+    """Run the benchmarks and compare them to the baseline."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = cmd_line_parser().parse_args(args)
+    results = run_suite(
+        [pipeline.strip() for pipeline in args.pipelines.split(",")],
+        [int(size) for size in args.sizes.split(",")],
+        latency=args.latency,
+        seed=args.seed,
+    )
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(text)
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            logging.error("Regression: %s", regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Local stand-in for the GitHub, PyPI and ReadTheDocs APIs.
+
+`FakeHub` is an HTTP server emulating the endpoints adabot uses: repository
+search, repositories, contents, git trees, releases, compare, issues, pulls, reviews,
+labels, Actions workflow runs and GraphQL on ``api.github.com``, raw files on
+``raw.githubusercontent.com``, the PyPI JSON API, ReadTheDocs subprojects and
+builds, and the Arduino library index. It serves a `SyntheticOrg` of any size,
+adds GitHub's rate limit headers and can delay every response, so the
+validators can be benchmarked without a network or real tokens::
+
+    with FakeHub(SyntheticOrg(2000), latency=0.02):
+        circuitpython_libraries.main(validator="all")
+
+While it runs, requests to the emulated hosts are sent to the server instead.
+Other processes can use a server started with
+``python -m adabot.testing.fakehub --repos 2000 --port 8000`` by setting
+``ADABOT_FAKEHUB=http://127.0.0.1:8000``.
+"""
+
+import argparse
+import http.server
+import json
+import random
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from adabot.testing.synthetic_org import SyntheticOrg, not_found
+
+# Hosts whose requests are sent to the fake server.
+HOSTS = (
+    "api.github.com",
+    "raw.githubusercontent.com",
+    "pypi.org",
+    "readthedocs.org",
+    "downloads.arduino.cc",
+    "www.piwheels.org",
+)
+
+# Requests per hour allowed for each rate limit resource.
+RATE_LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+
+
+_REPO = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+
+# (method, host, path regular expression, SyntheticOrg handler)
+ROUTES = tuple(
+    (method, host, re.compile(pattern + "/?$"), handler)
+    for method, host, pattern, handler in (
+        ("GET", "api.github.com", r"/search/repositories", "search_repositories"),
+        ("GET", "api.github.com", r"/orgs/(?P<owner>[^/]+)/repos", "org_repos"),
+        ("GET", "api.github.com", r"/user", "user"),
+        ("POST", "api.github.com", r"/graphql", "graphql"),
+        ("GET", "api.github.com", _REPO, "repo"),
+        ("GET", "api.github.com", _REPO + r"/contents(?:/(?P<path>.*))?", "contents"),
+        ("GET", "api.github.com", _REPO + r"/git/trees/(?P<ref>.+)", "git_tree"),
+        ("GET", "api.github.com", _REPO + r"/releases", "releases"),
+        ("GET", "api.github.com", _REPO + r"/releases/latest", "latest_release"),
+        ("GET", "api.github.com", _REPO + r"/compare/(?P<basehead>.+)", "compare"),
+        ("GET", "api.github.com", _REPO + r"/issues", "issues"),
+        ("GET", "api.github.com", _REPO + r"/issues/(?P<number>\d+)", "issue"),
+        ("GET", "api.github.com", _REPO + r"/pulls", "pulls"),
+        ("GET", "api.github.com", _REPO + r"/pulls/(?P<number>\d+)", "pull"),
+        ("GET", "api.github.com", _REPO + r"/pulls/(?P<number>\d+)/reviews", "reviews"),
+        (
+            "GET",
+            "api.github.com",
+            _REPO + r"/pulls/(?P<number>\d+)/commits",
+            "pull_commits",
+        ),
+        ("GET", "api.github.com", _REPO + r"/labels", "labels"),
+        ("POST", "api.github.com", _REPO + r"/labels", "create_label"),
+        ("GET", "api.github.com", _REPO + r"/milestones", "milestones"),
+        (
+            "GET",
+            "api.github.com",
+            _REPO + r"/actions/workflows/(?P<workflow>[^/]+)",
+            "workflow",
+        ),
+        (
+            "GET",
+            "api.github.com",
+            _REPO + r"/actions/workflows/(?P<workflow>[^/]+)/runs",
+            "workflow_runs",
+        ),
+        (
+            "GET",
+            "raw.githubusercontent.com",
+            r"/(?P<owner>[^/]+)/(?P<repo>[^/]+)/(?P<ref>[^/]+)/(?P<path>.+)",
+            "raw",
+        ),
+        ("GET", "pypi.org", r"/pypi/(?P<package>[^/]+)/json", "pypi"),
+        (
+            "GET",
+            "readthedocs.org",
+            r"/api/v2/project/\d+/subprojects",
+            "rtd_subprojects",
+        ),
+        (
+            "GET",
+            "readthedocs.org",
+            r"/api/v3/projects/(?P<slug>[^/]+)/builds",
+            "rtd_builds",
+        ),
+        (
+            "GET",
+            "downloads.arduino.cc",
+            r"/libraries/library_index.json",
+            "arduino_index",
+        ),
+        ("GET", "www.piwheels.org", r"/packages.json", "piwheels"),
+    )
+)
+
+
+class _RateLimits:  # pylint: disable=too-few-public-methods
+    """Per-credential GitHub rate limit counters."""
+
+    def __init__(self, limits):
+        self.limits = limits
+        self._used = {}
+        self._resets = {}
+        self._lock = threading.Lock()
+
+    def take(self, credential, resource):
+        """Count a request and return the rate limit headers for it, and
+        whether the request is over the limit.
+        """
+        limit = self.limits.get(resource, self.limits["core"])
+        now = time.time()
+        key = (credential, resource)
+        with self._lock:
+            if self._resets.get(key, 0) <= now:
+                self._resets[key] = int(now) + (60 if resource == "search" else 3600)
+                self._used[key] = 0
+            self._used[key] += 1
+            used = self._used[key]
+            reset = self._resets[key]
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(max(limit - used, 0)),
+            "X-RateLimit-Used": str(min(used, limit)),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Resource": resource,
+        }
+        return headers, used > limit
+
+
+def _resource(path):
+    """Return the GitHub rate limit resource counting requests for `path`."""
+    if path.startswith("/search/"):
+        return "search"
+    if path == "/graphql":
+        return "graphql"
+    return "core"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Dispatches requests to the `SyntheticOrg` handlers by host and path."""
+
+    protocol_version = "HTTP/1.1"
+    # The headers and body are written separately, so do not hold back the
+    # body until the headers are acknowledged.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Handle a GET request"""
+        self._dispatch("GET")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Handle a POST request"""
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        hub = self.server.hub
+        host = (self.headers.get("Host") or "api.github.com").split(":")[0]
+        if host not in HOSTS:
+            host = "api.github.com"
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+
+        if hub.latency:
+            time.sleep(hub.latency + hub.jitter * hub.random())
+
+        headers = {}
+        over_limit = False
+        if host == "api.github.com":
+            credential = self.headers.get("Authorization", self.client_address[0])
+            headers, over_limit = hub.rate_limits.take(
+                credential, _resource(parts.path)
+            )
+
+        if over_limit:
+            status, payload = 403, {"message": "API rate limit exceeded"}
+        else:
+            status, payload, extra_headers = hub.handle(
+                method, host, parts.path, query, body
+            )
+            headers.update(extra_headers)
+        hub.count(method, host)
+        self._respond(status, payload, headers)
+
+    def _respond(self, status, payload, headers):
+        if isinstance(payload, str):
+            content = payload.encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+        else:
+            content = json.dumps(payload).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Do not log every request"""
+
+
+class FakeHub:  # pylint: disable=too-many-instance-attributes
+    """HTTP server serving `org` in place of GitHub, PyPI and ReadTheDocs.
+
+    :param org: The `SyntheticOrg` to serve.
+    :param latency: Seconds to wait before answering each request.
+    :param jitter: Up to this many more seconds are added to the latency at
+                   random.
+    :param rate_limits: The requests per hour for each rate limit resource.
+    :param port: The port to listen on, or 0 for any free port.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, org=None, latency=0.0, jitter=0.0, rate_limits=None, port=0):
+        self.org = org if org is not None else SyntheticOrg()
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(0).random
+        self.rate_limits = _RateLimits(dict(RATE_LIMITS, **(rate_limits or {})))
+        self.requests = {}
+        self._lock = threading.Lock()
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.hub = self
+        self._thread = None
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def handle(self, method, host, path, query, body):
+        """Return the (status, body, headers) answer to a request."""
+        for route_method, route_host, pattern, handler in ROUTES:
+            if route_method != method or route_host != host:
+                continue
+            match = pattern.match(path)
+            if match:
+                kwargs = {k: v for k, v in match.groupdict().items() if v is not None}
+                return getattr(self.org, handler)(query, body=body, **kwargs)
+        return not_found()
+
+    def count(self, method, host):
+        """Count a request served."""
+        with self._lock:
+            key = f"{method} {host}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+    def start(self, redirect_requests=True):
+        """Start serving in a background thread. Unless `redirect_requests`
+        is false, requests to the emulated hosts are sent here.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        if redirect_requests:
+            redirect(self.url)
+        return self
+
+    def stop(self):
+        """Stop serving and restore the real hosts."""
+        restore()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        """Serve in the current thread, without redirecting its requests."""
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+_redirected_send = None
+
+
+def redirect(url):
+    """Send every request for one of the emulated `HOSTS` to the fake server
+    at `url` instead, with the original host in the ``Host`` header.
+    """
+    global _redirected_send  # pylint: disable=global-statement
+    restore()
+    target = urlsplit(url)
+    send = HTTPAdapter.send
+
+    def _send(adapter, request, *args, **kwargs):
+        parts = urlsplit(request.url)
+        if parts.hostname not in HOSTS:
+            return send(adapter, request, *args, **kwargs)
+        original_url = request.url
+        request.url = parts._replace(
+            scheme=target.scheme, netloc=target.netloc
+        ).geturl()
+        request.headers["Host"] = parts.hostname
+        try:
+            response = send(adapter, request, *args, **kwargs)
+        finally:
+            request.url = original_url
+            del request.headers["Host"]
+        response.url = original_url
+        return response
+
+    _redirected_send = send
+    HTTPAdapter.send = _send
+
+
+def restore():
+    """Stop redirecting requests to a fake server."""
+    global _redirected_send  # pylint: disable=global-statement
+    if _redirected_send is not None:
+        HTTPAdapter.send = _redirected_send
+        _redirected_send = None
+
+
+def cmd_line_parser():
+    """Return the parser for the command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Serve a synthetic organization in place of GitHub, PyPI "
+        "and ReadTheDocs.",
+        prog="Adabot Fake Hub",
+    )
+    parser.add_argument("--repos", type=int, default=500, help="Number of libraries")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to delay each response"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Random extra delay, in seconds"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=RATE_LIMITS["core"],
+        help="Core API requests per hour for each credential",
+    )
+    return parser
+
+
+def main(args=None):
+    """Serve the fake hub until interrupted."""
+    args = cmd_line_parser().parse_args(args)
+    hub = FakeHub(
+        SyntheticOrg(args.repos, seed=args.seed),
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limits={"core": args.rate_limit},
+        port=args.port,
+    )
+    print(f"Serving {len(hub.org.repos)} repositories at {hub.url}")
+    try:
+        hub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
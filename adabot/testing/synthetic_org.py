@@ -0,0 +1,819 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""A generated GitHub organization, served by `adabot.testing.fakehub`.
+
+`SyntheticOrg` holds the repositories with their files, releases, issues,
+pull requests and labels, and answers each API endpoint with the JSON GitHub
+would return for them.
+"""
+
+import base64
+import datetime
+import functools
+import hashlib
+import json
+import random
+import threading
+import time
+from urllib.parse import urlencode
+
+ORG = "adafruit"
+
+API_URL = "https://api.github.com"
+RAW_URL = "https://raw.githubusercontent.com"
+
+# Repositories looked up by name besides the searched libraries.
+EXTRA_REPOS = (
+    "Adafruit_Blinka",
+    "Adafruit_Blinka_bleio",
+    "Adafruit_Blinka_Displayio",
+    "Adafruit_Blinka_PyPortal",
+    "Adafruit_Python_Extended_Bus",
+    "Adafruit_Python_PlatformDetect",
+    "Adafruit_Python_PureIO",
+    "cookiecutter-adafruit-circuitpython",
+)
+
+RTD_PROJECT_ID = 74557
+RTD_ADABOT_USER = 105398
+
+STANDARD_LABELS = (
+    ("bug", "ee0701"),
+    ("documentation", "0e8a16"),
+    ("enhancement", "84b6eb"),
+    ("good first issue", "7057ff"),
+    ("Hacktoberfest", "f2b36f"),
+    ("help wanted", "33aa3f"),
+    ("invalid", "e6e6e6"),
+    ("question", "cc317c"),
+)
+
+README_TEMPLATE = """Introduction
+============
+
+.. image:: https://readthedocs.org/projects/{slug}/badge/?version=latest
+    :target: https://docs.circuitpython.org/projects/{short_name}/en/latest/
+    :alt: Documentation Status
+
+.. image:: https://raw.githubusercontent.com/adafruit/Adafruit_CircuitPython_Bundle/main/badges/adafruit_discord.svg
+    :target: https://adafru.it/discord
+    :alt: Discord
+
+.. image:: https://github.com/adafruit/{name}/workflows/Build%20CI/badge.svg
+    :target: https://github.com/adafruit/{name}/actions
+    :alt: Build Status
+
+CircuitPython driver for the {short_name} sensor.
+"""
+
+PRE_COMMIT_CONFIG = """repos:
+  - repo: https://github.com/python/black
+    rev: 22.4.0
+    hooks:
+      - id: black
+  - repo: https://github.com/fsfe/reuse-tool
+    rev: v0.14.0
+    hooks:
+      - id: reuse
+  - repo: https://github.com/pre-commit/pre-commit-hooks
+    rev: v4.2.0
+    hooks:
+      - id: end-of-file-fixer
+  - repo: https://github.com/pycqa/pylint
+    rev: v2.15.5
+    hooks:
+      - id: pylint
+"""
+
+READTHEDOCS_CONFIG = """version: 2
+build:
+  os: ubuntu-20.04
+  tools:
+    python: "3"
+python:
+  install:
+    - requirements: docs/requirements.txt
+    - requirements: requirements.txt
+"""
+
+LIBRARY_MODULE = """import struct
+
+from micropython import const
+
+_REGISTER = const(0x00)
+"""
+
+
+def _timestamp(seconds):
+    return datetime.datetime.utcfromtimestamp(seconds).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class SyntheticOrg:  # pylint: disable=too-many-public-methods,no-self-use
+    """A generated GitHub organization of CircuitPython and Arduino libraries.
+
+    The same `size` and `seed` always generate the same repositories, issues
+    and releases. Dates are relative to when the organization is created.
+
+    :param size: The number of library repositories.
+    :param seed: The seed for the random generator.
+    :param arduino_fraction: The fraction of the libraries that are Arduino
+                             rather than CircuitPython libraries.
+    """
+
+    def __init__(self, size=500, seed=0, arduino_fraction=0.1):
+        self.size = size
+        self.now = time.time()
+        self.repos = {}
+        self._details = {}
+        self._lock = threading.Lock()
+        rng = random.Random(seed)
+        self._add_repo("circuitpython", "core", rng)
+        self._add_repo("Adafruit_CircuitPython_Bundle", "bundle", rng)
+        self._add_repo("CircuitPython_Community_Bundle", "bundle", rng)
+        for name in EXTRA_REPOS:
+            self._add_repo(name, "extra", rng)
+        for index in range(size):
+            if rng.random() < arduino_fraction:
+                self._add_repo(f"Adafruit_Sensor{index:05d}_Library", "arduino", rng)
+            else:
+                self._add_repo(f"Adafruit_CircuitPython_Sensor{index:05d}", "lib", rng)
+
+    def _days_ago(self, days):
+        return _timestamp(self.now - days * 24 * 60 * 60)
+
+    def _add_repo(self, name, kind, rng):
+        full_name = f"{ORG}/{name}"
+        api_url = f"{API_URL}/repos/{full_name}"
+        self.repos[name] = {
+            "id": len(self.repos) + 1,
+            "name": name,
+            "full_name": full_name,
+            "owner": {"login": ORG, "type": "Organization"},
+            "private": False,
+            "fork": False,
+            "archived": False,
+            "description": f"Synthetic {kind} repository {name}",
+            "html_url": f"https://github.com/{full_name}",
+            "url": api_url,
+            "clone_url": f"https://github.com/{full_name}.git",
+            "default_branch": "main",
+            "has_wiki": False,
+            "has_issues": True,
+            "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT"},
+            "allow_squash_merge": False,
+            "allow_rebase_merge": False,
+            "allow_merge_commit": True,
+            "permissions": {"admin": False, "push": True, "pull": True},
+            "created_at": self._days_ago(rng.randint(400, 3000)),
+            "updated_at": self._days_ago(rng.randint(0, 300)),
+            "pushed_at": self._days_ago(rng.randint(0, 300)),
+            "stargazers_count": rng.randint(0, 200),
+            "open_issues_count": 0,
+        }
+        release_ages = sorted(
+            (rng.randint(1, 900) for _ in range(rng.choice((0, 1, 2, 3, 5, 8)))),
+        )
+        issues = []
+        for number in range(1, rng.randint(0, 6) + 1):
+            created = rng.randint(0, 120)
+            issue = {
+                "number": number,
+                "title": f"Synthetic issue {number}",
+                "created": created,
+                "updated": rng.randint(0, created),
+                "open": rng.random() < 0.7,
+                "pull": rng.random() < 0.4,
+                "user": f"contributor{rng.randint(1, 50)}",
+                "labels": rng.sample([label for label, _ in STANDARD_LABELS], 1),
+            }
+            issues.append(issue)
+        self.repos[name]["open_issues_count"] = sum(issue["open"] for issue in issues)
+        if kind == "bundle":
+            # The bundles are released daily, tagged with the date.
+            release_ages = list(range(1, 8))
+        self._details[name] = {
+            "kind": kind,
+            "releases": release_ages,
+            "commit_ages": sorted(rng.randint(0, 60) for _ in range(rng.randint(0, 3))),
+            "issues": issues,
+            "build": "success" if rng.random() < 0.9 else "failure",
+            "labels": [label for label in STANDARD_LABELS if rng.random() < 0.95],
+        }
+
+    def kind(self, name):
+        """Return the kind of repository `name` (``lib``, ``arduino``, ``core``,
+        ``bundle`` or ``extra``), or ``None`` if there is no such repository.
+        """
+        details = self._details.get(name)
+        return details["kind"] if details else None
+
+    @functools.lru_cache(maxsize=1024)
+    def files(self, name):
+        """Return the files of repository `name`, as a dict of path to text."""
+        kind = self.kind(name)
+        if kind == "lib":
+            short_name = name[len("Adafruit_CircuitPython_") :].lower()
+            return {
+                "README.rst": README_TEMPLATE.format(
+                    name=name,
+                    short_name=short_name,
+                    slug=f"adafruit-circuitpython-{short_name}",
+                ),
+                "CODE_OF_CONDUCT.md": "# Code of Conduct\n",
+                "LICENSE": "MIT License\n",
+                "ruff.toml": "target-version = 'py38'\n",
+                ".readthedocs.yaml": READTHEDOCS_CONFIG,
+                ".pre-commit-config.yaml": PRE_COMMIT_CONFIG,
+                ".github/workflows/build.yml": "name: Build CI\n",
+                "docs/conf.py": "project = 'Adafruit CircuitPython'\n",
+                "pyproject.toml": f"[project]\nname = '{name}'\n",
+                "requirements.txt": "Adafruit-Blinka\n",
+                "optional_requirements.txt": "\n",
+                f"adafruit_{short_name}.py": LIBRARY_MODULE,
+                f"examples/{short_name}_simpletest.py": "import board\n",
+            }
+        if kind == "arduino":
+            versions = self._details[name]["releases"]
+            return {
+                "README.md": f"# {name}\n",
+                "library.properties": f"name={name}\nversion=1.{len(versions)}.0\n",
+                ".github/workflows/githubci.yml": "name: Arduino Library CI\n",
+                f"examples/{name}/{name}.ino": "void setup() {}\n",
+            }
+        if name == "Adafruit_CircuitPython_Bundle":
+            return {
+                ".gitmodules": self._gitmodules(),
+                "docs/drivers.rst": self._drivers_page(),
+            }
+        if kind is not None:
+            return {".gitmodules": "", "README.md": f"# {name}\n"}
+        return {}
+
+    def _libraries(self):
+        return [name for name in self.repos if self.kind(name) == "lib"]
+
+    def _gitmodules(self):
+        sections = []
+        for name in self._libraries():
+            short_name = name[len("Adafruit_CircuitPython_") :].lower()
+            sections.append(
+                f'[submodule "libraries/drivers/{short_name}"]\n'
+                f"\tpath = libraries/drivers/{short_name}\n"
+                f"\turl = https://github.com/{ORG}/{name}.git\n"
+            )
+        return "".join(sections)
+
+    def _drivers_page(self):
+        return "".join(
+            f"* https://docs.circuitpython.org/projects/{name[23:].lower()}/en/latest/\n"
+            for name in self._libraries()
+        )
+
+    def _content_entry(self, name, path, is_dir):
+        entry = {
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "sha": hashlib.sha1(f"{name}/{path}".encode()).hexdigest(),
+            "type": "dir" if is_dir else "file",
+            "url": f"{API_URL}/repos/{ORG}/{name}/contents/{path}?ref=main",
+            "html_url": f"https://github.com/{ORG}/{name}/tree/main/{path}",
+            "download_url": None if is_dir else f"{RAW_URL}/{ORG}/{name}/main/{path}",
+        }
+        if not is_dir:
+            entry["size"] = len(self.files(name)[path])
+        return entry
+
+    # The endpoint handlers below return a (status, body, headers) tuple. The
+    # body is JSON serialized unless it is a string.
+
+    def search_repositories(self, query, **_):
+        """``GET /search/repositories``"""
+        terms = query.get("q", "")
+        kinds = {"lib", "core"} if "CircuitPython" in terms else {"arduino"}
+        items = [repo for name, repo in self.repos.items() if self.kind(name) in kinds]
+        page, headers = paginate(items, query, "/search/repositories")
+        return 200, {"total_count": len(items), "items": page}, headers
+
+    def org_repos(self, query, owner, **_):
+        """``GET /orgs/{owner}/repos``"""
+        if owner != ORG:
+            return not_found()
+        sort = query.get("sort", "created")
+        key = "name" if sort == "full_name" else sort + "_at"
+        direction = query.get("direction", "asc" if sort == "full_name" else "desc")
+        items = sorted(
+            self.repos.values(),
+            key=lambda repo: (repo[key], repo["id"]),
+            reverse=direction == "desc",
+        )
+        page, headers = paginate(items, query, f"/orgs/{owner}/repos")
+        return 200, page, headers
+
+    def repo(self, query, owner, repo, **_):  # pylint: disable=unused-argument
+        """``GET /repos/{owner}/{repo}``"""
+        if repo not in self.repos:
+            return not_found()
+        return 200, self.repos[repo], {}
+
+    def contents(self, query, owner, repo, path="", **_):
+        """``GET /repos/{owner}/{repo}/contents/{path}``"""
+        # pylint: disable=unused-argument
+        files = self.files(repo)
+        path = path.strip("/")
+        if not files:
+            return 404, {"message": "This repository is empty."}, {}
+        if path in files:
+            entry = self._content_entry(repo, path, False)
+            entry["encoding"] = "base64"
+            entry["content"] = base64.b64encode(files[path].encode()).decode()
+            return 200, entry, {}
+        prefix = path + "/" if path else ""
+        children = {}
+        for file_path in files:
+            if file_path.startswith(prefix):
+                child = file_path[len(prefix) :].split("/", 1)
+                children[prefix + child[0]] = len(child) > 1
+        if not children:
+            return not_found()
+        return (
+            200,
+            [
+                self._content_entry(repo, child, is_dir)
+                for child, is_dir in sorted(children.items())
+            ],
+            {},
+        )
+
+    def git_tree(self, query, owner, repo, ref, **_):
+        """``GET /repos/{owner}/{repo}/git/trees/{ref}``"""
+        # pylint: disable=unused-argument
+        files = self.files(repo)
+        if ref not in ("main", "HEAD") or repo not in self.repos:
+            return not_found()
+        if not files:
+            return 409, {"message": "Git Repository is empty."}, {}
+        entries = {}
+        for path, text in files.items():
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                entries.setdefault("/".join(parts[:depth]), None)
+            entries[path] = len(text)
+        if query.get("recursive") in (None, "0", "false"):
+            entries = {path: size for path, size in entries.items() if "/" not in path}
+        tree = []
+        for path, size in sorted(entries.items()):
+            entry = {
+                "path": path,
+                "mode": "040000" if size is None else "100644",
+                "type": "tree" if size is None else "blob",
+                "sha": hashlib.sha1(f"{repo}/{path}".encode()).hexdigest(),
+            }
+            if size is not None:
+                entry["size"] = size
+            tree.append(entry)
+        return (
+            200,
+            {
+                "sha": hashlib.sha1(repo.encode()).hexdigest(),
+                "tree": tree,
+                "truncated": False,
+            },
+            {},
+        )
+
+    def releases(self, query, owner, repo, **_):  # pylint: disable=unused-argument
+        """``GET /repos/{owner}/{repo}/releases``"""
+        if repo not in self.repos:
+            return not_found()
+        return 200, self._releases(repo), {}
+
+    def latest_release(self, query, owner, repo, **_):
+        """``GET /repos/{owner}/{repo}/releases/latest``"""
+        # pylint: disable=unused-argument
+        releases = self._releases(repo) if repo in self.repos else []
+        if not releases:
+            return not_found()
+        return 200, releases[0], {}
+
+    def _releases(self, name):
+        ages = self._details[name]["releases"]
+        if self.kind(name) == "bundle":
+            return [self._bundle_release(name, age) for age in ages]
+        return [
+            {
+                "id": index + 1,
+                "tag_name": f"{len(ages) - index}.0.0",
+                "name": f"{len(ages) - index}.0.0",
+                "draft": False,
+                "prerelease": False,
+                "created_at": self._days_ago(age),
+                "published_at": self._days_ago(age),
+                "html_url": f"https://github.com/{ORG}/{name}/releases/"
+                f"tag/{len(ages) - index}.0.0",
+                "assets": [],
+            }
+            for index, age in enumerate(ages)
+        ]
+
+    def _bundle_release(self, name, age):
+        tag = _timestamp(self.now - age * 24 * 60 * 60)[:10].replace("-", "")
+        return {
+            "id": age,
+            "tag_name": tag,
+            "name": tag,
+            "draft": False,
+            "prerelease": False,
+            "created_at": self._days_ago(age),
+            "published_at": self._days_ago(age),
+            "html_url": f"https://github.com/{ORG}/{name}/releases/tag/{tag}",
+            "assets": [
+                {
+                    "name": f"adafruit-circuitpython-bundle-{variant}-{tag}.zip",
+                    "download_count": 100 * age + len(variant),
+                }
+                for variant in ("py", "8.x-mpy", "9.x-mpy")
+            ],
+        }
+
+    def compare(self, query, owner, repo, basehead, **_):
+        """``GET /repos/{owner}/{repo}/compare/{base}...{head}``"""
+        # pylint: disable=unused-argument
+        if repo not in self.repos or "..." not in basehead:
+            return not_found()
+        commit_ages = self._details[repo]["commit_ages"]
+        commits = [
+            {
+                "sha": f"{index:040x}",
+                "commit": {
+                    "author": {"date": self._days_ago(age)},
+                    "committer": {"date": self._days_ago(age)},
+                    "message": f"Commit {index}",
+                },
+            }
+            for index, age in enumerate(reversed(commit_ages))
+        ]
+        files = []
+        if commits:
+            short_name = repo[len("Adafruit_CircuitPython_") :].lower()
+            files = [{"filename": f"adafruit_{short_name}.py", "status": "modified"}]
+        return (
+            200,
+            {
+                "status": "ahead" if commits else "identical",
+                "ahead_by": len(commits),
+                "behind_by": 0,
+                "total_commits": len(commits),
+                "commits": commits,
+                "files": files,
+            },
+            {},
+        )
+
+    def _issue(self, name, issue):
+        base = f"{API_URL}/repos/{ORG}/{name}"
+        kind = "pull" if issue["pull"] else "issues"
+        record = {
+            "number": issue["number"],
+            "title": issue["title"],
+            "state": "open" if issue["open"] else "closed",
+            "url": f"{base}/issues/{issue['number']}",
+            "html_url": f"https://github.com/{ORG}/{name}/{kind}/{issue['number']}",
+            "user": {"login": issue["user"]},
+            "labels": [{"name": label} for label in issue["labels"]],
+            "comments": 0,
+            "created_at": self._days_ago(issue["created"]),
+            "updated_at": self._days_ago(issue["updated"]),
+            "closed_at": None if issue["open"] else self._days_ago(issue["updated"]),
+            "closed_by": None if issue["open"] else {"login": "maintainer"},
+        }
+        if issue["pull"]:
+            record["pull_request"] = {
+                "url": f"{base}/pulls/{issue['number']}",
+                "html_url": record["html_url"],
+            }
+        return record
+
+    def _pull(self, name, issue):
+        record = self._issue(name, issue)
+        record.pop("pull_request", None)
+        record["url"] = f"{API_URL}/repos/{ORG}/{name}/pulls/{issue['number']}"
+        merged = None if issue["open"] else record["closed_at"]
+        record.update(
+            draft=False,
+            merged_at=merged,
+            merged_by={"login": "maintainer"} if merged else None,
+            merged=merged is not None,
+        )
+        return record
+
+    def _filtered_issues(self, name, query, pulls_only=False):
+        state = query.get("state", "open")
+        since = query.get("since")
+        issues = []
+        for issue in self._details[name]["issues"]:
+            if pulls_only and not issue["pull"]:
+                continue
+            if state != "all" and (state == "open") != issue["open"]:
+                continue
+            if since and self._days_ago(issue["updated"]) < since:
+                continue
+            issues.append(issue)
+        return issues
+
+    def issues(self, query, owner, repo, **_):
+        """``GET /repos/{owner}/{repo}/issues``"""
+        if repo not in self.repos:
+            return not_found()
+        items = [
+            self._issue(repo, issue) for issue in self._filtered_issues(repo, query)
+        ]
+        page, headers = paginate(items, query, f"/repos/{owner}/{repo}/issues")
+        return 200, page, headers
+
+    def issue(self, query, owner, repo, number, **_):
+        """``GET /repos/{owner}/{repo}/issues/{number}``"""
+        # pylint: disable=unused-argument
+        found = self._find_issue(repo, number)
+        if found is None:
+            return not_found()
+        return 200, self._issue(repo, found), {}
+
+    def pulls(self, query, owner, repo, **_):
+        """``GET /repos/{owner}/{repo}/pulls``"""
+        if repo not in self.repos:
+            return not_found()
+        items = [
+            self._pull(repo, issue)
+            for issue in self._filtered_issues(repo, query, pulls_only=True)
+        ]
+        page, headers = paginate(items, query, f"/repos/{owner}/{repo}/pulls")
+        return 200, page, headers
+
+    def pull(self, query, owner, repo, number, **_):
+        """``GET /repos/{owner}/{repo}/pulls/{number}``"""
+        # pylint: disable=unused-argument
+        found = self._find_issue(repo, number)
+        if found is None or not found["pull"]:
+            return not_found()
+        return 200, self._pull(repo, found), {}
+
+    def reviews(self, query, owner, repo, number, **_):
+        """``GET /repos/{owner}/{repo}/pulls/{number}/reviews``"""
+        # pylint: disable=unused-argument
+        found = self._find_issue(repo, number)
+        if found is None or not found["pull"]:
+            return not_found()
+        review = {
+            "user": {"login": "reviewer"},
+            "state": "APPROVED",
+            "submitted_at": self._days_ago(found["updated"]),
+        }
+        return 200, [] if found["open"] else [review], {}
+
+    def pull_commits(self, query, owner, repo, number, **_):
+        """``GET /repos/{owner}/{repo}/pulls/{number}/commits``"""
+        # pylint: disable=unused-argument
+        found = self._find_issue(repo, number)
+        if found is None or not found["pull"]:
+            return not_found()
+        commit = {
+            "sha": f"{int(number):040x}",
+            "author": {"login": found["user"]},
+            "commit": {"author": {"date": self._days_ago(found["created"])}},
+        }
+        return 200, [commit], {}
+
+    def _find_issue(self, name, number):
+        if name not in self._details:
+            return None
+        for issue in self._details[name]["issues"]:
+            if issue["number"] == int(number):
+                return issue
+        return None
+
+    def labels(self, query, owner, repo, **_):  # pylint: disable=unused-argument
+        """``GET /repos/{owner}/{repo}/labels``"""
+        if repo not in self.repos:
+            return not_found()
+        return (
+            200,
+            [
+                {"name": label, "color": color, "description": ""}
+                for label, color in self._details[repo]["labels"]
+            ],
+            {},
+        )
+
+    def create_label(self, query, owner, repo, body=None, **_):
+        """``POST /repos/{owner}/{repo}/labels``"""
+        # pylint: disable=unused-argument
+        if repo not in self.repos:
+            return not_found()
+        label = json.loads(body or b"{}")
+        with self._lock:
+            self._details[repo]["labels"].append((label["name"], label["color"]))
+        return 201, {"name": label["name"], "color": label["color"]}, {}
+
+    def workflow(self, query, owner, repo, workflow, **_):
+        """``GET /repos/{owner}/{repo}/actions/workflows/{workflow}``"""
+        # pylint: disable=unused-argument
+        if self.kind(repo) != "lib" or workflow not in ("build.yml", "1"):
+            return not_found()
+        return (
+            200,
+            {
+                "id": 1,
+                "name": "Build CI",
+                "path": ".github/workflows/build.yml",
+                "state": "active",
+                "url": f"{API_URL}/repos/{ORG}/{repo}/actions/workflows/1",
+            },
+            {},
+        )
+
+    def workflow_runs(self, query, owner, repo, workflow, **_):
+        """``GET /repos/{owner}/{repo}/actions/workflows/{workflow}/runs``"""
+        status, body, headers = self.workflow(query, owner, repo, workflow)
+        if status != 200:
+            return status, body, headers
+        run = {
+            "id": 1,
+            "head_branch": "main",
+            "status": "completed",
+            "conclusion": self._details[repo]["build"],
+        }
+        return 200, {"total_count": 1, "workflow_runs": [run]}, {}
+
+    def milestones(self, query, owner, repo, **_):  # pylint: disable=unused-argument
+        """``GET /repos/{owner}/{repo}/milestones``"""
+        return 200, [], {}
+
+    def user(self, query, **_):  # pylint: disable=unused-argument
+        """``GET /user``"""
+        return 200, {"login": "adabot", "type": "User"}, {}
+
+    def graphql(self, query, body=None, **_):  # pylint: disable=unused-argument
+        """``POST /graphql``, answering the repository lookups of
+        `adabot.lib.common_funcs.fetch_repo_metadata`.
+        """
+        variables = json.loads(body or b"{}").get("variables") or {}
+        data = {}
+        for key, name in variables.items():
+            if key.startswith("name"):
+                data["repo" + key[len("name") :]] = self._graphql_repo(name)
+        return 200, {"data": data}, {}
+
+    def _graphql_repo(self, name):
+        if name not in self.repos:
+            return None
+        repo = self.repos[name]
+        details = self._details[name]
+        releases = self._releases(name)
+        return {
+            "nameWithOwner": repo["full_name"],
+            "description": repo["description"],
+            "hasWikiEnabled": repo["has_wiki"],
+            "isArchived": repo["archived"],
+            "url": repo["html_url"],
+            "licenseInfo": {"key": "mit", "name": "MIT License", "spdxId": "MIT"},
+            "squashMergeAllowed": repo["allow_squash_merge"],
+            "rebaseMergeAllowed": repo["allow_rebase_merge"],
+            "mergeCommitAllowed": repo["allow_merge_commit"],
+            "viewerPermission": "WRITE",
+            "defaultBranchRef": {
+                "name": repo["default_branch"],
+                "target": {
+                    "checkSuites": {
+                        "nodes": [
+                            {
+                                "conclusion": details["build"].upper(),
+                                "workflowRun": {
+                                    "workflow": {
+                                        "resourcePath": f"/{repo['full_name']}"
+                                        "/actions/workflows/build.yml"
+                                    }
+                                },
+                            }
+                        ]
+                    }
+                },
+            },
+            "latestRelease": (
+                {
+                    "tagName": releases[0]["tag_name"],
+                    "publishedAt": releases[0]["published_at"],
+                }
+                if releases
+                else None
+            ),
+            "releases": {
+                "totalCount": len(releases),
+                "nodes": [
+                    {"publishedAt": release["published_at"]} for release in releases
+                ],
+            },
+            "labels": {
+                "totalCount": len(details["labels"]),
+                "nodes": [{"name": label} for label, _ in details["labels"]],
+            },
+        }
+
+    def raw(self, query, owner, repo, ref, path, **_):
+        """``GET https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{path}``"""
+        # pylint: disable=unused-argument,too-many-arguments
+        files = self.files(repo)
+        if path in files:
+            return 200, files[path], {}
+        if path.endswith(".readthedocs.yaml"):
+            return 200, READTHEDOCS_CONFIG, {}
+        if path.endswith(".pre-commit-config.yaml"):
+            return 200, PRE_COMMIT_CONFIG, {}
+        return 404, "404: Not Found", {}
+
+    def pypi(self, query, package, **_):  # pylint: disable=unused-argument
+        """``GET https://pypi.org/pypi/{package}/json``"""
+        name = package.replace("-", "_").lower()
+        known = name in ("pylint", "adafruit_blinka") or any(
+            repo.lower() == name for repo in self._libraries()
+        )
+        if not known:
+            return 404, {"message": "Not Found"}, {}
+        return (
+            200,
+            {
+                "info": {"name": package, "version": "2.15.5"},
+                "releases": {"2.15.5": [{"upload_time": self._days_ago(30)}]},
+            },
+            {},
+        )
+
+    def rtd_subprojects(self, query, **_):  # pylint: disable=unused-argument
+        """``GET https://readthedocs.org/api/v2/project/{id}/subprojects/``"""
+        return (
+            200,
+            {
+                "subprojects": [
+                    {
+                        "slug": name.lower().replace("_", "-"),
+                        "repo": self.repos[name]["clone_url"],
+                        "users": [RTD_ADABOT_USER],
+                    }
+                    for name in self._libraries()
+                ]
+            },
+            {},
+        )
+
+    def rtd_builds(self, query, slug, **_):  # pylint: disable=unused-argument
+        """``GET https://readthedocs.org/api/v3/projects/{slug}/builds/``"""
+        return 200, {"results": [{"success": True, "state": {"code": "finished"}}]}, {}
+
+    def arduino_index(self, query, **_):  # pylint: disable=unused-argument
+        """``GET http://downloads.arduino.cc/libraries/library_index.json``"""
+        libraries = [
+            {
+                "name": name,
+                "version": f"1.{len(self._details[name]['releases'])}.0",
+                "url": repo["html_url"],
+                "repository": repo["clone_url"],
+                "website": repo["html_url"],
+            }
+            for name, repo in self.repos.items()
+            if self.kind(name) == "arduino"
+        ]
+        return 200, {"libraries": libraries}, {}
+
+    def piwheels(self, query, **_):  # pylint: disable=unused-argument
+        """``GET https://www.piwheels.org/packages.json``"""
+        packages = [
+            [name.replace("_", "-").lower(), index % 500, index * 7]
+            for index, name in enumerate(self._libraries())
+        ]
+        return 200, packages, {}
+
+
+def not_found():
+    """Return GitHub's answer to a request for something that does not exist."""
+    return (
+        404,
+        {"message": "Not Found", "documentation_url": "https://docs.github.com/rest"},
+        {},
+    )
+
+
+def paginate(items, query, path):
+    """Return the page of `items` requested by `query`, and the ``Link``
+    header pointing at the other pages.
+    """
+    per_page = min(int(query.get("per_page", 30)), 100)
+    page = max(int(query.get("page", 1)), 1)
+    last = max((len(items) + per_page - 1) // per_page, 1)
+    links = []
+    for rel, number in (("next", page + 1), ("last", last)):
+        if page < last:
+            link_query = urlencode(dict(query, page=number))
+            links.append(f'<{API_URL}{path}?{link_query}>; rel="{rel}"')
+    headers = {"Link": ", ".join(links)} if links else {}
+    return items[(page - 1) * per_page : page * per_page], headers
@@ -16,8 +16,11 @@ import sys
 
 from adabot.lib import common_funcs
 from adabot.lib import circuitpython_library_validators as cpy_vals
+from adabot.lib import reference_data
+from adabot.lib.repo_snapshot import RepoSnapshot
 from adabot import github_requests as gh_reqs
-from adabot import pypi_requests as pypi
+from adabot.cache_policy import CachePolicy
+from adabot.metrics import METRICS
 
 logger = logging.getLogger(__name__)
 ch = logging.StreamHandler(stream=sys.stdout)
@@ -50,9 +53,57 @@ cmd_line_parser.add_argument(
 cmd_line_parser.add_argument(
     "--cache-ttl", help="HTTP cache TTL", type=int, default=7200
 )
+cmd_line_parser.add_argument(
+    "--cache-max-size",
+    help="Maximum size of each HTTP cache (responses and ETags) in MB (default 256)",
+    type=int,
+    default=256,
+)
+cmd_line_parser.add_argument(
+    "--cache-policy",
+    help="JSON file mapping URL patterns to HTTP cache TTLs, overriding the defaults",
+    type=str,
+    default=None,
+)
+cmd_line_parser.add_argument(
+    "--cache-stats",
+    help="Log HTTP cache hits, misses, stale entries and size at the end of the run",
+    action="store_true",
+    default=False,
+)
+cmd_line_parser.add_argument(
+    "--cache-etags",
+    help="Revalidate GitHub API responses with ETags, persisted between runs",
+    action="store_true",
+    default=False,
+)
+cmd_line_parser.add_argument(
+    "--metrics-file",
+    help="Save GitHub request metrics to the filename provided.",
+    metavar="<METRICS FILENAME>",
+)
+cmd_line_parser.add_argument(
+    "--metrics-format",
+    help="Format of the metrics file. Default is json.",
+    choices=["json", "prometheus"],
+    default="json",
+)
 cmd_line_parser.add_argument(
     "--keep-repos", help="Keep repos between runs", action="store_true", default=False
 )
+cmd_line_parser.add_argument(
+    "-j",
+    "--jobs",
+    help="Number of repositories to process at once (default 1)",
+    type=int,
+    default=1,
+)
+cmd_line_parser.add_argument(
+    "--local-bundle",
+    help="Read the library files from the submodules of this bundle checkout, "
+    "updated to their default branch, instead of downloading them",
+    metavar="<BUNDLE PATH>",
+)
 cmd_line_parser.add_argument(
     "--loglevel", help="Adjust the log level (default INFO)", type=str, default="INFO"
 )
@@ -137,13 +188,59 @@ def get_contributors(repo):
     return contributors, reviewers, merged_pr_count
 
 
-# pylint: disable=too-many-locals,too-many-branches,too-many-statements
+def check_repo(validator, repo, skip=()):
+    """Gather the report data for `repo`: its release state, open issues and
+    pull requests, contributors and infrastructure errors. Returns a dict of
+    them, or ``None`` if the repo is in `skip`. Repos can be checked in
+    separate threads at once.
+    """
+    if repo["name"] in skip:
+        return None
+    # Shared by the checks below, so nothing is fetched twice.
+    snapshot = RepoSnapshot.of(repo)
+    result = {"repo": dict(repo)}
+
+    # get a list of new & updated libraries for the last week
+    result["releases"] = common_funcs.is_new_or_updated(snapshot)
+
+    # get a list of open issues and pull requests
+    result["issues"], result["prs"] = get_open_issues_and_prs(snapshot)
+
+    # get the contributors and reviewers for the last week
+    result["contributors"], result["reviewers"], result["merge_count"] = (
+        get_contributors(snapshot)
+    )
+
+    result["validation"] = None
+    if repo["name"] not in DO_NOT_VALIDATE:
+        # run repo validators to check for infrastructure errors
+        def validate(repo):
+            try:
+                return validator.run_repo_validation(repo)
+            except Exception as err:  # pylint: disable=broad-except
+                # Logged with the rest of the repo's errors, in order.
+                result["exception"] = err
+                return [cpy_vals.ERROR_OUTPUT_HANDLER]
+
+        result["validation"] = validator.run_captured(validate, snapshot)
+    return result
+
+
+# pylint: disable=too-many-locals,too-many-branches,too-many-statements,too-many-arguments
 def main(
     loglevel="ERROR",
     keep_repos=False,
     cache_http=False,
     cache_ttl=7200,
     output_file=None,
+    cache_etags=False,
+    metrics_file=None,
+    metrics_format="json",
+    cache_policy=None,
+    cache_stats=False,
+    cache_max_size=256,
+    jobs=1,
+    local_bundle=None,
 ):
     """Main"""
     logger.setLevel(loglevel)
@@ -159,14 +256,17 @@ def main(
         logger.addHandler(file_handler)
 
     if cache_http:
-        cpy_vals.gh_reqs.setup_cache(cache_ttl)
-
-    repos = common_funcs.list_repos(
-        include_repos=(
-            "CircuitPython_Community_Bundle",
-            "cookiecutter-adafruit-circuitpython",
+        policy = None
+        if cache_policy:
+            policy = CachePolicy.from_file(cache_policy, default=cache_ttl)
+        cpy_vals.gh_reqs.setup_cache(
+            cache_ttl, policy=policy, max_size=cache_max_size * 1024 * 1024
         )
-    )
+    if cache_etags:
+        gh_reqs.setup_conditional_cache(max_size=cache_max_size * 1024 * 1024)
+    if local_bundle:
+        logger.info(" - Library files will be read from: %s", local_bundle)
+        common_funcs.checkout_default_branches(local_bundle)
 
     new_libs = {}
     updated_libs = {}
@@ -182,61 +282,72 @@ def main(
         for vals in inspect.getmembers(cpy_vals.LibraryValidator)
         if vals[0].startswith("validate")
     ]
-    bundle_submodules = common_funcs.get_bundle_submodules()
-
-    latest_pylint = ""
-    pylint_info = pypi.get("/pypi/pylint/json")
-    if pylint_info and pylint_info.ok:
-        latest_pylint = pylint_info.json()["info"]["version"]
+    reference = reference_data.get_reference_data()
+    bundle_submodules = reference.bundle_index()
+    latest_pylint = reference.latest_pylint()
 
     validator = cpy_vals.LibraryValidator(
         default_validators,
         bundle_submodules,
         latest_pylint,
         keep_repos=keep_repos,
+        local_bundle=local_bundle,
     )
 
-    for repo in repos:
-        if (
-            repo["name"] in cpy_vals.BUNDLE_IGNORE_LIST
-            or repo["name"] == "circuitpython"
-        ):
-            continue
+    # Repos the validators find in-work are still reported, so only the ones
+    # ignored before the run are skipped.
+    skip = set(cpy_vals.BUNDLE_IGNORE_LIST) | {"circuitpython"}
+
+    include_repos = (
+        "CircuitPython_Community_Bundle",
+        "cookiecutter-adafruit-circuitpython",
+    )
+    # Process each page of repos as soon as it is listed and the data the
+    # validators need is prefetched, however many repos are processed at once.
+    # The results are then reported in the order of `list_repos`.
+    repo_order = common_funcs.list_repos_order(include_repos)
+    results = sorted(
+        (
+            result
+            for result in common_funcs.map_in_order(
+                lambda repo: check_repo(validator, repo, skip),
+                validator.prefetched_repos(
+                    common_funcs.iter_repo_pages(include_repos=include_repos)
+                ),
+                jobs,
+            )
+            if result is not None
+        ),
+        key=lambda result: repo_order(result["repo"]),
+    )
+    for result in results:
+        repo = result["repo"]
         repo_name = repo["name"]
 
-        # get a list of new & updated libraries for the last week
-        check_releases = common_funcs.is_new_or_updated(repo)
-        if check_releases == "new":
+        if result["releases"] == "new":
             new_libs[repo_name] = repo["html_url"]
-        elif check_releases == "updated":
+        elif result["releases"] == "updated":
             updated_libs[repo_name] = repo["html_url"]
 
-        # get a list of open issues and pull requests
-        check_issues, check_prs = get_open_issues_and_prs(repo)
-        if check_issues:
-            open_issues_by_repo[repo_name] = check_issues
-        if check_prs:
-            open_prs_by_repo[repo_name] = check_prs
-
-        # get the contributors and reviewers for the last week
-        get_contribs, get_revs, get_merge_count = get_contributors(repo)
-        if get_contribs:
-            contributors.update(get_contribs)
-        if get_revs:
-            reviewers.update(get_revs)
-        merged_pr_count_total += get_merge_count
-
-        if repo_name in DO_NOT_VALIDATE:
+        if result["issues"]:
+            open_issues_by_repo[repo_name] = result["issues"]
+        if result["prs"]:
+            open_prs_by_repo[repo_name] = result["prs"]
+
+        if result["contributors"]:
+            contributors.update(result["contributors"])
+        if result["reviewers"]:
+            reviewers.update(result["reviewers"])
+        merged_pr_count_total += result["merge_count"]
+
+        if result["validation"] is None:
             continue
 
-        # run repo validators to check for infrastructure errors
-        errors = []
-        try:
-            errors = validator.run_repo_validation(repo)
-        except Exception as err:  # pylint: disable=broad-except
-            logging.exception("Unhandled exception %s", str(err))
-            errors.extend([cpy_vals.ERROR_OUTPUT_HANDLER])
-        for error in errors:
+        if "exception" in result:
+            err = result["exception"]
+            logging.error("Unhandled exception %s", str(err), exc_info=err)
+        validator.output_file_data.extend(result["validation"].output)
+        for error in result["validation"].errors:
             if not isinstance(error, tuple):
                 # check for an error occurring in the validator module
                 if error == cpy_vals.ERROR_OUTPUT_HANDLER:
@@ -278,6 +389,12 @@ def main(
 
     logger.info("%s", json.dumps(build_json, indent=2))
 
+    if cache_http and cache_stats:
+        logger.info("HTTP cache: %s", json.dumps(gh_reqs.cache_stats()))
+
+    if metrics_file:
+        METRICS.dump(metrics_file, metrics_format)
+
 
 if __name__ == "__main__":
     cmd_line_args = cmd_line_parser.parse_args()
@@ -287,4 +404,12 @@ if __name__ == "__main__":
         cache_http=cmd_line_args.cache_http,
         cache_ttl=cmd_line_args.cache_ttl,
         output_file=cmd_line_args.output_file,
+        cache_etags=cmd_line_args.cache_etags,
+        metrics_file=cmd_line_args.metrics_file,
+        metrics_format=cmd_line_args.metrics_format,
+        cache_policy=cmd_line_args.cache_policy,
+        cache_stats=cmd_line_args.cache_stats,
+        cache_max_size=cmd_line_args.cache_max_size,
+        jobs=cmd_line_args.jobs,
+        local_bundle=cmd_line_args.local_bundle,
     )
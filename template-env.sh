@@ -9,3 +9,30 @@ export ADABOT_GITHUB_ACCESS_TOKEN=<your personal access token>
 
 # This is the username associated with the access token.
 export ADABOT_GITHUB_USER=<username>
+
+# Optional: more access tokens, separated by commas. Requests are spread over
+# all tokens, routing each one to the token with the most rate limit left.
+# export ADABOT_GITHUB_ACCESS_TOKENS=<token>,<token>
+
+# Optional: authenticate as a GitHub App installation, which has a higher rate
+# limit. The private key can be given inline or as the path to the .pem file.
+# export ADABOT_GITHUB_APP_ID=<app id>
+# export ADABOT_GITHUB_APP_INSTALLATION_ID=<installation id>
+# export ADABOT_GITHUB_APP_PRIVATE_KEY_PATH=<path to private key>
+
+# Optional: directory for the HTTP caches. Every adabot process started with it
+# set caches GitHub responses there and reuses those fetched by the others.
+# The reference documents (bundle .gitmodules, cookiecutter configuration,
+# driver page, ...) are kept there between runs too.
+# export ADABOT_CACHE_DIR=<path to cache directory>
+
+# Optional: record all HTTP traffic to a cassette file, or replay a recorded
+# one to run offline. ADABOT_CASSETTE_LATENCY delays each replayed response by
+# a number of seconds, or by the latency measured when recording.
+# export ADABOT_CASSETTE=<path to cassette file>
+# export ADABOT_CASSETTE_MODE=<record or replay>
+# export ADABOT_CASSETTE_LATENCY=<seconds or recorded>
+
+# Optional: send all requests to a local fake GitHub started with
+# python -m adabot.testing.fakehub, for benchmarking without the network.
+# export ADABOT_FAKEHUB=http://127.0.0.1:8000
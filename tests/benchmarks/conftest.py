@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Synthetic inputs for the microbenchmarks, scaled well past the real ones"""
+
+import pytest
+import requests
+
+from adabot.lib import common_funcs
+from adabot.testing import synthetic_org
+
+# Number of submodules in the generated bundle .gitmodules.
+SUBMODULES = 10_000
+
+# Size in bytes of the generated README and Python files.
+FILE_SIZE = 100 * 1024
+
+README_FILLER = """
+Usage Example
+=============
+
+.. code-block:: python
+
+    import board
+    import adafruit_sensor
+
+    sensor = adafruit_sensor.Sensor(board.I2C())
+    print(sensor.temperature)
+
+"""
+
+MODULE_FILLER = """
+
+class Register{index}:
+    \"\"\"Register {index} of the sensor\"\"\"
+
+    def __init__(self, i2c_device):
+        self.i2c_device = i2c_device
+        self.buffer = bytearray(2)
+
+    def read(self):
+        with self.i2c_device as i2c:
+            i2c.write_then_readinto(bytes([{index} & 0xFF]), self.buffer)
+        return struct.unpack(">H", self.buffer)[0]
+"""
+
+
+@pytest.fixture(name="org", scope="session")
+def fixture_org():
+    """Synthetic organization with SUBMODULES libraries in the bundle"""
+    return synthetic_org.SyntheticOrg(SUBMODULES, arduino_fraction=0)
+
+
+@pytest.fixture(name="gitmodules", scope="session")
+def fixture_gitmodules(org):
+    """The bundle .gitmodules file of the synthetic organization"""
+    return org.files("Adafruit_CircuitPython_Bundle")[".gitmodules"]
+
+
+@pytest.fixture(name="bundle_submodules", scope="session")
+def fixture_bundle_submodules(gitmodules):
+    """The parsed bundle submodules of the synthetic organization"""
+    return common_funcs.parse_gitmodules(gitmodules)
+
+
+@pytest.fixture(name="large_readme", scope="session")
+def fixture_large_readme():
+    """A README.rst of FILE_SIZE bytes with the usual badges at the top"""
+    name = "Adafruit_CircuitPython_Sensor"
+    readme = synthetic_org.README_TEMPLATE.format(
+        name=name, slug="adafruit-circuitpython-sensor", short_name="sensor"
+    )
+    while len(readme) < FILE_SIZE:
+        readme += README_FILLER
+    return readme
+
+
+@pytest.fixture(name="large_module", scope="session")
+def fixture_large_module():
+    """A library .py file of FILE_SIZE bytes"""
+    module = synthetic_org.LIBRARY_MODULE
+    index = 0
+    while len(module) < FILE_SIZE:
+        module += MODULE_FILLER.format(index=index)
+        index += 1
+    return module
+
+
+@pytest.fixture(name="serve")
+def fixture_serve(monkeypatch):
+    """Answer every ``get()`` of `module` with the given text, without the
+    network
+    """
+
+    def serve(text, module=requests):
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = "utf-8"
+        response._content = text.encode()  # pylint: disable=protected-access
+        monkeypatch.setattr(module, "get", lambda *args, **kwargs: response)
+
+    return serve
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Microbenchmarks for 'adabot/circuitpython_library_download_stats.py'"""
+
+import datetime
+import json
+
+import pytest  # pylint: disable=unused-import
+
+from adabot import circuitpython_library_download_stats as dl_stats
+from adabot import github_requests
+
+
+def test_get_bundle_stats(benchmark, serve, bundle_submodules):
+    """Benchmark totalling the downloads of a week of releases with an asset
+    for every library in the bundle
+    """
+    today = datetime.date.today()
+    names = [variables["path"].rsplit("/", 1)[-1] for _, variables in bundle_submodules]
+    releases = [
+        {
+            "tag_name": f"{today - datetime.timedelta(days=age):%Y%m%d}",
+            "assets": [
+                {
+                    "name": f"adafruit-circuitpython-{name}-py-{today:%Y%m%d}.zip",
+                    "download_count": age,
+                }
+                for name in names
+            ],
+        }
+        for age in range(7)
+    ]
+    serve(json.dumps(releases), github_requests)
+
+    stats = benchmark(dl_stats.get_bundle_stats, "Adafruit_CircuitPython_Bundle")
+    assert len(stats) == len(names)
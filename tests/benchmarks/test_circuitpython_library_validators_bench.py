@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Microbenchmarks for 'adabot/lib/circuitpython_library_validators.py'"""
+
+import pytest
+
+from adabot.lib import circuitpython_library_validators as cirpy_lib_vals
+
+DOWNLOAD_URL = (
+    "https://raw.githubusercontent.com/adafruit/Adafruit_CircuitPython_Sensor/main/"
+)
+
+# A plain dictionary, so each call downloads the file again.
+REPO = {"name": "Adafruit_CircuitPython_Sensor"}
+
+
+@pytest.fixture(name="validator")
+def fixture_validator(bundle_submodules):
+    """Library validator for the synthetic bundle"""
+    return cirpy_lib_vals.LibraryValidator([], bundle_submodules, "3.2.6")
+
+
+# pylint: disable=protected-access
+def test_validate_readme(benchmark, validator, serve, large_readme):
+    """Benchmark validating a large README.rst"""
+    serve(large_readme)
+    errors = benchmark(validator._validate_readme, REPO, DOWNLOAD_URL + "README.rst")
+    assert not errors
+
+
+def test_validate_py_for_u_modules(benchmark, validator, serve, large_module):
+    """Benchmark checking a large .py file for MicroPython only imports"""
+    serve("import ustruct\n" + large_module)
+    errors = benchmark(
+        validator._validate_py_for_u_modules, REPO, DOWNLOAD_URL + "adafruit_sensor.py"
+    )
+    assert not errors
+
+
+def test_validate_requirements_txt(benchmark, validator, serve, bundle_submodules):
+    """Benchmark checking a long requirements.txt for Adafruit-Blinka"""
+    packages = [
+        variables["path"].rsplit("/", 1)[-1] for _, variables in bundle_submodules
+    ]
+    serve("\n".join(f"adafruit-circuitpython-{name}" for name in packages))
+    file_info = {"download_url": DOWNLOAD_URL + "requirements.txt"}
+    errors = benchmark(validator._validate_requirements_txt, REPO, file_info)
+    assert errors == [cirpy_lib_vals.ERROR_MISSING_BLINKA]
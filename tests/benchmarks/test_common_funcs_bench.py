@@ -0,0 +1,51 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Microbenchmarks for 'adabot/lib/common_funcs.py'"""
+
+import pytest  # pylint: disable=unused-import
+
+from adabot.lib import common_funcs
+
+
+def test_parse_gitmodules(benchmark, gitmodules):
+    """Benchmark parsing the bundle .gitmodules"""
+    submodules = benchmark(common_funcs.parse_gitmodules, gitmodules)
+    assert len(submodules) == gitmodules.count("[submodule ")
+
+
+def test_sanitize_url(benchmark, bundle_submodules):
+    """Benchmark sanitizing every submodule URL"""
+    urls = [variables["url"] for _, variables in bundle_submodules]
+
+    def sanitize_all():
+        return [common_funcs.sanitize_url(url) for url in urls]
+
+    sanitized = benchmark(sanitize_all)
+    assert not any(url.endswith(".git") for url in sanitized)
+
+
+def test_is_repo_in_bundle_missing(benchmark, bundle_submodules):
+    """Benchmark looking up a repository that is not in the bundle"""
+    url = "https://github.com/adafruit/Adafruit_CircuitPython_Missing.git"
+    assert not benchmark(common_funcs.is_repo_in_bundle, url, bundle_submodules)
+
+
+def test_is_repo_in_bundle_last(benchmark, bundle_submodules):
+    """Benchmark looking up the last repository in the bundle"""
+    url = bundle_submodules[-1][1]["url"].upper()
+    assert benchmark(common_funcs.is_repo_in_bundle, url, bundle_submodules)
+
+
+def test_bundle_index(benchmark, bundle_submodules):
+    """Benchmark indexing the bundle submodules"""
+    index = benchmark(common_funcs.BundleIndex, bundle_submodules)
+    assert len(index) == len(bundle_submodules)
+
+
+def test_is_repo_in_bundle_index(benchmark, bundle_submodules):
+    """Benchmark looking up the last repository in the bundle index"""
+    index = common_funcs.BundleIndex(bundle_submodules)
+    url = bundle_submodules[-1][1]["url"].upper()
+    assert benchmark(common_funcs.is_repo_in_bundle, url, index)
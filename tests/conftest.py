@@ -13,3 +13,14 @@ def pytest_addoption(parser):
         default=False,
         help="Test commands that use environment tokens",
     )
+    parser.addoption(
+        "--cassette-dir",
+        default=None,
+        help="Replay the integration tests from the cassettes in this directory",
+    )
+    parser.addoption(
+        "--record-cassettes",
+        action="store_true",
+        default=False,
+        help="Record the cassettes in --cassette-dir instead of replaying them",
+    )
@@ -0,0 +1,27 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Fixtures for the integration tests"""
+
+import os
+
+import pytest
+
+from adabot import cassette
+from adabot import github_requests
+
+
+@pytest.fixture(autouse=True)
+def use_cassette(request, pytestconfig):
+    """Record or replay each test's HTTP traffic when --cassette-dir is given"""
+    cassette_dir = pytestconfig.getoption("--cassette-dir")
+    if not cassette_dir:
+        yield None
+        return
+    mode = "record" if pytestconfig.getoption("--record-cassettes") else "replay"
+    path = os.path.join(cassette_dir, request.node.name + ".json")
+    yield cassette.install(
+        cassette.Cassette(path, mode, redact=github_requests.TOKENS.redact)
+    )
+    cassette.uninstall()
@@ -21,10 +21,17 @@ def mock_list_repos(*args, **kwargs):
     ]
 
 
+def mock_iter_repo_pages(*args, **kwargs):
+    """Function to monkeypatch `common_funcs.iter_repo_pages()` for the
+    shorter set of repos from `mock_list_repos()`."""
+    yield mock_list_repos(*args, **kwargs)
+
+
 def test_circuitpython_libraries(monkeypatch, pytestconfig):
     """Test main function of 'circuitpyton_libraries.py', without writing an output file."""
 
     monkeypatch.setattr(common_funcs, "list_repos", mock_list_repos)
+    monkeypatch.setattr(common_funcs, "iter_repo_pages", mock_iter_repo_pages)
 
     # Delete specific tests that require repository secrets
     # They can't be tested via, so let's remove them and test the others
@@ -49,6 +56,7 @@ def test_circuitpython_libraries_output_file(
     """Test main funciton of 'circuitpython_libraries.py', with writing an output file."""
 
     monkeypatch.setattr(common_funcs, "list_repos", mock_list_repos)
+    monkeypatch.setattr(common_funcs, "iter_repo_pages", mock_iter_repo_pages)
 
     # Delete specific tests that require repository secrets
     # They can't be tested via, so let's remove them and test the others
@@ -57,6 +57,12 @@ def mock_list_repos(*args, **kwargs):
     return repos
 
 
+def mock_iter_repo_pages(*args, **kwargs):
+    """Function to monkeypatch `common_funcs.iter_repo_pages()` for the
+    shorter set of repos from `mock_list_repos()`."""
+    yield mock_list_repos(*args, **kwargs)
+
+
 # pylint: disable=unused-argument
 def mock_get_contribs(*args):
     """Function to monkeypatch `update_cp_org_libraries.get_contributors()` to ensure
@@ -73,6 +79,7 @@ def test_update_cp_org_libraries(monkeypatch):
     """Test main function of 'circuitpyton_libraries.py', without writing an output file."""
 
     monkeypatch.setattr(common_funcs, "list_repos", mock_list_repos)
+    monkeypatch.setattr(common_funcs, "iter_repo_pages", mock_iter_repo_pages)
     monkeypatch.setattr(update_cp_org_libraries, "get_contributors", mock_get_contribs)
 
     update_cp_org_libraries.main(loglevel="INFO")
@@ -83,6 +90,7 @@ def test_update_cp_org_libraries_output_file(monkeypatch, tmp_path, capsys):
     """Test main funciton of 'update_cp_org_libraries.py', with writing an output file."""
 
     monkeypatch.setattr(common_funcs, "list_repos", mock_list_repos)
+    monkeypatch.setattr(common_funcs, "iter_repo_pages", mock_iter_repo_pages)
     monkeypatch.setattr(update_cp_org_libraries, "get_contributors", mock_get_contribs)
 
     tmp_output_file = tmp_path / "output_test.txt"
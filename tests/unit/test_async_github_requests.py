@@ -0,0 +1,63 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/async_github_requests.py'"""
+
+import asyncio
+import threading
+import time
+
+import pytest  # pylint: disable=unused-import
+
+from adabot import github_requests
+from adabot.async_github_requests import AsyncGitHub
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
+
+
+def test_get_many_bounded(monkeypatch):
+    """Test that 'get_many' keeps order and respects the concurrency limit."""
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def mock_request(method, url, **kwargs):
+        """Mock 'github_requests.request()' for testing"""
+        with lock:
+            in_flight.append(url)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(url)
+        return (method, url, kwargs)
+
+    monkeypatch.setattr(github_requests, "request", mock_request)
+
+    async def fetch(urls):
+        async with AsyncGitHub(concurrency=3) as gh:
+            return await gh.get_many(urls, params={"per_page": 100})
+
+    urls = [f"/repos/adafruit/repo{i}" for i in range(12)]
+    results = asyncio.run(fetch(urls))
+
+    assert [result[1] for result in results] == urls
+    assert all(result[0] == "get" for result in results)
+    assert max(peak) <= 3
+
+
+def test_repo_pages():
+    """Test that the repositories are yielded a page at a time."""
+
+    async def collect():
+        async with AsyncGitHub(concurrency=2) as client:
+            return [
+                page
+                async for page in client.repo_pages(include_repos=("Adafruit_Blinka",))
+            ]
+
+    with FakeHub(SyntheticOrg(250, seed=5, arduino_fraction=0)):
+        pages = asyncio.run(collect())
+    assert len(pages) == 3
+    names = [repo["name"] for page in pages for repo in page]
+    assert len(names) == len(set(names)) == 250 + 3
+    assert "Adafruit_Blinka" in names
@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/testing/benchmark.py'"""
+
+import pytest  # pylint: disable=unused-import
+
+from adabot.testing import benchmark
+
+
+def _result(wall_seconds, requests, error=None):
+    """Utility to build a single benchmark result."""
+    return {
+        "pipeline": "download_stats",
+        "repos": 20,
+        "wall_seconds": wall_seconds,
+        "requests": requests,
+        "peak_rss_mb": 70.0,
+        "error": error,
+    }
+
+
+def test_compare():
+    """Test that only increases beyond the threshold are regressions."""
+    baseline = {"results": [_result(1.0, 100)]}
+    assert not benchmark.compare({"results": [_result(1.1, 100)]}, baseline)
+    regressions = benchmark.compare({"results": [_result(1.1, 130)]}, baseline)
+    assert regressions == ["download_stats (20 repos): requests 100 -> 130"]
+    assert benchmark.compare({"results": [_result(1.0, 100, "boom")]}, baseline)
+
+
+def test_run_suite():
+    """Test a pipeline run against the fake hub."""
+    results = benchmark.run_suite(["download_stats"], [20])
+    assert len(results["results"]) == 1
+    result = results["results"][0]
+    assert result["error"] is None
+    assert result["requests"] > 20
+    assert result["requests_per_repo"] == round(result["requests"] / 20, 2)
+    assert result["peak_rss_mb"] > 0
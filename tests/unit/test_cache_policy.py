@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/cache_policy.py'"""
+
+import datetime
+
+import pytest  # pylint: disable=unused-import
+import requests
+from requests.adapters import BaseAdapter
+
+from adabot import cache_policy
+from adabot.cache_policy import CachePolicy, CacheStats
+from adabot.http_cache import CompactCache
+
+
+class CountingAdapter(BaseAdapter):
+    """Transport adapter answering every request with an empty JSON list"""
+
+    def __init__(self):
+        super().__init__()
+        self.sent = 0
+
+    def send(
+        self, request, **kwargs
+    ):  # pylint: disable=arguments-differ,unused-argument
+        """Build the response without touching the network"""
+        self.sent += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"  # pylint: disable=protected-access
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        """Nothing to close"""
+
+
+def test_expire_after_first_match():
+    """Test that the first matching pattern decides the TTL"""
+    policy = CachePolicy(default=7200)
+    assert policy.expire_after(
+        "https://api.github.com/repos/adafruit/circuitpython/issues?state=open"
+    ) == datetime.timedelta(minutes=10)
+    assert (
+        policy.expire_after(
+            "https://api.github.com/repos/adafruit/circuitpython/git/blobs/abc"
+        )
+        is None
+    )
+    assert policy.expire_after("https://api.github.com/user") == datetime.timedelta(
+        hours=2
+    )
+
+
+def test_policy_session_stats(tmp_path):
+    """Test that responses expire per pattern and are counted"""
+    stats = CacheStats()
+    session_class = cache_policy.session_factory(
+        CachePolicy([("/issues", 0), ("/contents/", 3600)]), stats
+    )
+    session = session_class(backend=CompactCache(str(tmp_path / "cache.sqlite")))
+    adapter = CountingAdapter()
+    session.mount("https://", adapter)
+
+    for _ in range(2):
+        session.get("https://api.github.com/repos/adafruit/lib/contents/README.rst")
+        session.get("https://api.github.com/repos/adafruit/lib/issues")
+
+    assert adapter.sent == 3
+    summary = stats.summary(session.cache)
+    assert summary["hits"] == 1
+    assert summary["misses"] == 3
+    assert summary["stale"] == 1
+    assert summary["entries"] == 2
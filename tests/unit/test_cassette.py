@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/cassette.py'"""
+
+import http.server
+import threading
+
+import pytest
+import requests
+
+from adabot import cassette
+from adabot.github_auth import TokenPool
+
+
+@pytest.fixture(name="counting_server")
+def fixture_counting_server():
+    """Local server answering each request with how many it has seen"""
+    seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        """Replies with the request count and the X-Echo header"""
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Handle a GET request"""
+            seen.append(self.path)
+            echo = self.headers.get("X-Echo", "")
+            body = f'{{"path": "{self.path}", "count": {len(seen)}, "echo": "{echo}"}}'
+            body = body.encode()
+            self.send_response(200 if self.path != "/missing" else 404)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("X-RateLimit-Remaining", "0")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """Handle a GitHub App installation token request"""
+            seen.append(self.path)
+            body = (
+                b'{"token": "ghs_installation", "expires_at": "2030-01-01T00:00:00Z"}'
+            )
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Keep the test output quiet"""
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.seen = seen
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    cassette.uninstall()
+
+
+def test_record_and_replay(counting_server, tmp_path):
+    """Test that recorded responses are replayed in order without the network"""
+    path = tmp_path / "cassette.json"
+    cassette.install(cassette.Cassette(path, "record"))
+    for _ in range(2):
+        requests.get(counting_server.url + "/repos", timeout=5)
+    requests.get(counting_server.url + "/missing", timeout=5)
+    cassette.uninstall()
+    assert len(counting_server.seen) == 3
+
+    replay = cassette.install(cassette.Cassette(path))
+    assert len(replay) == 3
+    first = requests.get(counting_server.url + "/repos", timeout=5)
+    second = requests.get(counting_server.url + "/repos", timeout=5)
+    third = requests.get(counting_server.url + "/repos", timeout=5)
+    assert first.json()["count"] == 1
+    assert second.json()["count"] == 2
+    assert third.json()["count"] == 2
+    assert "X-RateLimit-Remaining" not in first.headers
+    assert requests.get(counting_server.url + "/missing", timeout=5).status_code == 404
+    assert len(counting_server.seen) == 3
+
+    with pytest.raises(cassette.CassetteMiss):
+        requests.get(counting_server.url + "/other", timeout=5)
+
+
+def test_request_key_body():
+    """Test that requests with different bodies are told apart"""
+    url = "https://api.github.com/graphql"
+    assert cassette.request_key("post", url, "{}") == cassette.request_key(
+        "POST", url, b"{}"
+    )
+    assert cassette.request_key("POST", url, "{}") != cassette.request_key(
+        "POST", url, "[]"
+    )
+
+
+def test_tokens_kept_out(counting_server, tmp_path):
+    """Test that access tokens are not written to the cassette"""
+    path = tmp_path / "cassette.json"
+    pool = TokenPool(["ghp_pooled"])
+    cassette.install(cassette.Cassette(path, "record", redact=pool.redact))
+    token_url = counting_server.url + "/app/installations/1/access_tokens"
+    assert requests.post(token_url, timeout=5).json()["token"] == "ghs_installation"
+    requests.get(
+        counting_server.url + "/user", headers={"X-Echo": "ghp_pooled"}, timeout=5
+    )
+    cassette.uninstall()
+
+    text = path.read_text(encoding="utf-8")
+    assert "ghs_installation" not in text
+    assert "ghp_pooled" not in text
+    cassette.install(cassette.Cassette(path))
+    assert requests.post(token_url, timeout=5).json()["token"] == cassette.REDACTED
@@ -0,0 +1,136 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/lib/circuitpython_library_validators.py'"""
+
+import subprocess
+
+import pytest
+
+from adabot.lib import common_funcs
+from adabot.lib import circuitpython_library_validators as cirpy_lib_vals
+from adabot.lib.circuitpython_library_validators import LibraryValidator, needs
+from adabot.metrics import METRICS
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
+
+
+def test_plan_fetches():
+    """Test that the data the validators need is planned"""
+    assert LibraryValidator.plan_fetches([]) == set()
+    assert LibraryValidator.plan_fetches([LibraryValidator.validate_labels]) == {
+        "labels",
+        "metadata",
+    }
+    assert LibraryValidator.plan_fetches([LibraryValidator.validate_readthedocs]) == {
+        "readme",
+        "contents",
+        "rtd_subprojects",
+    }
+    with pytest.raises(ValueError):
+        needs("everything")
+
+
+def test_single_validator_fetches_only_its_data():
+    """Test that a single validator run only fetches what it needs"""
+    with FakeHub(SyntheticOrg(150, seed=5)) as hub:
+        validator = LibraryValidator(
+            [LibraryValidator.validate_default_branch], [], "2.0.1"
+        )
+        for repo in validator.prefetched_repos(common_funcs.iter_repo_pages()):
+            assert not validator.run_repo_validation(repo)
+        # The organization listing and the GraphQL metadata, nothing else
+        assert set(hub.requests) == {"GET api.github.com", "POST api.github.com"}
+        assert hub.requests["GET api.github.com"] == 2
+
+    with FakeHub(SyntheticOrg(20, seed=5)) as hub:
+        validator = LibraryValidator([LibraryValidator.validate_contents], [], "2.0.1")
+        repos = list(validator.prefetched_repos(common_funcs.iter_repo_pages()))
+        prefetched = dict(hub.requests)
+        assert "POST api.github.com" not in prefetched
+        for repo in repos:
+            if repo["name"].startswith("Adafruit_CircuitPython_Sensor"):
+                assert repo.file_text("README.rst")
+        assert hub.requests == prefetched
+
+
+def test_prefetch_requests_have_a_caller():
+    """Test that the prefetched requests are counted under the data they fetch"""
+    METRICS.reset()
+    try:
+        with FakeHub(SyntheticOrg(20, seed=5)):
+            validator = LibraryValidator(
+                [LibraryValidator.validate_contents], [], "2.0.1"
+            )
+            repos = list(validator.prefetched_repos(common_funcs.iter_repo_pages()))
+            listed = METRICS.as_dict()["callers"].pop("(none)")
+            for repo in repos:
+                validator.run_repo_validation(repo)
+        callers = METRICS.as_dict()["callers"]
+    finally:
+        METRICS.reset()
+    assert callers["(none)"] == listed
+    assert "contents" in callers
+
+
+class PackageOrg(SyntheticOrg):  # pylint: disable=too-few-public-methods
+    """Synthetic organization whose libraries are packages, with example
+    assets in a subfolder named after the library
+    """
+
+    def files(self, name):
+        """Return the files of the repo `name`, with the library's module
+        moved into a package
+        """
+        files = super().files(name)
+        if self.kind(name) != "lib":
+            return files
+        short_name = name[len("Adafruit_CircuitPython_") :].lower()
+        files = dict(files)
+        del files[f"adafruit_{short_name}.py"]
+        files[f"adafruit_{short_name}/__init__.py"] = "import ustruct\n"
+        files[f"examples/{short_name}_assets/helper.py"] = "import board\n"
+        return files
+
+
+def test_validate_contents_reads_the_tree():
+    """Test that the examples and package checks read the file tree, and that
+    the package check only runs when asked for
+    """
+    with FakeHub(PackageOrg(5, seed=6)) as hub:
+        name = next(name for name in hub.org.repos if hub.org.kind(name) == "lib")
+        validator = LibraryValidator([LibraryValidator.validate_contents], [], "2.0.1")
+        assert not validator.run_repo_validation(hub.org.repos[name])
+        validator = LibraryValidator(
+            [LibraryValidator.validate_contents], [], "2.0.1", check_package_dirs=True
+        )
+        errors = validator.run_repo_validation(hub.org.repos[name])
+    assert errors == [cirpy_lib_vals.ERROR_PYFILE_MISSING_STRUCT]
+
+
+def test_local_bundle_reads_checkouts(tmp_path):
+    """Test that the library files are read from a local bundle checkout"""
+    with FakeHub(SyntheticOrg(5, seed=6)) as hub:
+        name = next(name for name in hub.org.repos if hub.org.kind(name) == "lib")
+        repo = hub.org.repos[name]
+        checkout = tmp_path / "libraries" / "drivers" / "sensor"
+        for path, text in hub.org.files(name).items():
+            (checkout / path).parent.mkdir(parents=True, exist_ok=True)
+            (checkout / path).write_text(text, encoding="utf-8")
+        git = ["git", "-c", "user.name=adabot", "-c", "user.email=adabot@localhost"]
+        for command in (["init", "-q"], ["add", "."], ["commit", "-q", "-m", "Add"]):
+            subprocess.run(git + command, cwd=checkout, check=True)
+        submodules = [
+            ("sensor", {"path": "libraries/drivers/sensor", "url": repo["clone_url"]})
+        ]
+        validators = [LibraryValidator.validate_contents]
+        expected = LibraryValidator(
+            validators, submodules, "2.0.1"
+        ).run_repo_validation(repo)
+
+        validator = LibraryValidator(
+            validators, submodules, "2.0.1", local_bundle=str(tmp_path)
+        )
+        before = dict(hub.requests)
+        assert validator.run_repo_validation(repo) == expected
+        assert hub.requests == before
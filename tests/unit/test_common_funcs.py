@@ -5,13 +5,18 @@
 """Unit tests for 'adabot/lib/common_funcs.py'"""
 
 import datetime
+import json as json_module
 import re
+import threading
+import time
 
 import pytest  # pylint: disable=unused-import
 import requests
 
 from adabot.lib import common_funcs
+from adabot.lib.circuitpython_library_validators import LibraryValidator
 from adabot import github_requests
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
 
 
 def test_list_repos():
@@ -134,3 +139,230 @@ def test_is_new_or_updated(monkeypatch, repos):
     monkeypatch.setattr(github_requests, "get", mock_github_get)
 
     assert repos["expects"] == common_funcs.is_new_or_updated(repos)
+
+
+def graphql_repo_node(name, published_at):
+    """Utility to return a GraphQL repository node"""
+    return {
+        "nameWithOwner": f"adafruit/{name}",
+        "description": "A library",
+        "hasWikiEnabled": False,
+        "isArchived": False,
+        "url": f"https://github.com/adafruit/{name}",
+        "licenseInfo": {"key": "mit", "name": "MIT License", "spdxId": "MIT"},
+        "squashMergeAllowed": False,
+        "rebaseMergeAllowed": False,
+        "mergeCommitAllowed": True,
+        "viewerPermission": "WRITE",
+        "defaultBranchRef": {
+            "name": "main",
+            "target": {
+                "checkSuites": {
+                    "nodes": [
+                        {
+                            "conclusion": "FAILURE",
+                            "workflowRun": {
+                                "workflow": {
+                                    "resourcePath": f"/adafruit/{name}/actions/"
+                                    "workflows/build.yml"
+                                }
+                            },
+                        }
+                    ]
+                }
+            },
+        },
+        "latestRelease": {"tagName": "1.0.0", "publishedAt": published_at},
+        "releases": {"totalCount": 1, "nodes": [{"publishedAt": published_at}]},
+        "labels": {"totalCount": 1, "nodes": [{"name": "bug"}]},
+    }
+
+
+# pylint: disable=protected-access
+def test_fetch_repo_metadata(monkeypatch):
+    """Test 'fetch_repo_metadata' batches repos into GraphQL queries"""
+    queries = []
+
+    def mock_github_post(url, json):
+        """Mock 'github_requests.post()' for testing"""
+        assert url == "/graphql"
+        queries.append(json["variables"])
+        nodes = {
+            f"repo{index}": graphql_repo_node(json["variables"][key], published_date())
+            for index, key in enumerate(
+                key for key in json["variables"] if key.startswith("name")
+            )
+        }
+        result = requests.Response()
+        result.status_code = 200
+        result._content = json_module.dumps({"data": nodes}).encode()
+        return result
+
+    monkeypatch.setattr(github_requests, "post", mock_github_post)
+
+    repos = [{"owner": {"login": "adafruit"}, "name": f"lib_{i}"} for i in range(5)]
+    metadata = common_funcs.fetch_repo_metadata(repos, batch_size=2)
+
+    assert len(queries) == 3
+    assert sorted(metadata) == sorted(f"adafruit/lib_{i}" for i in range(5))
+    record = metadata["adafruit/lib_0"]
+    assert record["permissions"]["push"]
+    assert record["license"]["spdx_id"] == "MIT"
+    assert record["latest_release"]["tag_name"] == "1.0.0"
+    assert record["labels"] == ["bug"]
+    assert record["build_conclusion"] == "failure"
+
+    monkeypatch.setattr(common_funcs, "REPO_METADATA", metadata)
+    assert common_funcs.is_new_or_updated({"full_name": "adafruit/lib_0"}) == "new"
+
+    # A new prerelease on top of an old latest release is not an update
+    record = metadata["adafruit/lib_1"]
+    record["latest_release"]["published_at"] = "2020-01-01T00:00:00Z"
+    record["release_dates"].append("2020-01-01T00:00:00Z")
+    record["release_count"] = 2
+    assert common_funcs.is_new_or_updated({"full_name": "adafruit/lib_1"}) is None
+
+
+def test_build_conclusion_is_the_newest_run():
+    """Test that only the newest build.yml check suite gives the conclusion"""
+    node = graphql_repo_node("lib", published_date())
+    suites = node["defaultBranchRef"]["target"]["checkSuites"]["nodes"]
+    build = suites[0]["workflowRun"]
+    other = {"workflow": {"resourcePath": "/adafruit/lib/actions/workflows/x.yml"}}
+    suites.append({"conclusion": "SUCCESS", "workflowRun": build})
+    suites.append({"conclusion": "FAILURE", "workflowRun": other})
+    record = common_funcs._repo_metadata_record(node)
+    assert record["build_conclusion"] == "success"
+
+    # Still running
+    suites.append({"conclusion": None, "workflowRun": build})
+    record = common_funcs._repo_metadata_record(node)
+    assert record["build_conclusion"] == common_funcs.BUILD_CONCLUSION_UNKNOWN
+
+    del suites[:]
+    record = common_funcs._repo_metadata_record(node)
+    assert record["build_conclusion"] == common_funcs.BUILD_CONCLUSION_UNKNOWN
+
+
+def test_list_repos_order():
+    """Test that repos sort like 'list_repos': the libraries and core least
+    recently updated first, then the other included repos as given
+    """
+    repos = [
+        {"name": "CircuitPython_Community_Bundle", "updated_at": "2020-01-01"},
+        {"name": "Adafruit_CircuitPython_B", "updated_at": "2024-01-01"},
+        {"name": "Adafruit_Blinka", "updated_at": "2019-01-01"},
+        {"name": "circuitpython", "updated_at": "2023-01-01"},
+        {"name": "Adafruit_CircuitPython_A", "updated_at": "2025-01-01"},
+    ]
+    key = common_funcs.list_repos_order(
+        ("Adafruit_Blinka", "CircuitPython_Community_Bundle")
+    )
+    assert [repo["name"] for repo in sorted(repos, key=key)] == [
+        "circuitpython",
+        "Adafruit_CircuitPython_B",
+        "Adafruit_CircuitPython_A",
+        "Adafruit_Blinka",
+        "CircuitPython_Community_Bundle",
+    ]
+
+
+GITMODULES = """[submodule "libraries/drivers/bme280"]
+	path = libraries/drivers/bme280
+	url = https://github.com/adafruit/Adafruit_CircuitPython_BME280.git
+[submodule "libraries/helpers/register"]
+	path = libraries/helpers/register
+	url = https://github.com/adafruit/Adafruit_CircuitPython_Register.git
+[submodule "circuitpython-build-tools"]
+	path = circuitpython-build-tools
+	url = https://github.com/adafruit/circuitpython-build-tools.git
+"""
+
+
+def test_bundle_index():
+    """Test that 'BundleIndex' answers like 'is_repo_in_bundle'"""
+    submodules = common_funcs.parse_gitmodules(GITMODULES)
+    index = common_funcs.BundleIndex(submodules)
+
+    assert list(index) == submodules
+    assert len(index) == 3
+    for url in (
+        "https://github.com/adafruit/Adafruit_CircuitPython_BME280.git",
+        "git://github.com/Adafruit/Adafruit_CircuitPython_Register",
+        "https://github.com/adafruit/circuitpython-build-tools.git",
+        "https://github.com/adafruit/Adafruit_CircuitPython_Missing.git",
+    ):
+        assert common_funcs.is_repo_in_bundle(
+            url, index
+        ) == common_funcs.is_repo_in_bundle(url, submodules)
+    url = "https://github.com/adafruit/Adafruit_CircuitPython_Register.git"
+    assert index.path(url) == "libraries/helpers/register"
+    assert index.category(url) == "helpers"
+    assert index.category(url.replace("Register", "BME280")) == "drivers"
+    assert index.category(url.replace("Register", "Missing")) is None
+    assert index.find_path("circuitpython-build-tools") == submodules[2]
+
+
+def test_list_org_repos(monkeypatch, tmp_path):
+    """Test that the stored organization listing is refreshed incrementally"""
+    monkeypatch.setattr(github_requests, "CACHE_DIR", str(tmp_path))
+    org = SyntheticOrg(250, seed=4)
+    with FakeHub(org) as hub:
+        repos = common_funcs.list_org_repos()
+        assert sorted(repo["name"] for repo in repos) == sorted(org.repos)
+        assert hub.requests["GET api.github.com"] == 3
+
+        name = next(name for name in org.repos if org.kind(name) == "lib")
+        org.repos[name] = dict(
+            org.repos[name], pushed_at=org._days_ago(-1), archived=True
+        )
+        listed = {repo["name"]: repo for repo in common_funcs.list_org_repos()}
+        assert len(listed) == len(org.repos)
+        assert listed[name]["archived"]
+        assert hub.requests["GET api.github.com"] == 5
+        assert name not in [repo["name"] for repo in common_funcs.list_repos()]
+
+
+def test_map_in_order():
+    """Test that checks run at once keep their results and output in order"""
+    validator = LibraryValidator([], [], "2.0.1")
+    threads = set()
+
+    def check(repo):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01 * (repo % 3))
+        validator.output_file_data.append(f"output of {repo}")
+        return [repo]
+
+    results = list(
+        common_funcs.map_in_order(
+            lambda repo: validator.run_captured(check, repo), iter(range(20)), jobs=4
+        )
+    )
+    assert [result.errors for result in results] == [[repo] for repo in range(20)]
+    assert [result.output for result in results] == [
+        [f"output of {repo}"] for repo in range(20)
+    ]
+    assert len(threads) > 1
+    assert not validator.output_file_data
+
+    assert list(common_funcs.map_in_order(str, range(3))) == ["0", "1", "2"]
+
+
+def test_insight_data_merge():
+    """Test that the insights gathered for each repo add up"""
+    total, first, second = (common_funcs.InsightData() for _ in range(3))
+    total["milestones"] = {"9.0.0": 3}
+    first["new_prs"] = 2
+    first["open_prs"].append("first")
+    first["pr_authors"].add("alice")
+    second["new_prs"] = 1
+    second["open_prs"].append("second")
+    second["pr_authors"].add("alice")
+    second["milestones"] = {"10.0.0": 1}
+    total.merge(first)
+    total.merge(second)
+    assert total["new_prs"] == 3
+    assert total["open_prs"] == ["first", "second"]
+    assert total["pr_authors"] == {"alice"}
+    assert total["milestones"] == {"9.0.0": 3, "10.0.0": 1}
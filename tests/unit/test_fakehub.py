@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/testing/fakehub.py'"""
+
+import pytest
+import requests
+
+from adabot import github_requests
+from adabot import pypi_requests
+from adabot.lib import common_funcs
+from adabot.testing import synthetic_org
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
+
+
+@pytest.fixture(name="hub", scope="module")
+def fixture_hub():
+    """Fake hub serving a small synthetic organization"""
+    with FakeHub(SyntheticOrg(250, seed=1), rate_limits={"search": 1000}) as hub:
+        yield hub
+
+
+def test_synthetic_org_is_deterministic():
+    """Test that the same size and seed generate the same organization"""
+    first, second = SyntheticOrg(50, seed=3), SyntheticOrg(50, seed=3)
+    assert list(first.repos) == list(second.repos)
+    name = next(name for name in first.repos if first.kind(name) == "lib")
+    assert first.files(name) == second.files(name)
+    assert len(first.repos) == 50 + 3 + len(synthetic_org.EXTRA_REPOS)
+
+
+def test_list_repos(hub):
+    """Test that the organization listing is paginated and rate limited"""
+    repos = common_funcs.list_repos()
+    libraries = [
+        name for name in hub.org.repos if name.startswith("Adafruit_CircuitPython")
+    ]
+    assert len(repos) == len(libraries) + 1
+    response = github_requests.get("/user")
+    assert response.json()["login"] == "adabot"
+    assert int(response.headers["X-RateLimit-Remaining"]) < 5000
+
+
+def test_contents_and_raw(hub):
+    """Test that directory listings link to the raw file contents"""
+    name = next(name for name in hub.org.repos if hub.org.kind(name) == "lib")
+    listing = github_requests.get(f"/repos/adafruit/{name}/contents/").json()
+    files = {entry["name"]: entry for entry in listing}
+    assert files["examples"]["type"] == "dir"
+    readme = requests.get(files["README.rst"]["download_url"], timeout=5)
+    assert ":alt: Discord" in readme.text
+    assert readme.url.startswith("https://raw.githubusercontent.com/")
+    assert pypi_requests.get(f"/pypi/{name}/json").ok
+    assert not pypi_requests.get("/pypi/not-a-library/json").ok
+
+
+def test_graphql_metadata(hub):
+    """Test that the GraphQL repository lookups are answered"""
+    repos = [repo for repo in hub.org.repos.values() if repo["name"] != "circuitpython"]
+    metadata = common_funcs.fetch_repo_metadata(repos[:5])
+    assert set(metadata) == {repo["full_name"] for repo in repos[:5]}
+    record = metadata[repos[3]["full_name"]]
+    assert record["build_conclusion"] in ("success", "failure")
+    assert record["default_branch"] == "main"
+
+
+def test_rate_limit_exceeded():
+    """Test that requests over the rate limit are rejected"""
+    with FakeHub(SyntheticOrg(5), rate_limits={"core": 2}) as hub:
+        statuses = [
+            requests.get(hub.url + "/repos/adafruit/circuitpython", timeout=5)
+            for _ in range(3)
+        ]
+    assert [response.status_code for response in statuses] == [200, 200, 403]
+    assert statuses[2].headers["X-RateLimit-Remaining"] == "0"
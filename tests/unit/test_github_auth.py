@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/github_auth.py'"""
+
+import http.server
+import json
+import threading
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from adabot import github_auth
+from adabot.github_auth import TokenPool
+
+
+def test_from_environ(monkeypatch):
+    """Test that tokens are read from both variables without duplicates"""
+    monkeypatch.setenv("ADABOT_GITHUB_ACCESS_TOKEN", "one")
+    monkeypatch.setenv("ADABOT_GITHUB_ACCESS_TOKENS", "two, one,three")
+    assert TokenPool.from_environ().tokens == ["one", "two", "three"]
+
+
+def _report(pool, token, remaining, reset_in):
+    """Feed the pool the rate limit headers of a response sent with `token`"""
+    auth_header = pool._basic_auth(token)  # pylint: disable=protected-access
+    pool.update(
+        auth_header,
+        {
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+        },
+    )
+
+
+def test_select_most_budget():
+    """Test that requests are routed to the token with the most budget left"""
+    pool = TokenPool(["one", "two"])
+    _report(pool, "one", 10, 600)
+    assert pool.select() == "two"
+    _report(pool, "two", 5, 600)
+    assert pool.select() == "one"
+    assert pool.select("search") == "one"
+
+
+def test_reset_token_is_full():
+    """Test that a token whose rate limit has reset is used again"""
+    pool = TokenPool(["one", "two"])
+    _report(pool, "one", 0, -1)
+    _report(pool, "two", 4000, 600)
+    assert pool.select() == "one"
+
+
+def test_update_unknown_header():
+    """Test that responses to requests outside the pool are ignored"""
+    pool = TokenPool(["one"])
+    assert not pool.update("Basic other", {"X-RateLimit-Remaining": "0"})
+    assert pool.redact("token one leaked") == "token [secure] leaked"
+
+
+@pytest.fixture(name="token_server")
+def fixture_token_server():
+    """Local stand-in for the GitHub installation token endpoint"""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    issued = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        """Mints a new installation token for every valid app JWT"""
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """Handle the access token request"""
+            encoded = self.headers["Authorization"].removeprefix("Bearer ")
+            claims = jwt.decode(encoded, private_key.public_key(), algorithms=["RS256"])
+            assert self.path == "/app/installations/7/access_tokens"
+            issued.append(claims["iss"])
+            expires_at = time.gmtime(time.time() + server.lifetime)
+            body = json.dumps(
+                {
+                    "token": f"ghs_{len(issued)}",
+                    "expires_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", expires_at),
+                }
+            ).encode()
+            self.send_response(201)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """Keep the test output quiet"""
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.lifetime = 3600
+    server.issued = issued
+    server.app = github_auth.AppInstallationToken(
+        "42",
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+        "7",
+        base_url=f"http://127.0.0.1:{server.server_port}",
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_app_token_cached(token_server):
+    """Test that the installation token is reused until it nears expiry"""
+    app = token_server.app
+    assert app.token() == "ghs_1"
+    assert app.token() == "ghs_1"
+    assert token_server.issued == ["42"]
+    pool = TokenPool([], app=app)
+    assert pool.auth_header() == "token ghs_1"
+    assert pool.redact("ghs_1") == "[secure]"
+
+
+def test_app_token_refreshed(token_server):
+    """Test that a token about to expire is replaced before it is used"""
+    token_server.lifetime = github_auth.TOKEN_REFRESH_MARGIN - 30
+    app = token_server.app
+    assert app.token() == "ghs_1"
+    assert app.token() == "ghs_2"
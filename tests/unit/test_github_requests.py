@@ -6,9 +6,15 @@
 
 # pylint: disable=protected-access
 
-import pytest  # pylint: disable=unused-import
+import pytest
+import requests
+import requests_cache
 
 from adabot import github_requests
+from adabot import rate_limit
+from adabot.github_auth import TokenPool
+from adabot.http_cache import ConditionalCache
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
 
 
 def test_fix_url():
@@ -23,3 +29,213 @@ def test_fix_kwargs():
 
     assert "headers" in dummy_kwargs
     assert "Accept" in dummy_kwargs["headers"]
+
+
+@pytest.fixture(name="fresh_session")
+def fixture_fresh_session(monkeypatch):
+    """Start without a shared session, and put the module's one back after."""
+    monkeypatch.setattr(github_requests, "_session", None)
+    monkeypatch.setattr(
+        github_requests, "_session_pool_size", github_requests.POOL_SIZE
+    )
+    yield
+    github_requests.get_session().close()
+
+
+def test_get_session_is_shared(fresh_session):  # pylint: disable=unused-argument
+    """Test that requests share one pooled session until it is set up again."""
+    session = github_requests.get_session()
+    assert github_requests.get_session() is session
+
+    new_session = github_requests.setup_session(pool_size=4, max_retries=1)
+    assert new_session is not session
+    assert github_requests.get_session() is new_session
+    adapter = new_session.get_adapter("https://api.github.com")
+    assert adapter.max_retries.total == 1
+
+
+def test_ensure_pool_size_keeps_old_session(
+    fresh_session, monkeypatch
+):  # pylint: disable=unused-argument
+    """Test that growing the pool leaves the old session open for requests
+    already in flight on it."""
+    session = github_requests.get_session()
+    closed = []
+    monkeypatch.setattr(session, "close", lambda: closed.append(session))
+
+    github_requests.ensure_pool_size(github_requests.POOL_SIZE)
+    assert github_requests.get_session() is session
+
+    github_requests.ensure_pool_size(github_requests.POOL_SIZE * 2)
+    new_session = github_requests.get_session()
+    assert new_session is not session
+    adapter = new_session.get_adapter("https://api.github.com")
+    assert adapter._pool_maxsize == github_requests.POOL_SIZE * 2
+    assert not closed
+
+
+def make_response(content):
+    """Utility to build a GitHubResponse with the given body."""
+    response = github_requests.GitHubResponse()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = content
+    return response
+
+
+def test_json_decoded_once():
+    """Test that the JSON body is decoded once and then reused."""
+    response = make_response(b'{"name": "adabot"}')
+    data = response.json()
+    assert data == {"name": "adabot"}
+    assert response.json() is data
+
+
+def test_json_decode_error():
+    """Test that a body that is not JSON is logged and returns an empty dict."""
+    assert make_response(b"<html>").json() == {}
+
+
+class FakeSession:  # pylint: disable=too-few-public-methods
+    """Session that answers with the queued responses and records the
+    headers of each request.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    @property
+    def auth_headers(self):
+        """The ``Authorization`` header of each request"""
+        return [headers.get("Authorization") for headers in self.headers]
+
+    def request(self, method, url, **kwargs):  # pylint: disable=unused-argument
+        """Mock 'requests.Session.request()'"""
+        self.headers.append(dict(kwargs["headers"]))
+        return self.responses.pop(0)
+
+
+def make_status_response(status_code, headers, content=b"{}"):
+    """Utility to build a response with the given status and headers."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    response.encoding = "utf-8"
+    response._content = content
+    return response
+
+
+@pytest.mark.parametrize(
+    "rejection",
+    [
+        make_status_response(
+            403, {}, b'{"message": "You have exceeded a secondary rate limit"}'
+        ),
+        make_status_response(429, {"Retry-After": "5"}),
+    ],
+)
+def test_rate_limit_retried_with_another_token(monkeypatch, rejection):
+    """Test that a rate limit rejection blocks the scheduler and is retried
+    with another token of the pool."""
+    rejection.headers.update(
+        {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "9999999999"}
+    )
+    session = FakeSession(
+        [rejection, make_status_response(200, {"X-RateLimit-Remaining": "4999"})]
+    )
+    scheduler = rate_limit.RateLimitScheduler()
+    monkeypatch.setattr(github_requests, "TOKENS", TokenPool(["one", "two"]))
+    monkeypatch.setattr(github_requests, "SCHEDULER", scheduler)
+    monkeypatch.setattr(github_requests, "get_session", lambda: session)
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+
+    response = github_requests.get("/repos/adafruit/adabot")
+    assert response.status_code == 200
+    assert len(set(session.auth_headers)) == 2
+    assert scheduler._bucket("core").blocked_until > 0
+
+
+def test_each_token_paced_by_its_budget(monkeypatch):
+    """Test that the rate limit headers of a response pace the token it was
+    sent with, and the next request goes out with the other token
+    """
+    session = FakeSession(
+        [
+            make_status_response(
+                200,
+                {
+                    "X-RateLimit-Limit": "5000",
+                    "X-RateLimit-Remaining": "100",
+                    "X-RateLimit-Reset": "9999999999",
+                },
+            ),
+            make_status_response(200, {}),
+        ]
+    )
+    scheduler = rate_limit.RateLimitScheduler()
+    tokens = TokenPool(["one", "two"])
+    monkeypatch.setattr(github_requests, "TOKENS", tokens)
+    monkeypatch.setattr(github_requests, "SCHEDULER", scheduler)
+    monkeypatch.setattr(github_requests, "get_session", lambda: session)
+
+    github_requests.get("/repos/adafruit/adabot")
+    github_requests.get("/repos/adafruit/adabot")
+    first, second = session.auth_headers
+    assert first != second
+    assert scheduler._bucket("core", first).rate is not None
+    assert scheduler._bucket("core", second).rate is None
+
+
+def test_free_requests_skip_the_scheduler(monkeypatch):
+    """Test that cached responses do not wait for the rate limit scheduler,
+    and that 304 responses give their token back
+    """
+    acquired = []
+    refunded = []
+    scheduler = rate_limit.RateLimitScheduler()
+    monkeypatch.setattr(
+        scheduler, "acquire", lambda resource, credential: acquired.append(resource)
+    )
+    monkeypatch.setattr(
+        scheduler, "refund", lambda resource, credential: refunded.append(resource)
+    )
+    monkeypatch.setattr(github_requests, "SCHEDULER", scheduler)
+
+    session = requests_cache.CachedSession(backend="memory")
+    session.mount("https://api.github.com/", github_requests._ScheduledAdapter())
+    with FakeHub(SyntheticOrg(5, seed=1)) as hub:
+        url = f"https://api.github.com/repos/adafruit/{next(iter(hub.org.repos))}"
+        session.get(url)
+        assert session.get(url).from_cache
+    assert acquired == ["core"]
+
+    session = FakeSession([make_status_response(304, {}, b"")])
+    monkeypatch.setattr(github_requests, "get_session", lambda: session)
+    github_requests.get("/repos/adafruit/adabot")
+    assert refunded == ["core"]
+
+
+def test_not_modified_without_stored_response(monkeypatch, tmp_path):
+    """Test that a 304 for a response no longer stored is sent again without
+    the validators, instead of being returned
+    """
+    cache = ConditionalCache(str(tmp_path / "etags.sqlite"))
+    # The stored response was evicted after its validators were looked up.
+    monkeypatch.setattr(
+        cache, "conditional_headers", lambda key: {"If-None-Match": '"abc"'}
+    )
+    session = FakeSession(
+        [
+            make_status_response(304, {}, b""),
+            make_status_response(200, {"ETag": '"def"'}, b'{"name": "adabot"}'),
+        ]
+    )
+    monkeypatch.setattr(github_requests, "_conditional_cache", cache)
+    monkeypatch.setattr(github_requests, "get_session", lambda: session)
+
+    response = github_requests.get("/repos/adafruit/adabot")
+    assert response.json() == {"name": "adabot"}
+    assert session.headers[0]["If-None-Match"] == '"abc"'
+    assert "If-None-Match" not in session.headers[1]
+    assert len(cache) == 1
@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/http_cache.py'"""
+
+# pylint: disable=protected-access
+
+import multiprocessing
+import os
+
+import pytest  # pylint: disable=unused-import
+import requests
+
+from adabot.http_cache import CompactCache, ConditionalCache
+
+
+def make_response(status_code, content=b"", headers=None):
+    """Utility to build a response without a network request."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://api.github.com/repos/adafruit/test"
+    response.encoding = "utf-8"
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+def test_replay_not_modified(tmp_path):
+    """Test that a stored response is replayed on a 304 with fresh headers."""
+    cache = ConditionalCache(str(tmp_path / "cache.sqlite"))
+    key = ConditionalCache.make_key("https://api.github.com/repos/adafruit/test")
+    assert not cache.conditional_headers(key)
+
+    cache.store(
+        key,
+        make_response(
+            200, b'{"name": "test"}', {"ETag": '"abc"', "X-RateLimit-Remaining": "10"}
+        ),
+    )
+    assert cache.conditional_headers(key) == {"If-None-Match": '"abc"'}
+
+    replayed = cache.replay(
+        key, make_response(304, headers={"X-RateLimit-Remaining": "9"})
+    )
+    assert replayed.status_code == 200
+    assert replayed.json() == {"name": "test"}
+    assert replayed.headers["X-RateLimit-Remaining"] == "9"
+
+
+def test_store_requires_validator(tmp_path):
+    """Test that responses without an ETag or Last-Modified are not stored."""
+    cache = ConditionalCache(str(tmp_path / "cache.sqlite"))
+    key = ConditionalCache.make_key("https://api.github.com/repos/adafruit/test")
+    cache.store(key, make_response(200, b"{}"))
+    cache.store(key, make_response(404, b"{}", {"ETag": '"abc"'}))
+
+    assert cache.replay(key, make_response(304)) is None
+
+
+def test_conditional_cache_evicts_lru(tmp_path):
+    """Test that bodies are stored compressed, and the least recently replayed
+    responses are evicted over max size.
+    """
+    cache = ConditionalCache(str(tmp_path / "cache.sqlite"), max_size=8000)
+    body = b'{"name": "test"}' * 1000
+    cache.store("text", make_response(200, body, {"ETag": '"abc"'}))
+    assert cache.size < len(body) // 10
+
+    for key in ("a", "b"):
+        cache.store(key, make_response(200, os.urandom(3000), {"ETag": '"abc"'}))
+    assert cache.replay("text", make_response(304)).content == body
+    cache.replay("a", make_response(304))
+    cache.store("c", make_response(200, os.urandom(3000), {"ETag": '"abc"'}))
+
+    assert cache.size <= 8000
+    assert cache.conditional_headers("text")
+    assert cache.conditional_headers("a")
+    assert not cache.conditional_headers("b")
+    assert cache.conditional_headers("c")
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def make_cached_response(content):
+    """Utility to build a response that can be stored by CompactCache."""
+    response = make_response(200, content)
+    response.request = requests.Request("GET", response.url).prepare()
+    return response
+
+
+def test_compact_cache_evicts_lru(tmp_path):
+    """Test that the least recently used responses are evicted over max size."""
+    cache = CompactCache(str(tmp_path / "cache.sqlite"), max_size=8000)
+    for key in ("a", "b", "c"):
+        cache.save_response(key, make_cached_response(os.urandom(1500)))
+    cache.get_response_and_time("a")
+    cache.save_response("d", make_cached_response(os.urandom(1500)))
+
+    assert cache.size <= 8000
+    assert cache.has_key("a")
+    assert not cache.has_key("b")
+    assert cache.has_key("d")
+
+
+def test_compact_cache_compresses(tmp_path):
+    """Test that bodies are stored compressed and restored intact."""
+    path = tmp_path / "cache.sqlite"
+    cache = CompactCache(str(path))
+    body = b'{"name": "test"}' * 1000
+    cache.save_response("key", make_cached_response(body))
+    cache.add_key_mapping("redirect", "key")
+
+    assert cache.size < len(body) // 10
+    response, _ = cache.get_response_and_time("redirect")
+    assert response.content == body
+
+    cache.delete("key")
+    cache.vacuum()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def _fill_shared_cache(path, worker):
+    """Save responses to the cache at `path` from a separate process."""
+    cache = CompactCache(path)
+    for index in range(20):
+        cache.save_response(f"{worker}-{index}", make_cached_response(os.urandom(100)))
+    cache.close()
+
+
+def test_compact_cache_shared_between_processes(tmp_path):
+    """Test that processes writing to one cache at once all get stored."""
+    path = str(tmp_path / "cache.sqlite")
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_fill_shared_cache, args=(path, worker))
+        for worker in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    cache = CompactCache(path)
+    assert len(cache) == 80
+    assert cache.has_key("3-19")
+    total = cache._conn.execute("SELECT SUM(size) FROM cached_responses")
+    assert cache.size == total.fetchone()[0]
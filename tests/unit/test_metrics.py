@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/metrics.py'"""
+
+import json
+
+import pytest
+
+from adabot.metrics import MetricsRegistry, normalize_endpoint
+
+endpoints = [
+    (
+        "https://api.github.com/repos/adafruit/Adafruit_CircuitPython_BME280/releases/latest",
+        "/repos/{owner}/{repo}/releases/latest",
+    ),
+    (
+        "https://api.github.com/repos/adafruit/circuitpython/compare/8.0.0...main",
+        "/repos/{owner}/{repo}/compare/{basehead}",
+    ),
+    (
+        "https://api.github.com/repos/adafruit/circuitpython/pulls/42/reviews",
+        "/repos/{owner}/{repo}/pulls/{number}/reviews",
+    ),
+    (
+        "https://api.github.com/repos/adafruit/circuitpython/contents/docs/index.rst",
+        "/repos/{owner}/{repo}/contents/{path}",
+    ),
+    (
+        "https://api.github.com/search/repositories?q=Adafruit_CircuitPython",
+        "/search/repositories",
+    ),
+    ("https://pypi.org/pypi/pylint/json", "https://pypi.org/pypi/{package}/json"),
+]
+
+
+@pytest.mark.parametrize("url,expects", endpoints)
+def test_normalize_endpoint(url, expects):
+    """Test that URLs are reduced to their endpoint template"""
+    assert normalize_endpoint(url) == expects
+
+
+def test_record_by_endpoint_and_caller():
+    """Test that requests are counted per endpoint and per caller"""
+    metrics = MetricsRegistry()
+    with metrics.caller("validate_labels"):
+        metrics.record("get", "/repos/adafruit/a/labels", 200, 0.2, 100)
+        metrics.record("get", "/repos/adafruit/b/labels", 200, 0.02, 50, True)
+    metrics.record("get", "/repos/adafruit/a", None, 3.0)
+
+    data = metrics.as_dict()
+    labels = data["endpoints"][1]
+    assert labels["endpoint"] == "/repos/{owner}/{repo}/labels"
+    assert labels["count"] == 2
+    assert labels["bytes"] == 150
+    assert labels["cache_hits"] == 1
+    assert labels["latency_histogram"]["0.05"] == 1
+    assert labels["latency_histogram"]["+Inf"] == 2
+    assert data["callers"]["validate_labels"]["count"] == 2
+    assert data["callers"]["(none)"]["statuses"] == {"error": 1}
+    assert json.loads(metrics.to_json()) == data
+
+    text = metrics.to_prometheus()
+    assert (
+        'adabot_github_requests_total{method="GET",'
+        'endpoint="/repos/{owner}/{repo}/labels"} 2'
+    ) in text
+    assert 'adabot_github_caller_requests_total{caller="validate_labels"} 2' in text
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/rate_limit.py'"""
+
+# pylint: disable=protected-access
+
+import time
+
+import github as pygithub
+import pytest  # pylint: disable=unused-import
+
+from adabot import rate_limit
+
+
+class FakeClock:
+    """Monotonic clock that only moves forward when slept on."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        """Mock 'time.monotonic()'"""
+        return self.now
+
+    def sleep(self, seconds):
+        """Mock 'time.sleep()'"""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch):
+    """Replace the scheduler's clock with a 'FakeClock'."""
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    return clock
+
+
+def rate_headers(remaining, limit=5000, reset_in=3600):
+    """Utility to build GitHub rate limit headers."""
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+def test_resource_for():
+    """Test that URLs are mapped to their rate limit resource."""
+    scheduler = rate_limit.RateLimitScheduler()
+    assert scheduler.resource_for("/search/repositories") == "search"
+    assert scheduler.resource_for("https://api.github.com/graphql") == "graphql"
+    assert scheduler.resource_for("/repos/adafruit/circuitpython") == "core"
+
+
+def test_pacing_starts_when_budget_is_low():
+    """Test that requests are only paced once the budget runs low."""
+    scheduler = rate_limit.RateLimitScheduler()
+    assert not scheduler.update(200, rate_headers(4000))
+    assert scheduler._bucket("core").rate is None
+
+    assert not scheduler.update(200, rate_headers(360))
+    assert scheduler._bucket("core").rate == pytest.approx(0.1, rel=0.01)
+
+
+def test_retry_after_blocks(clock):
+    """Test that 'Retry-After' blocks only its resource until it has passed."""
+    scheduler = rate_limit.RateLimitScheduler()
+
+    assert scheduler.update(403, {"Retry-After": "30"}, resource="search")
+    scheduler.acquire("core")
+    assert not clock.sleeps
+    scheduler.acquire("search")
+    assert sum(clock.sleeps) == 30
+
+    assert scheduler.update(403, {}, "You have exceeded a secondary rate limit")
+    scheduler.acquire("core")
+    assert sum(clock.sleeps) == 30 + rate_limit.SECONDARY_RATE_LIMIT_DELAY
+
+
+def test_exhausted_credential_blocks_only_itself(clock):
+    """Test that an exhausted budget only holds back its own credential."""
+    scheduler = rate_limit.RateLimitScheduler()
+
+    assert scheduler.update(403, rate_headers(0), credential="one")
+    scheduler.acquire("core", "two")
+    assert not clock.sleeps
+    scheduler.acquire("core", "one")
+    assert sum(clock.sleeps) >= 3600
+
+
+def test_paced_acquire(clock):
+    """Test that paced requests wait for tokens once the burst is used."""
+    scheduler = rate_limit.RateLimitScheduler(burst=2)
+    scheduler.update(200, rate_headers(100, reset_in=100))
+    for _ in range(4):
+        scheduler.acquire()
+    assert sum(clock.sleeps) == pytest.approx(2, rel=0.01)
+
+
+def test_refund(clock):
+    """Test that a refunded token can be used again without waiting."""
+    scheduler = rate_limit.RateLimitScheduler(burst=2)
+    scheduler.update(200, rate_headers(100, reset_in=100))
+    scheduler.acquire()
+    scheduler.acquire()
+    scheduler.refund()
+    scheduler.acquire()
+    assert not clock.sleeps
+
+
+def test_call_pygithub_retries(clock):
+    """Test that PyGithub calls are retried after a rate limit error."""
+    scheduler = rate_limit.RateLimitScheduler()
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise pygithub.RateLimitExceededException(
+                403, {"message": "API rate limit exceeded"}, rate_headers(0, reset_in=0)
+            )
+        return "done"
+
+    assert scheduler.call_pygithub(flaky) == "done"
+    assert len(calls) == 2
+    assert clock.sleeps
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/lib/reference_data.py'"""
+
+import pytest
+
+from adabot.lib import common_funcs
+from adabot.lib import reference_data
+from adabot.lib.reference_data import ReferenceData
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
+
+
+def test_reference_data(tmp_path):
+    """Test that the documents are fetched once and reused by the next run"""
+    org = SyntheticOrg(20, seed=2)
+    libraries = [name for name in org.repos if org.kind(name) == "lib"]
+    with FakeHub(org) as hub:
+        reference = ReferenceData(tmp_path)
+        index = reference.bundle_index()
+        assert len(index) == len(libraries)
+        assert reference.bundle_index() is index
+        assert reference.latest_pylint() == "2.15.5"
+        assert reference.pcc_versions()["https://github.com/python/black"] == "22.4.0"
+        name = libraries[0]
+        short_name = name[len("Adafruit_CircuitPython_") :].lower()
+        assert (
+            f"https://docs.circuitpython.org/projects/{short_name}/en/latest/"
+            in reference.driver_page_urls()
+        )
+        clone_url = org.repos[name]["clone_url"]
+        assert index.category(clone_url) == "drivers"
+        assert common_funcs.sanitize_url(clone_url) in reference.rtd_subprojects()
+        served = sum(hub.requests.values())
+        assert hub.requests["GET raw.githubusercontent.com"] == 3
+
+        stored = ReferenceData(tmp_path)
+        assert len(stored.bundle_index()) == len(libraries)
+        assert stored.latest_pylint() == "2.15.5"
+        assert sum(hub.requests.values()) == served
+
+        expired = ReferenceData(tmp_path, ttls={"pylint": 0})
+        assert expired.latest_pylint() == "2.15.5"
+        assert sum(hub.requests.values()) == served + 1
+
+
+def test_get_bundle_submodules_is_shared(tmp_path, monkeypatch):
+    """Test that get_bundle_submodules reads the shared reference data"""
+    reference = ReferenceData(tmp_path)
+    monkeypatch.setattr(reference_data, "_reference_data", reference)
+    with FakeHub(SyntheticOrg(20, seed=2)) as hub:
+        submodules = common_funcs.get_bundle_submodules()
+        assert common_funcs.get_bundle_submodules() is submodules
+        assert reference.bundle_index() is submodules
+        assert hub.requests["GET raw.githubusercontent.com"] == 1
+    with pytest.raises(ValueError):
+        common_funcs.get_bundle_submodules("other")
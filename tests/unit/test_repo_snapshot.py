@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: 2026 Adafruit Industries
+#
+# SPDX-License-Identifier: MIT
+
+"""Unit tests for 'adabot/lib/repo_snapshot.py'"""
+
+from adabot.lib.repo_snapshot import RepoSnapshot, RepoTree
+from adabot.testing.fakehub import FakeHub, SyntheticOrg
+
+
+def test_repo_snapshot_fetches_once():
+    """Test that each piece of a repository's data is fetched once"""
+    with FakeHub(SyntheticOrg(5, seed=2)) as hub:
+        name = next(name for name in hub.org.repos if hub.org.kind(name) == "lib")
+        snapshot = RepoSnapshot(hub.org.repos[name])
+        assert snapshot["name"] == name
+        assert RepoSnapshot.of(snapshot) is snapshot
+
+        readme = snapshot.file_text("README.rst")
+        assert ":alt: Discord" in readme
+        labels = list(snapshot.labels())
+        release = snapshot.latest_release()
+        assert release.ok
+        before = dict(hub.requests)
+
+        assert snapshot.file_text("README.rst") == readme
+        assert snapshot.tree().is_dir("examples")
+        assert snapshot.file_info("README.rst")["type"] == "blob"
+        assert snapshot.file_text("missing.txt") is None
+        assert snapshot.latest_release() is release
+        snapshot.add_label("new label")
+        assert snapshot.labels() == labels + ["new label"]
+        assert hub.requests == before
+
+
+def test_repo_tree():
+    """Test that the tree index lists the files and directories"""
+    tree = RepoTree(
+        [
+            {"path": "README.rst", "type": "blob", "sha": "1", "size": 10},
+            {"path": "examples", "type": "tree", "sha": "2"},
+            {"path": "examples/lib", "type": "tree", "sha": "3"},
+            {"path": "examples/lib/data.bin", "type": "blob", "sha": "4", "size": 5},
+            {"path": "examples/simpletest.py", "type": "blob", "sha": "5", "size": 9},
+            {"path": "adafruit_lib", "type": "tree", "sha": "6"},
+        ]
+    )
+    assert tree.names() == ["README.rst", "examples", "adafruit_lib"]
+    assert tree.names("examples") == ["lib", "simpletest.py"]
+    assert not tree.names("adafruit_lib")
+    assert tree.is_dir("examples/lib") and not tree.is_file("examples/lib")
+    assert tree.is_file("README.rst") and not tree.is_dir("README.rst")
+    assert tree.files("examples") == ["examples/lib/data.bin", "examples/simpletest.py"]
+    assert tree.entries["examples/simpletest.py"]["size"] == 9
+
+
+def test_repo_tree_is_one_request():
+    """Test that the whole file tree of a repository is one request"""
+    with FakeHub(SyntheticOrg(5, seed=2)) as hub:
+        name = next(name for name in hub.org.repos if hub.org.kind(name) == "lib")
+        snapshot = RepoSnapshot(hub.org.repos[name])
+        tree = snapshot.tree()
+        assert hub.requests == {"GET api.github.com": 1}
+        assert set(tree.files()) == set(hub.org.files(name))
+        assert tree.is_dir(".github/workflows")
+        assert snapshot.file_info("examples/missing.py") is None
+
+        missing = RepoSnapshot({"name": "Not_There", "default_branch": "main"})
+        assert missing.tree() is None
@@ -16,10 +16,9 @@ import datetime
 import inspect
 import json
 
-from adabot import pypi_requests as pypi
 from adabot.lib import circuitpython_library_validators as cpy_vals
+from adabot.lib import reference_data
 from adabot.lib import common_funcs
-from adabot.lib.common_funcs import list_repos
 
 default_validators = [
     vals[1]
@@ -27,18 +26,10 @@ default_validators = [
     if vals[0].startswith("validate")
 ]
 
-bundle_submodules = common_funcs.get_bundle_submodules()
+reference = reference_data.get_reference_data()
+bundle_submodules = reference.bundle_index()
 
-LATEST_PYLINT = ""
-pylint_info = pypi.get("/pypi/pylint/json")
-if pylint_info and pylint_info.ok:
-    LATEST_PYLINT = pylint_info.json()["info"]["version"]
-
-validator = cpy_vals.LibraryValidator(
-    default_validators,
-    bundle_submodules,
-    LATEST_PYLINT,
-)
+LATEST_PYLINT = reference.latest_pylint()
 
 valids = {}
 for count, val in enumerate(default_validators):
@@ -50,9 +41,16 @@ select = valids[
     int(input(f"Select a function to run [0-{len(default_validators)-1}]: "))
 ]
 print(select)
-selected = getattr(validator, select)
+selected = getattr(cpy_vals.LibraryValidator, select)
 print(selected)
 
+# Only the data the selected validator needs is fetched.
+validator = cpy_vals.LibraryValidator(
+    [selected],
+    bundle_submodules,
+    LATEST_PYLINT,
+)
+
 try:
     with open("repos.json", "r") as f:
         DATE = f.readline().rstrip()
@@ -63,7 +61,7 @@ print(f"Last run: {DATE}")
 if DATE != str(datetime.date.today()):
     with open("repos.json", "w") as f:
         print("Fetching Repos List")
-        all_repos = list_repos()
+        all_repos = common_funcs.list_repos()
         print("Got Repos List")
         f.write(str(datetime.date.today()) + "\n")
         f.write(json.dumps(all_repos))
@@ -73,11 +71,15 @@ with open("repos.json", "r") as f:
 
 results = {}
 
-for repo in all_repos:
-    val = selected(repo)
+pages = [
+    all_repos[start : start + common_funcs.ORG_REPOS_PER_PAGE]
+    for start in range(0, len(all_repos), common_funcs.ORG_REPOS_PER_PAGE)
+]
+for repo in validator.prefetched_repos(pages):
+    val = validator.run_repo_validation(repo)
     print(repo["name"])
     print(val)
-    if len(val):
+    if val:
         if isinstance(val[0], tuple):
             if val[0][0] not in results:
                 results[val[0][0]] = []